@@ -1,10 +1,20 @@
 import sys
 import json
 import os
-from PyQt5.QtWidgets import QApplication
-from src.main_window import MainWindow
+from src.ipc import InstanceLock, IpcServer, send_command
 
 def main():
+    # Una sola instancia por usuario: si ya hay una abierta, se avisa y se sale
+    instance_lock = InstanceLock()
+    if not instance_lock.acquire():
+        status = send_command('status')
+        pid = status.get('pid') if status else None
+        print(f"La aplicación ya está en ejecución (PID: {pid})")
+        sys.exit(0)
+
+    from PyQt5.QtWidgets import QApplication
+    from src.main_window import MainWindow
+
     app = QApplication(sys.argv)
     app.setApplicationName("Gestor de Perfiles de Programas")
     app.setApplicationVersion("1.0")
@@ -16,7 +26,18 @@ def main():
     window = MainWindow()
     window.show()
     
-    sys.exit(app.exec_())
+    # Canal local para los disparadores externos (python -m src.ipc_client, python -m src run)
+    server = None
+    try:
+        server = IpcServer(window.profile_manager, on_run=window.external_run_started.emit).start()
+    except OSError as e:
+        print(f"[WARN] No se pudo abrir el canal IPC: {e}")
+    
+    code = app.exec_()
+    if server is not None:
+        server.stop()
+    instance_lock.release()
+    sys.exit(code)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
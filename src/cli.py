@@ -0,0 +1,258 @@
+"""
+Línea de comandos sin interfaz gráfica:
+
+    python -m src list
+    python -m src run <perfil> [--no-wait] [--local]
+    python -m src switch <perfil> [--close-others] [--no-wait] [--local]
+    python -m src validate [<perfil>]
+    python -m src capture <perfil> [--save] [--force]
+    python -m src report [--metric window]
+    python -m src selfcheck [--budget-ms 300]
+
+Este módulo y todo lo que importa no deben cargar PyQt5, keyboard ni el escáner de
+programas: así arranca rápido desde scripts, tareas programadas o un Stream Deck.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Módulos que nunca deben aparecer en el camino de la línea de comandos
+FORBIDDEN_MODULES = ('PyQt5', 'keyboard', 'src.program_scanner', 'src.main_window',
+                     'src.profile_editor', 'src.hotkey_manager', 'src.run_monitor')
+
+# Presupuesto de arranque en frío (intérprete + imports), en milisegundos
+COLD_START_BUDGET_MS = 300
+
+
+def _manager():
+    from src.profile_manager import ProfileManager
+    return ProfileManager()
+
+
+def cmd_list(args):
+    manager = _manager()
+    for name in manager.profile_names():
+        profile = manager.get_profile(name) or {}
+        hotkey = profile.get('hotkey') or '-'
+        print(f"{name}\t{len(profile.get('programs', []))} programas\thotkey: {hotkey}")
+    return 0
+
+
+def _forward(command, **params):
+    """
+    Si la aplicación ya está abierta, reenviarle el comando (perfiles y cachés en caliente).
+    Devuelve el código de salida, o None si no hay ninguna instancia escuchando.
+    """
+    from src.ipc import send_command
+    response = send_command(command, **params)
+    if response is None:
+        return None
+    if not response.get('ok'):
+        print(f"[ERROR] {response.get('error')}")
+        return 1
+    print(', '.join(f"{key}: {value}" for key, value in response.items() if key != 'ok'))
+    return 0
+
+
+def _wait_run(run, no_wait):
+    from src.launch_executor import describe_run
+
+    if run is None or no_wait:
+        return 0
+    try:
+        run.wait()
+    except KeyboardInterrupt:
+        run.cancel()
+        run.wait()
+    print(describe_run(run))
+    return 0 if all(task.result for task in run.tasks) else 1
+
+
+def cmd_run(args):
+    if not args.local:
+        code = _forward('run', profile=args.profile)
+        if code is not None:
+            return code
+
+    manager = _manager()
+    try:
+        run = manager.execute_profile(args.profile)
+        if run is None:
+            return 1
+        return _wait_run(run, args.no_wait)
+    finally:
+        manager.flush()
+
+
+def cmd_switch(args):
+    if not args.local:
+        code = _forward('switch', profile=args.profile, close_others=args.close_others)
+        if code is not None:
+            return code
+
+    manager = _manager()
+    try:
+        result = manager.switch_profile(args.profile, close_others=args.close_others)
+        if result is None:
+            return 1
+        if result.diff.close and not args.close_others:
+            print(f"{len(result.diff.close)} ventanas ajenas sin cerrar (usa --close-others para cerrarlas)")
+        return _wait_run(result.run, args.no_wait)
+    finally:
+        manager.flush()
+
+
+def cmd_validate(args):
+    from src.execution_plan import validate_profile
+    from src.monitor_topology import get_shared_topology
+
+    manager = _manager()
+    topology = get_shared_topology()
+    names = [args.profile] if args.profile else manager.profile_names()
+    failed = 0
+    hotkeys = {}
+    for name in names:
+        profile = manager.get_profile(name)
+        if profile is None:
+            print(f"{name}: no existe")
+            failed += 1
+            continue
+        problems = validate_profile(name, profile, topology)
+        hotkey = profile.get('hotkey')
+        if hotkey:
+            if hotkey in hotkeys:
+                problems.append(f"hotkey '{hotkey}' repetida en '{hotkeys[hotkey]}'")
+            hotkeys.setdefault(hotkey, name)
+        if problems:
+            failed += 1
+            print(f"{name}: {len(problems)} problemas")
+            for problem in problems:
+                print(f"  - {problem}")
+        else:
+            print(f"{name}: correcto")
+    return 1 if failed else 0
+
+
+def cmd_capture(args):
+    from src.layout_capture import capture_current_layout
+
+    programs = capture_current_layout()
+    profile = {
+        'programs': programs,
+        'created_at': str(int(time.time())),
+        'modified_at': str(int(time.time())),
+        'close_others': False,
+        'hotkey': ''
+    }
+    if not args.save:
+        print(json.dumps({args.profile: profile}, indent=2, ensure_ascii=False))
+        return 0
+    manager = _manager()
+    try:
+        if manager.profile_exists(args.profile) and not args.force:
+            print(f"El perfil '{args.profile}' ya existe (usa --force para sobrescribirlo)")
+            return 1
+        if not manager.save_profile(args.profile, profile):
+            return 1
+        print(f"Perfil '{args.profile}' guardado con {len(programs)} programas")
+        return 0
+    finally:
+        manager.flush()
+
+
+def cmd_report(args):
+    from src.telemetry import load_records, format_report, default_telemetry_path
+
+    path = args.path or default_telemetry_path()
+    records = load_records(path)
+    if not records:
+        print(f"No hay telemetría en {path}")
+        return 0
+    print(format_report(records, metric=args.metric))
+    return 0
+
+
+def measure_cold_start(rounds=3):
+    """
+    Arrancar un intérprete nuevo que importa la línea de comandos y el núcleo.
+    Devuelve (mejor tiempo en ms, módulos prohibidos cargados).
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = ("import sys, src.cli, src.profile_manager, src.layout_capture, src.execution_plan; "
+            f"print(','.join(m for m in sys.modules if m.split('.')[0] in {FORBIDDEN_MODULES!r} "
+            f"or m in {FORBIDDEN_MODULES!r}))")
+    best = None
+    loaded = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', code], cwd=root, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+        loaded = [m for m in output.split(',') if m]
+    return best, loaded
+
+
+def cmd_selfcheck(args):
+    elapsed, loaded = measure_cold_start()
+    ok = True
+    if loaded:
+        ok = False
+        print(f"[ERROR] El núcleo importa módulos de la interfaz: {', '.join(sorted(loaded))}")
+    if elapsed > args.budget_ms:
+        ok = False
+        print(f"[ERROR] Arranque en frío {elapsed:.0f} ms, presupuesto {args.budget_ms} ms")
+    if ok:
+        print(f"Arranque en frío {elapsed:.0f} ms (presupuesto {args.budget_ms} ms), sin imports de Qt")
+    return 0 if ok else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m src', description="Gestor de perfiles de programas")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="listar los perfiles").set_defaults(func=cmd_list)
+
+    run = commands.add_parser('run', help="ejecutar un perfil (lanza todos sus programas)")
+    run.add_argument('profile')
+    run.add_argument('--no-wait', action='store_true', help="no esperar a que aparezcan las ventanas")
+    run.add_argument('--local', action='store_true',
+                     help="ejecutar en este proceso aunque la aplicación esté abierta")
+    run.set_defaults(func=cmd_run)
+
+    switch = commands.add_parser('switch', help="cambiar al perfil (solo lanza lo que falta)")
+    switch.add_argument('profile')
+    switch.add_argument('--close-others', action='store_true',
+                        help="cerrar las ventanas ajenas si el perfil tiene close_others")
+    switch.add_argument('--no-wait', action='store_true', help="no esperar a que aparezcan las ventanas")
+    switch.add_argument('--local', action='store_true',
+                        help="cambiar en este proceso aunque la aplicación esté abierta")
+    switch.set_defaults(func=cmd_switch)
+
+    validate = commands.add_parser('validate', help="comprobar rutas, monitores y hotkeys")
+    validate.add_argument('profile', nargs='?')
+    validate.set_defaults(func=cmd_validate)
+
+    capture = commands.add_parser('capture', help="capturar la disposición actual como perfil")
+    capture.add_argument('profile')
+    capture.add_argument('--save', action='store_true', help="guardar el perfil (si no, se imprime)")
+    capture.add_argument('--force', action='store_true', help="sobrescribir un perfil existente")
+    capture.set_defaults(func=cmd_capture)
+
+    report = commands.add_parser('report', help="informe de tiempos de lanzamiento")
+    report.add_argument('--metric', default='window')
+    report.add_argument('--path')
+    report.set_defaults(func=cmd_report)
+
+    selfcheck = commands.add_parser('selfcheck', help="medir el arranque en frío y buscar imports de Qt")
+    selfcheck.add_argument('--budget-ms', type=float, default=COLD_START_BUDGET_MS)
+    selfcheck.set_defaults(func=cmd_selfcheck)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
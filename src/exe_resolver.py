@@ -0,0 +1,162 @@
+"""
+Elegir el ejecutable principal de un programa instalado a partir de su carpeta de
+instalación y de los datos de su clave de desinstalación.
+
+    python -m pytest tests/test_exe_resolver.py    # elección en árboles de carpetas de prueba
+"""
+import os
+import re
+from difflib import SequenceMatcher
+
+# Subcarpetas de la carpeta de instalación que se examinan (bin, app-1.2.3, ...)
+RESOLVER_MAX_DEPTH = 1
+
+# Peso de cada señal en la puntuación de un candidato
+WEIGHT_DISPLAY_ICON = 1.0
+WEIGHT_NAME = 0.6
+WEIGHT_SIZE = 0.3
+WEIGHT_TOP_LEVEL = 0.1
+
+# Palabras del nombre que no ayudan a reconocer el ejecutable
+_NOISE = re.compile(r'\(.*?\)|\b(x64|x86|64-bit|32-bit|\d+(\.\d+)*)\b')
+
+
+def _normalize(text):
+    return re.sub(r'[^a-z0-9]', '', _NOISE.sub('', text.lower()))
+
+
+def name_similarity(display_name, exe_name):
+    """Parecido (0..1) entre el nombre del programa y el de un ejecutable"""
+    name = _normalize(display_name or '')
+    stem = _normalize(os.path.splitext(exe_name)[0])
+    if not name or not stem:
+        return 0.0
+    if len(stem) >= 3 and (stem in name or name in stem):
+        return 1.0
+    return SequenceMatcher(None, name, stem).ratio()
+
+
+def icon_path(display_icon):
+    """Ruta del archivo de un valor DisplayIcon ('"C:\\ruta\\app.exe",0'), o None"""
+    if not display_icon:
+        return None
+    path = display_icon.strip()
+    if path.startswith('"'):
+        path = path[1:].split('"', 1)[0]
+    else:
+        path = re.sub(r',\s*-?\d+$', '', path)
+    return os.path.expandvars(path.strip()) or None
+
+
+class ExecutableResolver:
+    """
+    Puntúa los .exe de una carpeta de instalación (y sus subcarpetas hasta max_depth) por:
+    coincidir con DisplayIcon, parecido con el nombre del programa, tamaño relativo y estar
+    en la carpeta principal. Los desinstaladores y similares (is_system) no son candidatos.
+    La lista de candidatos de cada carpeta se guarda en cache (ScanCache, sección
+    executables) con el mtime de la carpeta y los de las subcarpetas examinadas, así que
+    solo se vuelve a listar si cambia alguna (p. ej. una nueva versión dentro de app-1.2.3).
+    """
+
+    def __init__(self, cache=None, is_system=None, max_depth=RESOLVER_MAX_DEPTH, count=None):
+        self.cache = cache
+        self.is_system = is_system or (lambda filename: False)
+        self.max_depth = max_depth
+        self.count = count or (lambda reused: None)
+        self._memo = {}
+
+    def candidates(self, install_location, cancel=None):
+        """
+        Lista de (ruta relativa, tamaño, profundidad) de los .exe no descartados.
+        cancel se pasa a la caché: una fuente abandonada no guarda lo que lea.
+        """
+        try:
+            stamp = os.stat(install_location).st_mtime_ns
+        except OSError:
+            return []
+        if self.cache is not None:
+            entry = self.cache.get('executables', install_location, stamp)
+        else:
+            entry = self._memo.get(install_location)
+            entry = entry if entry is not None and entry['stamp'] == stamp else None
+        if entry is not None and self._subfolders_unchanged(install_location, entry):
+            self.count(True)
+            return entry['candidates']
+
+        found = []
+        folders = []
+        stack = [('', 0)]
+        while stack:
+            relative, depth = stack.pop()
+            try:
+                with os.scandir(os.path.join(install_location, relative)) as entries:
+                    for item in entries:
+                        lower = item.name.lower()
+                        try:
+                            if lower.endswith('.exe') and item.is_file():
+                                if not self.is_system(lower):
+                                    found.append([os.path.join(relative, item.name),
+                                                  item.stat().st_size, depth])
+                            elif depth < self.max_depth and item.is_dir():
+                                child = os.path.join(relative, item.name)
+                                folders.append([child, item.stat().st_mtime_ns])
+                                stack.append((child, depth + 1))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        found.sort()
+        folders.sort()
+        entry = {'stamp': stamp, 'folders': folders, 'candidates': found}
+        self.count(False)
+        if self.cache is not None:
+            self.cache.put('executables', install_location, entry, cancel)
+        else:
+            self._memo[install_location] = entry
+        return found
+
+    def _subfolders_unchanged(self, install_location, entry):
+        """Si las subcarpetas examinadas al listar siguen con el mismo mtime"""
+        for relative, mtime in entry.get('folders', ()):
+            try:
+                if os.stat(os.path.join(install_location, relative)).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def rank(self, install_location, display_name, display_icon=None, cancel=None):
+        """Candidatos ordenados de mejor a peor: lista de (puntuación, ruta)"""
+        candidates = self.candidates(install_location, cancel)
+        if not candidates:
+            return []
+        icon = icon_path(display_icon)
+        icon = os.path.normcase(os.path.normpath(icon)) if icon else None
+        largest = max(size for _, size, _ in candidates) or 1
+        ranked = []
+        for relative, size, depth in candidates:
+            path = os.path.join(install_location, relative)
+            score = (WEIGHT_NAME * name_similarity(display_name, os.path.basename(relative))
+                     + WEIGHT_SIZE * size / largest
+                     + (WEIGHT_TOP_LEVEL if depth == 0 else 0))
+            if icon and os.path.normcase(os.path.normpath(path)) == icon:
+                score += WEIGHT_DISPLAY_ICON
+            ranked.append((score, path))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return ranked
+
+    def resolve(self, install_location, display_name, display_icon=None, cancel=None):
+        """
+        Ejecutable principal del programa, o None.
+        Un DisplayIcon que apunta a un .exe existente fuera de la carpeta también vale.
+        """
+        if install_location:
+            ranked = self.rank(install_location, display_name, display_icon, cancel)
+            if ranked:
+                return ranked[0][1]
+        icon = icon_path(display_icon)
+        if not icon or not icon.lower().endswith('.exe'):
+            return None
+        if self.is_system(os.path.basename(icon).lower()) or not os.path.isfile(icon):
+            return None
+        return icon
@@ -0,0 +1,177 @@
+import os
+import threading
+from collections import namedtuple
+from src.monitor_topology import resolve_monitor
+from src.title_matcher import compile_keyword
+
+# Todo lo que hace falta para lanzar y colocar un programa, ya resuelto
+ProgramPlan = namedtuple('ProgramPlan', [
+    'name',             # nombre mostrado
+    'exe_path',         # ruta del ejecutable (o AppUserModelID de una app empaquetada)
+    'exe_exists',       # validado al compilar
+    'packaged',         # app empaquetada: se lanza por shell:AppsFolder
+    'process_name',     # nombre de proceso con el que buscar el PID (None: solo por título)
+    'substring_match',  # comparación antigua por subcadena
+    'keyword',          # palabra clave de título para el último recurso
+    'compiled_keyword', # CompiledKeyword con los tokens precalculados
+    'monitor_index',    # índice resuelto de monitor
+    'monitor_rect',     # MonitorRect del monitor
+    'x', 'y', 'width', 'height',  # geometría absoluta de destino (None sin monitores)
+    'maximize',
+    'minimize',
+    'config',           # configuración original del programa
+])
+
+# Plan inmutable de un perfil completo
+ExecutionPlan = namedtuple('ExecutionPlan', [
+    'profile_name',
+    'priority',
+    'close_others',
+    'programs',             # tupla de ProgramPlan en el orden del editor
+    'profile',              # objeto de perfil con el que se compiló (para invalidar)
+    'topology_generation',  # generación de monitores con la que se compiló
+])
+
+
+def is_app_id(path):
+    """AppUserModelID de app empaquetada ('Familia_editor!App'): sin separadores de ruta y con '!'"""
+    return bool(path) and '!' in path and '\\' not in path and '/' not in path
+
+
+def is_packaged_program(program_config):
+    """Programa que se lanza por shell:AppsFolder en lugar de como ejecutable"""
+    return program_config.get('source') == 'modern' or is_app_id(program_config.get('path'))
+
+
+def compile_program(program_config, topology):
+    """Resolver una vez monitor, geometría, reglas de proceso y palabra clave de un programa"""
+    exe_path = program_config['path']
+    packaged = is_packaged_program(program_config)
+    window_cfg = program_config.get('window_config', {})
+    monitor = window_cfg.get('monitor', 'primary')
+
+    # El monitor se admite como índice (0=primario, 1=secundario, ...) o 'primary'/'secondary'
+    monitor_index = topology.resolve(monitor)
+    rect = topology.rect(monitor_index)
+    if rect is None:
+        # Sin monitores detectados: la geometría queda sin resolver y no se coloca la ventana
+        x = y = width = height = None
+    else:
+        x = rect.x + window_cfg.get('x', 0)
+        y = rect.y + window_cfg.get('y', 0)
+        width = window_cfg.get('width') or rect.width
+        height = window_cfg.get('height') or rect.height
+
+    if packaged:
+        # El AppUserModelID no se parece al título ni a ningún proceso: se busca por el nombre
+        # del programa y por el ejecutable del manifiesto; sin él, solo por título
+        keyword = program_config.get('window_title') or program_config.get('name') or exe_path
+        exe_exists = True
+        process_name = program_config.get('process_name') or None
+    else:
+        keyword = program_config.get('window_title') or os.path.splitext(os.path.basename(exe_path))[0]
+        exe_exists = os.path.isfile(exe_path)
+        process_name = program_config.get('process_name') or os.path.basename(exe_path)
+    if not exe_exists:
+        print(f"[WARN] Ejecutable no encontrado para {program_config.get('name', exe_path)}: {exe_path}")
+
+    return ProgramPlan(
+        name=program_config.get('name', os.path.basename(exe_path)),
+        exe_path=exe_path,
+        exe_exists=exe_exists,
+        packaged=packaged,
+        process_name=process_name,
+        substring_match=program_config.get('substring_match', False),
+        keyword=keyword,
+        compiled_keyword=compile_keyword(keyword, (program_config.get('window_class'),)),
+        monitor_index=monitor_index,
+        monitor_rect=rect,
+        x=x,
+        y=y,
+        width=width,
+        height=height,
+        maximize=window_cfg.get('maximized', False),
+        minimize=window_cfg.get('minimized', False),
+        config=program_config,
+    )
+
+
+def _priority(profile_name, value):
+    """Prioridad del perfil como entero (los JSON editados a mano pueden traer "2" o basura)"""
+    if value is None:
+        return 0
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        print(f"[WARN] Prioridad no válida en el perfil '{profile_name}': {value!r}, usando 0")
+        return 0
+
+
+def compile_profile(profile_name, profile, topology):
+    """Compilar un perfil completo en un ExecutionPlan"""
+    topology.monitors()
+    return ExecutionPlan(
+        profile_name=profile_name,
+        priority=_priority(profile_name, profile.get('priority')),
+        close_others=profile.get('close_others', False),
+        programs=tuple(compile_program(p, topology) for p in profile.get('programs', [])),
+        profile=profile,
+        topology_generation=topology.generation,
+    )
+
+
+def validate_profile(profile_name, profile, topology):
+    """
+    Comprobar que un perfil se puede ejecutar en este equipo.
+    Devuelve una lista de problemas en texto (vacía si todo está bien).
+    """
+    problems = []
+    programs = profile.get('programs')
+    if not programs:
+        problems.append("no tiene programas")
+        return problems
+    monitors = topology.monitors()
+    for position, program in enumerate(programs, 1):
+        label = program.get('name') or f"programa {position}"
+        if not program.get('path'):
+            problems.append(f"{label}: falta la ruta del ejecutable")
+            continue
+        if not is_packaged_program(program) and not os.path.isfile(program['path']):
+            problems.append(f"{label}: no existe {program['path']}")
+        _, problem = resolve_monitor(program.get('window_config', {}).get('monitor', 'primary'), monitors)
+        if problem:
+            problems.append(f"{label}: {problem}")
+    return problems
+
+
+class PlanCache:
+    """
+    Caché de planes de ejecución por perfil.
+    Un plan sigue siendo válido mientras el perfil sea el mismo objeto de la instantánea del
+    almacén (cualquier cambio lo sustituye) y la topología de monitores no haya cambiado.
+    """
+
+    def __init__(self, topology):
+        self.topology = topology
+        self._plans = {}
+        self._lock = threading.Lock()
+
+    def get(self, profile_name, profile):
+        # monitors() recarga la topología si se ha invalidado o caducado su TTL
+        self.topology.monitors()
+        generation = self.topology.generation
+        with self._lock:
+            plan = self._plans.get(profile_name)
+        if plan is not None and plan.profile is profile and plan.topology_generation == generation:
+            return plan
+        plan = compile_profile(profile_name, profile, self.topology)
+        with self._lock:
+            self._plans[profile_name] = plan
+        return plan
+
+    def invalidate(self, profile_name=None):
+        with self._lock:
+            if profile_name is None:
+                self._plans.clear()
+            else:
+                self._plans.pop(profile_name, None)
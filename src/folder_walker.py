@@ -0,0 +1,133 @@
+"""
+Recorrido de carpetas de instalación con os.scandir.
+
+El tipo de cada entrada sale de la propia lectura del directorio (DirEntry), así que no hace
+falta un stat por archivo como con os.listdir + isfile/isdir. El recorrido es iterativo y va
+devolviendo los programas según los encuentra.
+
+    python -m tests.bench_folder_walker    # compara con el recorrido anterior en un árbol de 100k archivos
+"""
+import fnmatch
+import os
+
+# Carpetas que nunca contienen el ejecutable principal de un programa
+DEFAULT_EXCLUDES = ('node_modules', 'WindowsApps', 'Common Files')
+
+# Entradas de directorio que se examinan como máximo por carpeta raíz
+DEFAULT_ENTRY_BUDGET = 50000
+
+
+def _folder_program(name, path):
+    return {
+        'name': os.path.splitext(name)[0],
+        'path': path,
+        'source': 'folder'
+    }
+
+
+class FolderWalker:
+    """
+    Recorre una carpeta raíz hasta max_depth niveles (0 = solo la raíz) buscando .exe.
+    exclude: patrones (fnmatch, sin distinguir mayúsculas) de carpetas que no se recorren.
+    entry_budget: entradas examinadas como máximo por raíz (None = sin límite); al agotarse
+    se deja de recorrer y la raíz queda en truncated.
+    is_system(nombre en minúsculas) descarta desinstaladores y similares.
+    cache (ScanCache, opcional) guarda el contenido de cada carpeta con su mtime; count(reused)
+    se llama por carpeta para las estadísticas del escáner.
+    """
+
+    def __init__(self, max_depth=2, exclude=DEFAULT_EXCLUDES, entry_budget=DEFAULT_ENTRY_BUDGET,
+                 is_system=None, cache=None, count=None):
+        self.max_depth = max_depth
+        self.exclude = tuple(pattern.lower() for pattern in exclude)
+        self.entry_budget = entry_budget
+        self.is_system = is_system or (lambda filename: False)
+        self.cache = cache
+        self.count = count or (lambda reused: None)
+        self.truncated = set()
+
+    def is_excluded(self, name):
+        name = name.lower()
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.exclude)
+
+    def walk(self, root, visited=None, cancel=None):
+        """
+        Generador de programas encontrados bajo root, en el mismo orden que un recorrido
+        recursivo (los de cada carpeta antes que los de sus subcarpetas).
+        visited recibe las carpetas recorridas (para podar la caché).
+        cancel se comprueba antes de cada carpeta y acompaña a las escrituras en la caché.
+        """
+        if self.max_depth <= 0:
+            return
+        try:
+            root_stamp = os.stat(root).st_mtime_ns
+        except OSError:
+            return
+        self.truncated.discard(root)
+        budget = self.entry_budget if self.entry_budget is not None else float('inf')
+        # Pila de (carpeta, profundidad, mtime o None si hay que leerlo)
+        stack = [(root, 0, root_stamp)]
+
+        while stack:
+            if cancel is not None and cancel.is_set():
+                return
+            folder, depth, stamp = stack.pop()
+            if stamp is None:
+                try:
+                    stamp = os.stat(folder).st_mtime_ns
+                except OSError:
+                    continue
+            if visited is not None:
+                visited.add(folder)
+            descend = depth < self.max_depth - 1
+
+            entry = self.cache.get('folders', folder, stamp) if self.cache is not None else None
+            if entry is not None:
+                self.count(True)
+                budget -= len(entry['programs']) + len(entry['subdirs'])
+                for program in entry['programs']:
+                    yield dict(program)
+                if descend:
+                    for name in reversed(entry['subdirs']):
+                        if not self.is_excluded(name):
+                            stack.append((os.path.join(folder, name), depth + 1, None))
+            else:
+                found = []
+                subdirs = []
+                children = []
+                try:
+                    with os.scandir(folder) as entries:
+                        for item in entries:
+                            budget -= 1
+                            name = item.name
+                            lower = name.lower()
+                            try:
+                                if lower.endswith('.exe') and item.is_file():
+                                    # Filtrar ejecutables del sistema y desinstaladores
+                                    if not self.is_system(lower):
+                                        found.append(_folder_program(name, item.path))
+                                elif item.is_dir():
+                                    subdirs.append(name)
+                                    if descend and not self.is_excluded(name):
+                                        # En Windows el mtime viene con la entrada, sin stat extra
+                                        children.append((item.path, depth + 1,
+                                                         item.stat(follow_symlinks=False).st_mtime_ns))
+                            except OSError:
+                                continue
+                            if budget <= 0:
+                                break
+                except (PermissionError, OSError):
+                    pass
+                self.count(False)
+                if self.cache is not None and budget > 0:
+                    # Una carpeta leída a medias no se guarda
+                    self.cache.put('folders', folder,
+                                   {'stamp': stamp, 'programs': found, 'subdirs': subdirs}, cancel)
+                for program in found:
+                    yield dict(program)
+                stack.extend(reversed(children))
+
+            if budget <= 0:
+                print(f"[!] Límite de {self.entry_budget} entradas alcanzado en {root}")
+                self.truncated.add(root)
+                return
@@ -1,7 +1,6 @@
 import threading
 import time
 from PyQt5.QtCore import QObject, pyqtSignal
-import keyboard
 
 class HotkeyManager(QObject):
     hotkey_pressed = pyqtSignal(str)
@@ -38,6 +37,8 @@ class HotkeyManager(QObject):
             self.thread.join()
             
     def _monitor_keys(self):
+        # keyboard instala su gancho al importarse: se carga en este hilo, fuera del arranque
+        import keyboard
         for combo, profile_name in self.registered_hotkeys.items():
             keyboard.add_hotkey(combo, lambda name=profile_name: self.hotkey_pressed.emit(name))
         while self.running:
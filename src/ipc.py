@@ -0,0 +1,238 @@
+"""
+Canal local entre la instancia en ejecución y los disparadores externos.
+La interfaz abre un punto de conexión (tubería con nombre en Windows, socket Unix en el
+resto) y atiende 'run', 'switch', 'cancel', 'status' y 'ping' con su ProfileManager ya
+cargado. Este módulo no importa nada pesado: lo usa también el cliente mínimo.
+"""
+import os
+import sys
+import threading
+from multiprocessing.connection import Client, Listener
+
+# Comandos que entiende el servidor
+COMMANDS = ('run', 'switch', 'cancel', 'status', 'ping')
+
+# Segundos que espera el cliente la respuesta. 'switch' responde cuando ha tomado la
+# instantánea del escritorio y recolocado las ventanas, así que puede tardar más.
+DEFAULT_TIMEOUT = 2.0
+COMMAND_TIMEOUTS = {'switch': 30.0}
+
+
+def default_data_dir():
+    return os.path.join(os.path.expanduser("~"), "AppData", "Local", "ProgramProfileManager")
+
+
+def ipc_address(data_dir=None):
+    """Dirección del punto de conexión de la instancia de este usuario"""
+    if sys.platform == 'win32':
+        user = os.environ.get('USERNAME', 'default')
+        return r'\\.\pipe\ProgramProfileManager-' + user
+    return os.path.join(data_dir or default_data_dir(), 'ipc.sock')
+
+
+def _key_path(data_dir):
+    return os.path.join(data_dir or default_data_dir(), 'ipc.key')
+
+
+def load_authkey(data_dir=None, create=False):
+    """
+    Clave compartida del canal; None si no existe.
+    Se crea con permisos 0o600: en Unix solo la lee el usuario, pero en Windows ese modo no
+    pone ninguna ACL y el archivo hereda los permisos del directorio de datos (el perfil del
+    usuario). La tubería con nombre tampoco restringe quién se conecta: la clave es lo que
+    autentica al cliente.
+    """
+    path = _key_path(data_dir)
+    try:
+        with open(path, 'rb') as f:
+            key = f.read()
+        if key:
+            return key
+    except OSError:
+        if not create:
+            return None
+    if not create:
+        return None
+    import secrets
+    key = secrets.token_bytes(32)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+class InstanceLock:
+    """
+    Garantiza una sola instancia de la aplicación por usuario, con un bloqueo exclusivo
+    sobre un archivo del directorio de datos (lo libera el sistema si el proceso muere).
+    """
+
+    def __init__(self, data_dir=None):
+        self.path = os.path.join(data_dir or default_data_dir(), 'instance.lock')
+        self._file = None
+
+    def acquire(self):
+        """Devuelve False si ya hay otra instancia en ejecución"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        f = open(self.path, 'a+')
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def send_command(command, timeout=None, data_dir=None, **params):
+    """
+    Enviar un comando a la instancia en ejecución y devolver su respuesta (dict).
+    Sin timeout se usa el del comando (COMMAND_TIMEOUTS) o DEFAULT_TIMEOUT.
+    Devuelve None si no hay ninguna instancia escuchando.
+    """
+    if timeout is None:
+        timeout = COMMAND_TIMEOUTS.get(command, DEFAULT_TIMEOUT)
+    authkey = load_authkey(data_dir)
+    if authkey is None:
+        return None
+    address = ipc_address(data_dir)
+    if sys.platform != 'win32' and not os.path.exists(address):
+        return None
+    try:
+        conn = Client(address, authkey=authkey)
+    except (OSError, EOFError):
+        return None
+    try:
+        conn.send(dict(params, command=command))
+        if not conn.poll(timeout):
+            return {'ok': False, 'error': 'La instancia no ha respondido'}
+        return conn.recv()
+    except (OSError, EOFError) as e:
+        return {'ok': False, 'error': str(e)}
+    finally:
+        conn.close()
+
+
+class IpcServer:
+    """
+    Servidor del canal local. Cada conexión se atiende en su propio hilo con el
+    ProfileManager de la instancia (almacén, tabla de procesos y monitores ya en caché).
+    on_run(run) se llama con cada ProfileRun iniciado desde fuera, desde el hilo del servidor.
+    """
+
+    def __init__(self, manager, data_dir=None, on_run=None):
+        self.manager = manager
+        self.data_dir = data_dir
+        self.on_run = on_run
+        self.address = ipc_address(data_dir)
+        self._listener = None
+        self._thread = None
+        self._stopping = False
+
+    def start(self):
+        authkey = load_authkey(self.data_dir, create=True)
+        if sys.platform != 'win32' and os.path.exists(self.address):
+            # Socket de una instancia anterior que no se cerró bien (el bloqueo de instancia
+            # garantiza que no hay otra escuchando)
+            os.unlink(self.address)
+        self._listener = Listener(self.address, authkey=authkey)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def _serve(self):
+        while not self._stopping:
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                if self._stopping:
+                    return
+                # Cliente con clave incorrecta o conexión interrumpida
+                print(f"[WARN] Conexión IPC rechazada: {e}")
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        try:
+            if not conn.poll(5):
+                return
+            request = conn.recv()
+            try:
+                response = self.dispatch(request)
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            conn.send(response)
+        except (OSError, EOFError):
+            pass
+        finally:
+            conn.close()
+
+    def dispatch(self, request):
+        command = request.get('command') if isinstance(request, dict) else None
+        if command not in COMMANDS:
+            return {'ok': False, 'error': f"Comando desconocido: {command}"}
+        if command == 'ping':
+            return {'ok': True, 'pid': os.getpid()}
+        if command == 'status':
+            return {'ok': True, 'pid': os.getpid(), 'runs': [
+                {'profile': run.profile_name, 'programs': len(run),
+                 'done': sum(1 for task in run.tasks if task.done()),
+                 'wall_time': round(run.wall_time, 3)}
+                for run in self.manager.executor.active_runs()
+            ]}
+        if command == 'cancel':
+            return {'ok': True, 'cancelled': self.manager.cancel_profile(request.get('profile'))}
+
+        profile_name = request.get('profile')
+        if not profile_name:
+            return {'ok': False, 'error': "Falta el nombre del perfil"}
+        if command == 'run':
+            run = self.manager.execute_profile(profile_name)
+            if run is None:
+                return {'ok': False, 'error': f"Perfil '{profile_name}' no encontrado"}
+            self._started(run)
+            return {'ok': True, 'queued': len(run)}
+
+        result = self.manager.switch_profile(profile_name,
+                                             close_others=bool(request.get('close_others')))
+        if result is None:
+            return {'ok': False, 'error': f"Perfil '{profile_name}' no encontrado"}
+        if result.run is not None:
+            self._started(result.run)
+        diff = result.diff
+        return {'ok': True, 'kept': len(diff.keep), 'moved': len(diff.move),
+                'launched': len(diff.launch), 'closed': len(result.closed),
+                'closable': len(diff.close)}
+
+    def _started(self, run):
+        if self.on_run is not None:
+            try:
+                self.on_run(run)
+            except Exception as e:
+                print(f"[ERROR] Al notificar la ejecución de '{run.profile_name}': {e}")
+
+    def stop(self):
+        self._stopping = True
+        if self._listener is None:
+            return
+        # accept() no se desbloquea al cerrar: se despierta con una conexión propia
+        try:
+            Client(self.address, authkey=load_authkey(self.data_dir)).close()
+        except Exception:
+            pass
+        # Al cerrar, el Listener borra también el archivo del socket Unix
+        self._listener.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
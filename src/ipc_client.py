@@ -0,0 +1,34 @@
+"""
+Cliente mínimo del canal local: reenvía un comando a la instancia en ejecución y termina.
+
+    python -m src.ipc_client switch <perfil>
+    python -m src.ipc_client run <perfil>
+    python -m src.ipc_client cancel [<perfil>]
+    python -m src.ipc_client status
+
+Sale con código 3 si no hay ninguna instancia escuchando.
+"""
+import sys
+from src.ipc import COMMANDS, send_command
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(f"Uso: python -m src.ipc_client {{{'|'.join(COMMANDS)}}} [perfil]")
+        return 2
+    params = {'profile': argv[1]} if len(argv) > 1 else {}
+    response = send_command(argv[0], **params)
+    if response is None:
+        print("No hay ninguna instancia en ejecución")
+        return 3
+    if not response.get('ok'):
+        print(f"[ERROR] {response.get('error')}")
+        return 1
+    details = ', '.join(f"{key}: {value}" for key, value in response.items() if key != 'ok')
+    print(details or "ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
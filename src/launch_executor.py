@@ -0,0 +1,299 @@
+import itertools
+import queue
+import threading
+import time
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# Fases de un lanzamiento, en orden; cada tarea guarda el instante en que alcanzó cada una.
+# finished marca el fin del lanzamiento; placed llega después, al colocar el lote de ventanas.
+PHASE_QUEUED = 'queued'
+PHASE_STARTED = 'started'
+PHASE_SPAWNED = 'spawned'
+PHASE_PID_FOUND = 'pid_found'
+PHASE_HWND_FOUND = 'hwnd_found'
+PHASE_FINISHED = 'finished'
+PHASE_PLACED = 'placed'
+PHASES = (PHASE_QUEUED, PHASE_STARTED, PHASE_SPAWNED, PHASE_PID_FOUND,
+          PHASE_HWND_FOUND, PHASE_FINISHED, PHASE_PLACED)
+
+# Evento que reciben los oyentes cuando termina la ejecución completa
+RUN_FINISHED = 'run_finished'
+
+
+class LaunchTask:
+    """Lanzamiento de un programa dentro de una ejecución de perfil (similar a un future)"""
+
+    def __init__(self, run, index, program):
+        self.run = run
+        self.index = index
+        # program es la configuración del programa o un ProgramPlan ya compilado
+        self.program = program
+        self.program_config = getattr(program, 'config', program)
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.timestamps = {}
+        self.details = {}
+        self._done = threading.Event()
+
+    @property
+    def name(self):
+        return self.program_config.get('name', 'programa')
+
+    def mark(self, phase, **details):
+        """
+        Registrar que la tarea ha alcanzado una fase (solo cuenta la primera vez).
+        details guarda datos extra del lanzamiento, como la estrategia que encontró la ventana.
+        """
+        if details:
+            self.details.update(details)
+        if phase not in self.timestamps:
+            self.timestamps[phase] = time.monotonic()
+            self.run._notify(self, phase)
+
+    def phase_times(self):
+        """Segundos desde el inicio de la ejecución del perfil hasta cada fase alcanzada"""
+        return {phase: round(ts - self.run.started_at, 4)
+                for phase, ts in sorted(self.timestamps.items(), key=lambda item: item[1])}
+
+    def duration(self, start_phase, end_phase):
+        """Segundos entre dos fases, o None si alguna no se alcanzó"""
+        if start_phase in self.timestamps and end_phase in self.timestamps:
+            return self.timestamps[end_phase] - self.timestamps[start_phase]
+        return None
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.result
+
+    def _finish(self, status, result=None, error=None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.mark(PHASE_FINISHED)
+        self._done.set()
+        self.run._task_finished(self)
+
+
+class ProfileRun:
+    """
+    Ejecución de un perfil enviada al LaunchExecutor.
+    Permite esperar los resultados, consultar el estado y las fases de cada programa y cancelar.
+    on_complete(run) se llama una vez, desde el hilo que termina la última tarea.
+    Los oyentes añadidos con add_listener reciben (run, task, fase) en cada cambio de fase
+    y (run, None, RUN_FINISHED) al terminar, desde el hilo que produce el cambio.
+    """
+
+    def __init__(self, profile_name, programs, priority=0, on_complete=None):
+        self.profile_name = profile_name
+        self.priority = priority
+        self.on_complete = on_complete
+        self.cancel_event = threading.Event()
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.tasks = [LaunchTask(self, i, p) for i, p in enumerate(programs)]
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._remaining = len(self.tasks)
+        self._done = threading.Event()
+        for task in self.tasks:
+            task.mark(PHASE_QUEUED)
+        if not self.tasks:
+            self._complete()
+
+    def __len__(self):
+        return len(self.tasks)
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Cancelar: las tareas pendientes no se lanzan y las activas dejan de esperar su ventana"""
+        self.cancel_event.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Esperar a que terminen todas las tareas; devuelve True si han terminado"""
+        return self._done.wait(timeout)
+
+    def results(self):
+        return [task.result for task in self.tasks]
+
+    @property
+    def wall_time(self):
+        """Duración total de la ejecución (hasta ahora si no ha terminado)"""
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    def summary(self):
+        """Estado y tiempos por programa, listo para mostrar o registrar"""
+        return [
+            {
+                'name': task.name,
+                'status': task.status,
+                'phases': task.phase_times(),
+                'error': str(task.error) if task.error else None
+            }
+            for task in self.tasks
+        ]
+
+    def add_listener(self, listener):
+        """
+        Suscribirse a los cambios de fase; si ya terminó, se notifica el final al momento.
+        RUN_FINISHED llega exactamente una vez: la comprobación y el registro se hacen con
+        el mismo lock con el que _complete toma la lista de oyentes a avisar.
+        """
+        with self._lock:
+            finished = self._done.is_set()
+            if not finished:
+                self._listeners.append(listener)
+        if finished:
+            self._call(listener, None, RUN_FINISHED)
+
+    def _call(self, listener, task, phase):
+        try:
+            listener(self, task, phase)
+        except Exception as e:
+            print(f"[ERROR] En oyente de la ejecución '{self.profile_name}': {e}")
+
+    def _notify(self, task, phase, listeners=None):
+        if listeners is None:
+            with self._lock:
+                listeners = list(self._listeners)
+        for listener in listeners:
+            self._call(listener, task, phase)
+
+    def _task_finished(self, task):
+        with self._lock:
+            self._remaining -= 1
+            finished = self._remaining == 0
+        if finished:
+            self._complete()
+
+    def _complete(self):
+        if self.on_complete:
+            try:
+                self.on_complete(self)
+            except Exception as e:
+                print(f"[ERROR] Al completar el perfil '{self.profile_name}': {e}")
+        with self._lock:
+            self.finished_at = time.monotonic()
+            self._done.set()
+            listeners = list(self._listeners)
+        self._notify(None, RUN_FINISHED, listeners)
+
+
+class LaunchExecutor:
+    """
+    Pool acotado de hilos que lanza los programas de los perfiles.
+    Las tareas se atienden por prioridad del perfil (mayor primero), después por orden de
+    llegada del perfil y por último en el orden de programas del editor.
+    launcher(program, cancel_event, on_phase) hace el trabajo real y devuelve su resultado
+    (program es lo que se envió en submit: configuración o ProgramPlan); on_phase(fase) registra los hitos del lanzamiento (spawned, pid_found, ...).
+    """
+
+    def __init__(self, launcher, max_workers=6):
+        self.launcher = launcher
+        self.max_workers = max_workers
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._runs = []
+        self._shutdown = False
+
+    def submit(self, profile_name, programs, priority=0, on_complete=None):
+        run = ProfileRun(profile_name, programs, priority=priority, on_complete=on_complete)
+        sequence = next(self._sequence)
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("El ejecutor de lanzamientos está detenido")
+            self._runs = [r for r in self._runs if not r.done()]
+            self._runs.append(run)
+            for task in run.tasks:
+                self._queue.put((-priority, sequence, task.index, task))
+            self._ensure_workers(len(run.tasks))
+        return run
+
+    def _ensure_workers(self, pending):
+        alive = [w for w in self._workers if w.is_alive()]
+        self._workers = alive
+        for _ in range(min(self.max_workers - len(alive), pending)):
+            worker = threading.Thread(target=self._work, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            task = self._queue.get()[-1]
+            if task is None:
+                return
+            if task.run.cancelled:
+                task._finish(CANCELLED)
+                continue
+            task.status = RUNNING
+            task.mark(PHASE_STARTED)
+            try:
+                result = self.launcher(task.program, task.run.cancel_event, task.mark)
+            except Exception as e:
+                print(f"Error al lanzar {task.name}: {e}")
+                task._finish(FAILED, error=e)
+                continue
+            if task.run.cancelled and not result:
+                task._finish(CANCELLED)
+            else:
+                task._finish(DONE if result else FAILED, result=result)
+
+    def active_runs(self, profile_name=None):
+        with self._lock:
+            return [r for r in self._runs
+                    if not r.done() and (profile_name is None or r.profile_name == profile_name)]
+
+    def cancel(self, profile_name=None):
+        """Cancelar las ejecuciones en curso (de un perfil o todas); devuelve cuántas"""
+        runs = self.active_runs(profile_name)
+        for run in runs:
+            run.cancel()
+        return len(runs)
+
+    def shutdown(self, cancel=True):
+        with self._lock:
+            self._shutdown = True
+            workers = list(self._workers)
+        if cancel:
+            self.cancel()
+        for _ in workers:
+            # Marca de parada, ordenada detrás de cualquier tarea pendiente
+            self._queue.put((float('inf'), 0, 0, None))
+        for worker in workers:
+            worker.join()
+
+
+def describe_run(run):
+    """Resumen de una ejecución para la barra de estado o la consola"""
+    ok = sum(1 for task in run.tasks if task.status == DONE)
+    text = f"Perfil '{run.profile_name}': {ok}/{len(run)} programas en {run.wall_time:.2f} s"
+    if run.cancelled:
+        return text + " (cancelado)"
+    slowest = None
+    for task in run.tasks:
+        duration = task.duration(PHASE_QUEUED, PHASE_HWND_FOUND)
+        if duration is not None and (slowest is None or duration > slowest[1]):
+            slowest = (task.name, duration)
+    if slowest:
+        text += f"; más lento: {slowest[0]} ({slowest[1]:.2f} s)"
+    failed = [task.name for task in run.tasks if task.status != DONE]
+    if failed:
+        text += f"; fallidos: {', '.join(failed)}"
+    return text
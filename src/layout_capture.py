@@ -0,0 +1,92 @@
+import os
+from src.window_snapshot import STATE_MAXIMIZED, STATE_MINIMIZED
+from src.profile_switch import SHELL_CLASSES
+
+# Geometría por defecto del editor, para ventanas minimizadas (su posición real no se conoce)
+DEFAULT_GEOMETRY = {'x': 100, 'y': 100, 'width': 800, 'height': 600}
+
+
+def monitor_for_rect(rect, monitors):
+    """Índice del monitor que contiene el centro del rectángulo (o el más cercano)"""
+    x, y, width, height = rect
+    cx, cy = x + width // 2, y + height // 2
+    best, best_distance = 0, None
+    for index, m in enumerate(monitors):
+        if m.x <= cx < m.x + m.width and m.y <= cy < m.y + m.height:
+            return index
+        dx = max(m.x - cx, 0, cx - (m.x + m.width - 1))
+        dy = max(m.y - cy, 0, cy - (m.y + m.height - 1))
+        distance = dx * dx + dy * dy
+        if best_distance is None or distance < best_distance:
+            best, best_distance = index, distance
+    return best
+
+
+def capture_layout(windows, processes, monitors, exclude_pids=()):
+    """
+    Convertir una enumeración de ventanas en configuraciones de programa para un perfil.
+    Una sola pasada: el proceso de cada ventana sale de la ProcessTable ya refrescada
+    (consulta por PID) y la geometría se guarda relativa a su monitor.
+    De cada ejecutable se toma solo la ventana más alta en orden Z.
+    """
+    exclude_pids = set(exclude_pids) | {os.getpid()}
+    programs = []
+    seen_paths = set()
+    for window in windows:
+        if not window.title or window.class_name in SHELL_CLASSES or window.pid in exclude_pids:
+            continue
+        info = processes.get(window.pid)
+        if info is None or not info.exe:
+            continue
+        key = os.path.normcase(info.exe)
+        if key in seen_paths:
+            continue
+
+        if window.state == STATE_MINIMIZED or window.rect is None:
+            monitor = 0
+            geometry = dict(DEFAULT_GEOMETRY)
+        else:
+            if window.rect[2] <= 0 or window.rect[3] <= 0:
+                continue
+            monitor = monitor_for_rect(window.rect, monitors) if monitors else 0
+            m = monitors[monitor] if monitors else None
+            if window.state == STATE_MAXIMIZED and m is not None:
+                geometry = {'x': 0, 'y': 0, 'width': m.width, 'height': m.height}
+            else:
+                x, y, width, height = window.rect
+                geometry = {'x': x - (m.x if m else 0), 'y': y - (m.y if m else 0),
+                            'width': width, 'height': height}
+        seen_paths.add(key)
+
+        window_config = {'monitor': monitor, 'maximized': window.state == STATE_MAXIMIZED}
+        window_config.update(geometry)
+        program = {
+            'name': os.path.splitext(info.name or os.path.basename(info.exe))[0],
+            'path': info.exe,
+            'window_config': window_config,
+            'start_minimized': window.state == STATE_MINIMIZED,
+            'avoid_duplicates': True
+        }
+        if window.class_name:
+            # Desempata la búsqueda por título entre ventanas de nombre parecido
+            program['window_class'] = window.class_name
+        programs.append(program)
+    return programs
+
+
+def capture_current_layout(snapshot=None, processes=None, topology=None):
+    """
+    Capturar la disposición actual del escritorio: una enumeración de ventanas y, de la tabla
+    de procesos, solo se leen los dueños de esas ventanas que aún no conoce.
+    Hace llamadas al sistema: desde la interfaz, llamarla en un hilo aparte.
+    """
+    from src.window_snapshot import get_shared_snapshot
+    from src.process_table import get_shared_process_table
+    from src.monitor_topology import get_shared_topology
+
+    snapshot = snapshot if snapshot is not None else get_shared_snapshot()
+    processes = processes if processes is not None else get_shared_process_table()
+    topology = topology if topology is not None else get_shared_topology()
+    snapshot.refresh(force=True)
+    processes.refresh_pids(snapshot.pids())
+    return capture_layout(snapshot.windows(), processes, topology.monitors())
@@ -1,25 +1,49 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QPushButton, QListWidget, QLabel, QMessageBox,
-                             QInputDialog, QSplitter, QGroupBox, QScrollArea)
-from PyQt5.QtCore import Qt, QTimer
+                             QInputDialog, QSplitter, QGroupBox, QScrollArea,
+                             QApplication, QProgressBar, QListView, QLineEdit)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QFont
-from .program_scanner import ProgramScanner
 from .profile_manager import ProfileManager
-from .profile_editor import ProfileEditor
 from .hotkey_manager import HotkeyManager
+from .program_catalog import load_cached_programs
+from .monitor_topology import get_shared_topology
+from .launch_executor import describe_run
+from .run_monitor import ProfileRunMonitor
+from .scan_worker import ScanWorker
+from .program_models import ProgramListModel, ProgramSearchProxy
 import os
+import threading
+import time
 
 class MainWindow(QMainWindow):
+    # Ejecución iniciada desde fuera (canal IPC); se emite desde el hilo del servidor
+    external_run_started = pyqtSignal(object)
+    # Cambio de perfil terminado en su hilo: (perfil, SwitchResult o None, error)
+    switch_finished = pyqtSignal(str, object, str)
+
     def __init__(self):
         super().__init__()
-        self.program_scanner = ProgramScanner()
+        # El escáner y el editor se importan al usarse: no retrasan el arranque
+        self._program_scanner = None
+        self.programs = []
+        self.scan_worker = None
         self.profile_manager = ProfileManager()
         self.hotkey_manager = HotkeyManager()
+        self.run_monitor = ProfileRunMonitor()
+        self.run_monitor.program_phase.connect(self.on_program_phase)
+        self.run_monitor.run_finished.connect(self.on_run_finished)
+        self.external_run_started.connect(self.on_external_run)
+        self.switch_finished.connect(self.on_switch_finished)
+        self._switching = False
         self.profile_editor = None
+        self._plans_thread = None
         
         self.init_ui()
+        self.watch_display_changes()
         self.load_profiles()
-        self.scan_programs()
+        # Los programas salen del último escaneo guardado, después de pintar la ventana
+        QTimer.singleShot(0, self.load_cached_programs)
         self.hotkey_manager.hotkey_pressed.connect(self.execute_profile_by_name)
         self.hotkey_manager.start_monitoring()
         
@@ -51,12 +75,82 @@ class MainWindow(QMainWindow):
         
         # Barra de estado
         self.statusBar().showMessage("Listo")
+    def watch_display_changes(self):
+        """Invalidar la caché de monitores cuando cambia la configuración de pantallas"""
+        app = QApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.on_display_changed)
+        app.primaryScreenChanged.connect(self.on_display_changed)
+        for screen in app.screens():
+            screen.geometryChanged.connect(self.on_display_changed)
+
+    def on_screen_added(self, screen):
+        screen.geometryChanged.connect(self.on_display_changed)
+        self.on_display_changed()
+
+    def on_display_changed(self, *args):
+        get_shared_topology().invalidate()
+
     def execute_profile_by_name(self, profile_name):
         if self.profile_manager.profile_exists(profile_name):
             self.statusBar().showMessage(f"Hotkey ejecuta: {profile_name}")
-            self.profile_manager.execute_profile(profile_name)
+            run = self.profile_manager.execute_profile(profile_name)
+            if run is not None:
+                self.run_monitor.watch(run)
+                self.cancel_run_btn.setEnabled(True)
         else:
-            self.statusBar().showMessage(f"Perfil no encontrado: {profile_name}")        
+            self.statusBar().showMessage(f"Perfil no encontrado: {profile_name}")
+
+    def switch_to_profile(self, profile_name):
+        """
+        Cambio diferencial al perfil en un hilo aparte: la instantánea del escritorio y la
+        recolocación no bloquean la interfaz. El resultado llega con switch_finished.
+        """
+        if self._switching:
+            return
+        self._switching = True
+        self.switch_btn.setEnabled(False)
+        self.statusBar().showMessage(f"Cambiando al perfil: {profile_name}")
+
+        def work():
+            try:
+                result = self.profile_manager.switch_profile(profile_name)
+                self.switch_finished.emit(profile_name, result, '')
+            except Exception as e:
+                self.switch_finished.emit(profile_name, None, str(e))
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def on_switch_finished(self, profile_name, result, error):
+        """Resultado del cambio de perfil (en el hilo de la interfaz)"""
+        self._switching = False
+        self.switch_btn.setEnabled(bool(self.profiles_list.currentItem()))
+        if error:
+            QMessageBox.critical(self, "Error", f"Error al cambiar de perfil: {error}")
+            self.statusBar().showMessage("Error al cambiar de perfil")
+            return
+        if result is None:
+            self.statusBar().showMessage(f"Perfil no encontrado: {profile_name}")
+            return
+        if result.run is not None:
+            self.run_monitor.watch(result.run)
+            self.cancel_run_btn.setEnabled(True)
+        diff = result.diff
+        closed = []
+        if diff.close:
+            titles = "\n".join(f"• {window.title}" for window in diff.close[:15])
+            if len(diff.close) > 15:
+                titles += f"\n… y {len(diff.close) - 15} más"
+            reply = QMessageBox.question(self, "Cerrar otras ventanas",
+                                         f"El perfil '{profile_name}' cierra las ventanas que no "
+                                         f"forman parte de él:\n\n{titles}\n\n¿Cerrarlas?",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                closed = self.profile_manager.close_windows(diff.close)
+        self.statusBar().showMessage(
+            f"Perfil '{profile_name}': {len(diff.keep) + len(diff.move)} reutilizados, "
+            f"{len(diff.launch)} por lanzar, {len(closed)} cerrados")
+
     def create_profiles_panel(self):
         """Crear panel de perfiles guardados"""
         group = QGroupBox("Perfiles Guardados")
@@ -107,6 +201,18 @@ class MainWindow(QMainWindow):
         """)
         layout.addWidget(self.execute_btn)
         
+        # Botón cambiar a perfil: reutiliza lo que ya está abierto y solo lanza lo que falta
+        self.switch_btn = QPushButton("Cambiar a Perfil")
+        self.switch_btn.clicked.connect(self.switch_selected_profile)
+        self.switch_btn.setEnabled(False)
+        layout.addWidget(self.switch_btn)
+        
+        # Botón cancelar ejecuciones en curso
+        self.cancel_run_btn = QPushButton("Cancelar Ejecución")
+        self.cancel_run_btn.clicked.connect(self.cancel_runs)
+        self.cancel_run_btn.setEnabled(False)
+        layout.addWidget(self.cancel_run_btn)
+        
         # Conectar selección de perfil
         self.profiles_list.itemSelectionChanged.connect(self.on_profile_selection_changed)
         
@@ -117,13 +223,39 @@ class MainWindow(QMainWindow):
         group = QGroupBox("Programas Instalados")
         layout = QVBoxLayout(group)
         
-        # Botón para escanear programas
+        # Botones para escanear programas y cancelar el escaneo
+        scan_layout = QHBoxLayout()
         self.scan_btn = QPushButton("Escanear Programas")
         self.scan_btn.clicked.connect(self.scan_programs)
-        layout.addWidget(self.scan_btn)
+        scan_layout.addWidget(self.scan_btn)
+        
+        self.cancel_scan_btn = QPushButton("Cancelar Escaneo")
+        self.cancel_scan_btn.clicked.connect(self.cancel_scan)
+        self.cancel_scan_btn.setEnabled(False)
+        scan_layout.addWidget(self.cancel_scan_btn)
+        layout.addLayout(scan_layout)
+        
+        # Progreso del escaneo (fuentes terminadas)
+        self.scan_progress = QProgressBar()
+        self.scan_progress.setVisible(False)
+        layout.addWidget(self.scan_progress)
+        
+        # Buscador
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(QLabel("Buscar:"))
+        self.search_edit = QLineEdit()
+        search_layout.addWidget(self.search_edit)
+        layout.addLayout(search_layout)
         
-        # Lista de programas
-        self.programs_list = QListWidget()
+        # Lista de programas: modelo con los lotes del escaneo y vista filtrada por el índice
+        self.programs_model = ProgramListModel(
+            label=lambda program: f"{program['name']} - {program['path']}", parent=self)
+        self.programs_proxy = ProgramSearchProxy(self)
+        self.programs_proxy.setSourceModel(self.programs_model)
+        self.search_edit.textChanged.connect(self.programs_proxy.set_query)
+        self.programs_list = QListView()
+        self.programs_list.setUniformItemSizes(True)
+        self.programs_list.setModel(self.programs_proxy)
         layout.addWidget(self.programs_list)
         
         # Label de información
@@ -133,39 +265,95 @@ class MainWindow(QMainWindow):
         
         return group
         
+    @property
+    def program_scanner(self):
+        if self._program_scanner is None:
+            from .program_scanner import ProgramScanner
+            self._program_scanner = ProgramScanner()
+        return self._program_scanner
+        
+    def load_cached_programs(self):
+        """Mostrar los programas del último escaneo; si no hay ninguno, escanear en segundo plano"""
+        programs, scanned_at = load_cached_programs()
+        if not programs:
+            self.scan_programs()
+            return
+        self.show_programs(programs)
+        when = time.strftime('%d/%m/%Y %H:%M', time.localtime(scanned_at)) if scanned_at else '?'
+        self.statusBar().showMessage(f"{len(programs)} programas (último escaneo: {when})")
+        
+    def show_programs(self, programs):
+        """Mostrar una lista completa de programas (el índice de búsqueda se reconstruye)"""
+        self.programs = programs
+        self.programs_model.set_programs(programs)
+        
     def scan_programs(self):
-        """Escanear programas instalados"""
+        """Escanear programas instalados en un hilo de trabajo; los resultados llegan por lotes"""
+        if self.scan_worker is not None and self.scan_worker.isRunning():
+            return
         self.statusBar().showMessage("Escaneando programas...")
         self.scan_btn.setEnabled(False)
+        self.cancel_scan_btn.setEnabled(True)
+        self.scan_progress.setRange(0, 0)
+        self.scan_progress.setVisible(True)
+        self.programs_model.set_programs([])
+        self._scan_found = 0
         
-        # Usar QTimer para no bloquear la UI
-        QTimer.singleShot(100, self._do_scan)
+        self.scan_worker = ScanWorker(self.program_scanner, parent=self)
+        self.scan_worker.batch_ready.connect(self.on_scan_batch)
+        self.scan_worker.progress.connect(self.on_scan_progress)
+        self.scan_worker.scan_finished.connect(self.on_scan_finished)
+        self.scan_worker.start()
         
-    def _do_scan(self):
-        """Realizar el escaneo real"""
-        try:
-            programs = self.program_scanner.scan_installed_programs()
-            self.programs_list.clear()
-            
-            for program in programs:
-                self.programs_list.addItem(f"{program['name']} - {program['path']}")
-                
-            self.statusBar().showMessage(f"Encontrados {len(programs)} programas")
+    def cancel_scan(self):
+        """Detener el escaneo en curso (se conserva lo encontrado hasta ahora)"""
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+            self.cancel_scan_btn.setEnabled(False)
+            self.statusBar().showMessage("Cancelando escaneo...")
             
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al escanear programas: {str(e)}")
+    def on_scan_batch(self, programs):
+        """Un lote de programas nuevos: se añade a la lista de una vez"""
+        self.programs_model.append(programs)
+        self._scan_found += len(programs)
+        self.statusBar().showMessage(f"Escaneando programas... {self._scan_found} encontrados")
+        
+    def on_scan_progress(self, source, done, total):
+        self.scan_progress.setRange(0, total)
+        self.scan_progress.setValue(done)
+        
+    def on_scan_finished(self, programs, error, cancelled):
+        worker = self.scan_worker
+        self.scan_btn.setEnabled(True)
+        self.cancel_scan_btn.setEnabled(False)
+        self.scan_progress.setVisible(False)
+        if error is not None:
+            QMessageBox.critical(self, "Error", f"Error al escanear programas: {str(error)}")
             self.statusBar().showMessage("Error al escanear")
-            
-        finally:
-            self.scan_btn.setEnabled(True)
+            return
+        # La lista definitiva va ordenada y sin duplicados
+        self.show_programs(programs)
+        first = worker.first_result_after
+        first_text = f"primer resultado a los {first * 1000:.0f} ms" if first is not None else "sin resultados"
+        if cancelled:
+            self.statusBar().showMessage(f"Escaneo cancelado: {len(programs)} programas ({first_text})")
+            return
+        timings = self.program_scanner.format_scan_timings()
+        self.statusBar().showMessage(f"Encontrados {len(programs)} programas, {first_text} ({timings})")
             
     def load_profiles(self):
         """Cargar perfiles guardados"""
-        profiles = self.profile_manager.load_profiles()
         self.profiles_list.clear()
         
-        for profile_name in profiles.keys():
+        for profile_name in self.profile_manager.profile_names():
             self.profiles_list.addItem(profile_name)
+        # Compilar los planes de ejecución en segundo plano, así la primera hotkey no paga
+        # la resolución de monitores, geometría y rutas ni retrasa el arranque.
+        # Si aún hay una compilación en curso no se lanza otra: los planes se compilan
+        # igualmente al pedirlos (get_plan) si han cambiado
+        if self._plans_thread is None or not self._plans_thread.is_alive():
+            self._plans_thread = threading.Thread(target=self.profile_manager.prepare_plans, daemon=True)
+            self._plans_thread.start()
             
     def create_new_profile(self):
         """Crear un nuevo perfil"""
@@ -186,13 +374,15 @@ class MainWindow(QMainWindow):
             
     def open_profile_editor(self, profile_name):
         """Abrir el editor de perfiles"""
-        programs = self.program_scanner.get_cached_programs()
+        programs = self.programs
         if not programs:
             QMessageBox.information(self, "Información", 
                                   "Primero debes escanear los programas instalados")
             return
             
-        self.profile_editor = ProfileEditor(profile_name, programs, self.profile_manager)
+        from .profile_editor import ProfileEditor
+        self.profile_editor = ProfileEditor(profile_name, programs, self.profile_manager,
+                                            search_index=self.programs_proxy.search_index)
         self.profile_editor.profile_saved.connect(self.on_profile_saved)
         self.profile_editor.show()
         
@@ -205,7 +395,8 @@ class MainWindow(QMainWindow):
                                        f"¿Eliminar el perfil '{profile_name}'?",
                                        QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
-                self.profile_manager.delete_profile(profile_name)
+                if not self.profile_manager.delete_profile(profile_name):
+                    QMessageBox.critical(self, "Error", f"No se pudo eliminar el perfil '{profile_name}'")
                 self.load_profiles()
                 
     def execute_profile(self):
@@ -215,28 +406,60 @@ class MainWindow(QMainWindow):
             profile_name = current_item.text()
             try:
                 self.statusBar().showMessage(f"Ejecutando perfil: {profile_name}")
-                success_count = self.profile_manager.execute_profile(profile_name)
+                run = self.profile_manager.execute_profile(profile_name)
+                if run is None:
+                    self.statusBar().showMessage(f"Perfil no encontrado: {profile_name}")
+                    return
+                self.run_monitor.watch(run)
+                self.cancel_run_btn.setEnabled(True)
                 self.statusBar().showMessage(
-                    f"Perfil ejecutado: {success_count} programas iniciados"
+                    f"Perfil en ejecución: {len(run)} programas en cola"
                 )
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al ejecutar perfil: {str(e)}")
                 self.statusBar().showMessage("Error al ejecutar perfil")
                 
+    def switch_selected_profile(self):
+        """Cambiar al perfil seleccionado sin relanzar lo que ya está abierto"""
+        current_item = self.profiles_list.currentItem()
+        if current_item:
+            self.switch_to_profile(current_item.text())
+                
     def on_profile_selection_changed(self):
         """Manejar cambio de selección de perfil"""
         has_selection = bool(self.profiles_list.currentItem())
         self.edit_profile_btn.setEnabled(has_selection)
         self.delete_profile_btn.setEnabled(has_selection)
         self.execute_btn.setEnabled(has_selection)
+        self.switch_btn.setEnabled(has_selection and not self._switching)
+        
+    def cancel_runs(self):
+        """Cancelar todas las ejecuciones de perfiles en curso"""
+        cancelled = self.profile_manager.cancel_profile()
+        self.statusBar().showMessage(f"Ejecuciones canceladas: {cancelled}")
+        
+    def on_program_phase(self, profile_name, name, phase):
+        """Progreso de un programa de una ejecución (llega en el hilo de la interfaz)"""
+        self.statusBar().showMessage(f"{profile_name}: {name} → {phase}")
+        
+    def on_external_run(self, run):
+        """Ejecución pedida por un disparador externo: seguirla igual que las propias"""
+        self.statusBar().showMessage(f"Ejecución externa: {run.profile_name}")
+        self.run_monitor.watch(run)
+        self.cancel_run_btn.setEnabled(True)
+        
+    def on_run_finished(self, run):
+        """Resultado final de una ejecución con sus tiempos"""
+        self.statusBar().showMessage(describe_run(run))
+        if not self.profile_manager.executor.active_runs():
+            self.cancel_run_btn.setEnabled(False)
         
     def on_profile_saved(self):
         self.load_profiles()
 
         # Registra la hotkey del perfil recién guardado
         profile_name = self.profile_editor.profile_name
-        profiles = self.profile_manager.load_profiles()
-        profile = profiles.get(profile_name)
+        profile = self.profile_manager.get_profile(profile_name)
         if profile:
             hotkey = profile.get('hotkey')
             if hotkey:
@@ -245,4 +468,8 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Manejar cierre de la aplicación"""
         self.hotkey_manager.cleanup()
+        if self.scan_worker is not None and self.scan_worker.isRunning():
+            self.scan_worker.cancel()
+            self.scan_worker.wait(2000)
+        self.profile_manager.flush()
         event.accept()
\ No newline at end of file
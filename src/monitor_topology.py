@@ -0,0 +1,148 @@
+import sys
+import threading
+import time
+from collections import namedtuple
+
+# Rectángulo de un monitor en coordenadas absolutas de escritorio
+MonitorRect = namedtuple('MonitorRect', ['x', 'y', 'width', 'height', 'is_primary'])
+
+
+def screeninfo_monitor_source():
+    """Fuente real de monitores (screeninfo)"""
+    from screeninfo import get_monitors
+    return [
+        MonitorRect(m.x, m.y, m.width, m.height, bool(getattr(m, 'is_primary', False)))
+        for m in get_monitors()
+    ]
+
+
+# Métricas de GetSystemMetrics que cambian con la disposición de monitores
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+SM_CMONITORS = 80
+
+
+def win32_display_signature():
+    """Número de monitores y rectángulo del escritorio virtual (unos microsegundos)"""
+    import ctypes
+    metrics = ctypes.windll.user32.GetSystemMetrics
+    return tuple(metrics(index) for index in (SM_CMONITORS, SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN,
+                                              SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN))
+
+
+def resolve_monitor(monitor, monitors):
+    """
+    Traducir el valor de monitor de un perfil a un índice de monitors.
+    Admite índices (0=primario, 1=secundario, ...) y 'primary'/'secondary'.
+    Devuelve (índice, problema): problema explica por qué se usa 0 en su lugar, o es None.
+    """
+    if isinstance(monitor, int):
+        if 0 <= monitor < len(monitors):
+            return monitor, None
+        return 0, f"monitor {monitor} fuera de rango ({len(monitors)} monitores)"
+    if monitor == 'secondary':
+        if len(monitors) < 2:
+            return 0, f"pide el monitor secundario y solo hay {len(monitors)}"
+        for idx, m in enumerate(monitors):
+            if not m.is_primary:
+                return idx, None
+        return 1, None
+    if monitor == 'primary':
+        for idx, m in enumerate(monitors):
+            if m.is_primary:
+                return idx, None
+        return 0, None
+    if isinstance(monitor, str):
+        return 0, f"monitor desconocido '{monitor}'"
+    return 0, f"tipo de monitor no soportado: {type(monitor).__name__}"
+
+
+class MonitorTopology:
+    """
+    Caché de la disposición de monitores compartida por planificador y colocador.
+    Se recarga al recibir una notificación de cambio de pantalla (invalidate), cuando
+    cambia la firma barata de la pantalla (signature, si la hay) o, como respaldo, cuando
+    han pasado ttl segundos desde la última lectura. La firma cubre a los procesos sin
+    interfaz (línea de comandos, IPC) que no reciben la notificación.
+    generation se incrementa cada vez que la disposición cambia de verdad.
+    """
+
+    def __init__(self, source=None, ttl=30.0, signature=None):
+        if source is None:
+            source = screeninfo_monitor_source
+            if signature is None and sys.platform == 'win32':
+                signature = win32_display_signature
+        self.source = source
+        self.ttl = ttl
+        self.signature = signature
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._monitors = None
+        self._loaded_at = None
+        self._signature = None
+
+    def invalidate(self):
+        """Forzar una recarga en la próxima consulta (cambio de pantalla)"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _current_signature(self):
+        if self.signature is None:
+            return None
+        try:
+            return self.signature()
+        except Exception:
+            return None
+
+    def monitors(self):
+        with self._lock:
+            now = time.monotonic()
+            signature = self._current_signature()
+            if (self._loaded_at is None or now - self._loaded_at > self.ttl
+                    or signature != self._signature):
+                self._signature = signature
+                monitors = list(self.source())
+                if monitors != self._monitors:
+                    self._monitors = monitors
+                    self.generation += 1
+                    print("Monitores detectados:")
+                    for i, m in enumerate(monitors):
+                        print(f"{i}: ({m.x},{m.y}) {m.width}x{m.height}")
+                self._loaded_at = now
+            return self._monitors
+
+    def rect(self, index):
+        """Rectángulo del monitor index o None si no existe"""
+        monitors = self.monitors()
+        if 0 <= index < len(monitors):
+            return monitors[index]
+        return None
+
+    def resolve(self, monitor):
+        """Traducir el valor de monitor de un perfil a un índice (ver resolve_monitor)"""
+        index, problem = resolve_monitor(monitor, self.monitors())
+        if problem:
+            print(f"[WARN] Monitor no válido: {problem}, usando {index}")
+        return index
+
+
+_shared_topology = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_topology():
+    """Topología de monitores compartida por toda la aplicación"""
+    global _shared_topology
+    with _shared_lock:
+        if _shared_topology is None:
+            _shared_topology = MonitorTopology()
+        return _shared_topology
+
+
+def set_shared_topology(topology):
+    """Sustituir la topología compartida (por ejemplo, con monitores falsos)"""
+    global _shared_topology
+    with _shared_lock:
+        _shared_topology = topology
@@ -0,0 +1,276 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+# Datos de un proceso que necesitamos para localizar programas lanzados.
+# create_time distingue un proceso de otro posterior que reutiliza su PID.
+ProcessInfo = namedtuple('ProcessInfo', ['pid', 'name', 'exe', 'ppid', 'create_time'],
+                         defaults=(None, None))
+
+# Hora de creación de un proceso vivo que no se ha podido leer
+UNKNOWN_CREATE_TIME = 0.0
+
+
+def _norm_path(path):
+    return os.path.normcase(os.path.normpath(path))
+
+
+class PsutilProcessSource:
+    """Fuente real de procesos basada en psutil"""
+
+    def pids(self):
+        import psutil
+        return psutil.pids()
+
+    def info(self, pid):
+        import psutil
+        try:
+            proc = psutil.Process(pid)
+            name = proc.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        try:
+            exe = proc.exe()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError):
+            exe = None
+        try:
+            ppid = proc.ppid()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            ppid = None
+        return ProcessInfo(pid, name, exe, ppid, self.create_time(pid))
+
+    def create_time(self, pid):
+        """Hora de creación del proceso con ese PID, o None si ya no existe"""
+        import psutil
+        try:
+            return psutil.Process(pid).create_time()
+        except psutil.AccessDenied:
+            return UNKNOWN_CREATE_TIME
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return None
+
+
+class ProcessTable:
+    """
+    Tabla de procesos compartida e incremental.
+    En cada tick solo se consultan los PID nuevos (diferencia de conjuntos con el
+    refresco anterior) y se mantienen índices por nombre de ejecutable, ruta completa
+    y PID padre (para seguir el árbol de procesos de un lanzador).
+    Un PID conocido puede haberse reutilizado por otro proceso entre refrescos: las
+    entradas se identifican por (pid, create_time) y se vuelven a leer si la hora de
+    creación ha cambiado, tanto en los PID que devuelve cada búsqueda como en toda la
+    tabla cuando el último refresco tiene más de revalidate_after segundos.
+    """
+
+    def __init__(self, source=None, tick=0.05, revalidate_after=2.0):
+        self.source = source if source is not None else PsutilProcessSource()
+        self.tick = tick
+        self.revalidate_after = revalidate_after
+        self._lock = threading.Lock()
+        self._refreshed_at = None
+        self._processes = {}
+        self._by_name = {}
+        self._by_exe = {}
+        self._children = {}
+
+    def refresh(self, force=False):
+        """Actualizar la tabla si el último refresco tiene más de un tick"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._refreshed_at is not None and now - self._refreshed_at < self.tick:
+                return False
+
+            current = set(self.source.pids())
+            known = set(self._processes)
+            for pid in known - current:
+                self._unindex(self._processes.pop(pid))
+            if (self._refreshed_at is not None
+                    and now - self._refreshed_at >= self.revalidate_after):
+                # Tras un rato sin refrescar, los PID que siguen vivos pueden ser otros procesos
+                self._validate(known & current)
+            for pid in current - known:
+                self._read(pid)
+
+            self._refreshed_at = now
+            return True
+
+    def _read(self, pid):
+        info = self.source.info(pid)
+        if info is not None:
+            self._processes[pid] = info
+            self._index(info)
+        return info
+
+    def _validate(self, pids):
+        """
+        Comprobar la hora de creación de los PID indicados (con el lock tomado): los que ya
+        no existen se quitan y los reutilizados por otro proceso se vuelven a leer.
+        Devuelve los PID que siguen siendo válidos.
+        """
+        valid = set()
+        for pid in pids:
+            info = self._processes.get(pid)
+            if info is None:
+                continue
+            create_time = self.source.create_time(pid)
+            if create_time is not None and create_time == info.create_time:
+                valid.add(pid)
+                continue
+            self._unindex(self._processes.pop(pid))
+            if create_time is not None and self._read(pid) is not None:
+                valid.add(pid)
+        return valid
+
+    def _keys(self, info):
+        names = set()
+        if info.name:
+            names.add(info.name.lower())
+        if info.exe:
+            names.add(os.path.basename(info.exe).lower())
+        exe = _norm_path(info.exe) if info.exe else None
+        return names, exe
+
+    def _index(self, info):
+        names, exe = self._keys(info)
+        for name in names:
+            self._by_name.setdefault(name, set()).add(info.pid)
+        if exe:
+            self._by_exe.setdefault(exe, set()).add(info.pid)
+        if info.ppid is not None:
+            self._children.setdefault(info.ppid, set()).add(info.pid)
+
+    def _unindex(self, info):
+        names, exe = self._keys(info)
+        for name in names:
+            pids = self._by_name.get(name)
+            if pids:
+                pids.discard(info.pid)
+                if not pids:
+                    del self._by_name[name]
+        if exe:
+            pids = self._by_exe.get(exe)
+            if pids:
+                pids.discard(info.pid)
+                if not pids:
+                    del self._by_exe[exe]
+        if info.ppid is not None:
+            children = self._children.get(info.ppid)
+            if children:
+                children.discard(info.pid)
+                if not children:
+                    del self._children[info.ppid]
+
+    def refresh_pids(self, pids):
+        """
+        Leer ya los PID indicados que la tabla aún no conoce, sin esperar al siguiente tick
+        (por ejemplo, los dueños de ventanas que acaban de aparecer).
+        """
+        with self._lock:
+            for pid in set(pids) - set(self._processes):
+                if pid is not None:
+                    self._read(pid)
+
+    def get(self, pid):
+        with self._lock:
+            return self._processes.get(pid)
+
+    def pids_by_name(self, name):
+        """PIDs cuyo ejecutable se llama exactamente así (sin distinguir mayúsculas)"""
+        name = os.path.basename(name).lower()
+        with self._lock:
+            self._validate(set(self._by_name.get(name, ())))
+            return set(self._by_name.get(name, ()))
+
+    def pids_by_exe(self, exe_path):
+        """PIDs lanzados desde exactamente esa ruta de ejecutable"""
+        exe = _norm_path(exe_path)
+        with self._lock:
+            self._validate(set(self._by_exe.get(exe, ())))
+            return set(self._by_exe.get(exe, ()))
+
+    def pids_by_substring(self, text):
+        """Semántica antigua de find_existing_pid: el texto aparece dentro del nombre"""
+        text = text.lower()
+        with self._lock:
+            return self._validate({pid for pid, info in self._processes.items()
+                                   if info.name and text in info.name.lower()})
+
+    def descendants(self, pid):
+        """
+        PID indicado más todos sus descendientes conocidos.
+        Sigue funcionando aunque el lanzador ya haya terminado: los hijos conservan su ppid.
+        Un hijo creado antes que su supuesto padre es de un proceso anterior con el mismo PID
+        y no se cuenta.
+        """
+        with self._lock:
+            tree = {pid}
+            pending = [pid]
+            while pending:
+                current = pending.pop()
+                parent = self._processes.get(current)
+                parent_time = parent.create_time if parent is not None else None
+                for child in self._validate(set(self._children.get(current, ())) - tree):
+                    info = self._processes[child]
+                    if info.ppid != current:
+                        continue
+                    if parent_time and info.create_time and info.create_time < parent_time:
+                        continue
+                    tree.add(child)
+                    pending.append(child)
+            return tree
+
+    def ancestors(self, pid):
+        """
+        PIDs de los procesos padre de pid, del padre directo hacia arriba (sin incluirlo).
+        La cadena se corta en un padre desconocido o creado después que su hijo (PID reutilizado).
+        """
+        with self._lock:
+            chain = set()
+            info = self._processes.get(pid)
+            while info is not None and info.ppid and info.ppid != info.pid and info.ppid not in chain:
+                parent = self._processes.get(info.ppid)
+                if parent is None:
+                    break
+                if parent.create_time and info.create_time and parent.create_time > info.create_time:
+                    break
+                chain.add(parent.pid)
+                info = parent
+            chain.discard(pid)
+            return chain
+
+    def find_pid(self, process_name, substring=False):
+        """
+        Devolver un PID para process_name o None.
+        Si process_name es una ruta se busca por ruta completa y después por nombre.
+        """
+        if substring:
+            pids = self.pids_by_substring(process_name)
+        else:
+            pids = set()
+            if os.path.dirname(process_name):
+                pids = self.pids_by_exe(process_name)
+            if not pids:
+                pids = self.pids_by_name(process_name)
+        # El PID más bajo coincide con el orden de psutil.process_iter
+        return min(pids) if pids else None
+
+
+_shared_table = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_process_table():
+    """Tabla de procesos compartida por todos los llamadores de window_manager"""
+    global _shared_table
+    with _shared_lock:
+        if _shared_table is None:
+            _shared_table = ProcessTable()
+        return _shared_table
+
+
+def set_shared_process_table(table):
+    """Sustituir la tabla compartida (por ejemplo, con una fuente falsa)"""
+    global _shared_table
+    with _shared_lock:
+        _shared_table = table
@@ -1,30 +1,39 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QListWidget, QLabel, QLineEdit, QCheckBox, QSpinBox,
                              QComboBox, QGroupBox, QMessageBox, QSplitter,
-                             QListWidgetItem, QWidget, QFormLayout, QScrollArea)
+                             QListWidgetItem, QWidget, QFormLayout, QScrollArea,
+                             QListView)
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
+import copy
 import time
-import keyboard
 import os
+import threading
 from PyQt5.QtWidgets import QDialog
+from .layout_capture import capture_current_layout
+from .monitor_topology import get_shared_topology
+from .program_models import ProgramListModel, ProgramSearchProxy
 class ProfileEditor(QDialog):
     profile_saved = pyqtSignal()
+    # Captura de la disposición terminada en su hilo: (programas capturados, error)
+    capture_finished = pyqtSignal(object, str)
     
-    def __init__(self, profile_name, available_programs, profile_manager):
+    def __init__(self, profile_name, available_programs, profile_manager, search_index=None):
         super().__init__()
         self.profile_name = profile_name
         self.available_programs = available_programs
+        # Índice de búsqueda ya construido por la ventana principal (si coincide, se reutiliza)
+        self.search_index = search_index
         self.profile_manager = profile_manager
         self.selected_programs = []
         self.profile_hotkey = ""  # Definir antes de llamar a init_ui
+        self.capture_finished.connect(self.on_capture_finished)
         
         self.init_ui()
         self.load_existing_profile()
         
         # Si ya existe el perfil, cargamos la hotkey del JSON
-        profiles = self.profile_manager.load_profiles()
-        profile = profiles.get(self.profile_name, {})
+        profile = self.profile_manager.get_profile(self.profile_name) or {}
         self.profile_hotkey = profile.get('hotkey', "")
         self.hotkey_display.setText(self.profile_hotkey)
     def init_ui(self):
@@ -97,6 +106,7 @@ class ProfileEditor(QDialog):
         
         layout.addLayout(buttons_layout)
     def record_hotkey(self):
+        import keyboard
         msg = QMessageBox()
         msg.setWindowTitle("Grabando Hotkey")
         msg.setText("Pulsa la combinación de teclas...\n(esc para cancelar)")
@@ -136,9 +146,18 @@ class ProfileEditor(QDialog):
         search_layout.addWidget(self.search_edit)
         layout.addLayout(search_layout)
         
-        # Lista de programas
-        self.available_list = QListWidget()
-        self.available_list.itemDoubleClicked.connect(self.add_program)
+        # Lista de programas (filtrada por el índice de búsqueda)
+        self.available_model = ProgramListModel(icons=True, parent=self)
+        # Cargar programas antes de conectar el proxy, para que reutilice el índice compartido
+        self.populate_available_programs()
+        self.available_proxy = ProgramSearchProxy(self)
+        if self.search_index is not None:
+            self.available_proxy.set_index(self.search_index)
+        self.available_proxy.setSourceModel(self.available_model)
+        self.available_list = QListView()
+        self.available_list.setUniformItemSizes(True)
+        self.available_list.setModel(self.available_proxy)
+        self.available_list.doubleClicked.connect(self.add_program)
         layout.addWidget(self.available_list)
         
         # Botón agregar
@@ -146,9 +165,6 @@ class ProfileEditor(QDialog):
         add_btn.clicked.connect(self.add_program)
         layout.addWidget(add_btn)
         
-        # Cargar programas
-        self.populate_available_programs()
-        
         return group
         
     def create_selected_programs_panel(self):
@@ -176,6 +192,11 @@ class ProfileEditor(QDialog):
         down_btn.clicked.connect(self.move_program_down)
         buttons_layout.addWidget(down_btn)
         
+        self.capture_btn = QPushButton("Capturar disposición")
+        self.capture_btn.setToolTip("Añadir las ventanas abiertas con su posición actual")
+        self.capture_btn.clicked.connect(self.capture_layout)
+        buttons_layout.addWidget(self.capture_btn)
+        
         layout.addLayout(buttons_layout)
         
         # Panel de configuración del programa
@@ -194,8 +215,16 @@ class ProfileEditor(QDialog):
         layout = QFormLayout(scroll_widget)
         
         # Monitor
+        # Cada opción guarda el valor de 'monitor' del perfil: 'primary', 'secondary' o un índice
         self.monitor_combo = QComboBox()
-        self.monitor_combo.addItems(["0", "1"])
+        self.monitor_combo.addItem("Principal", 'primary')
+        self.monitor_combo.addItem("Secundario", 'secondary')
+        try:
+            monitor_count = len(get_shared_topology().monitors())
+        except Exception:
+            monitor_count = 0
+        for index in range(monitor_count):
+            self.monitor_combo.addItem(f"Monitor {index}", index)
         layout.addRow("Monitor:", self.monitor_combo)
         
         # Estado de la ventana
@@ -254,38 +283,18 @@ class ProfileEditor(QDialog):
         return group
         
     def populate_available_programs(self):
-        """Poblar lista de programas disponibles con iconos"""
-        self.available_list.clear()
-        for program in self.available_programs:
-            item = QListWidgetItem(f"{program['name']}")
-            item.setData(Qt.UserRole, program)
-            # Intentar obtener el icono del ejecutable
-            icon = None
-            exe_path = program.get('path', '')
-            if os.path.exists(exe_path) and exe_path.lower().endswith('.exe'):
-                try:
-                    icon = QIcon(exe_path)
-                except Exception:
-                    icon = None
-            if icon and not icon.isNull():
-                item.setIcon(icon)
-            self.available_list.addItem(item)
+        """Poblar lista de programas disponibles (los iconos se cargan al mostrarse cada fila)"""
+        self.available_model.set_programs(self.available_programs)
             
     def filter_programs(self):
-        """Filtrar programas por texto de búsqueda"""
-        search_text = self.search_edit.text().lower()
-        
-        for i in range(self.available_list.count()):
-            item = self.available_list.item(i)
-            program = item.data(Qt.UserRole)
-            visible = search_text in program['name'].lower()
-            item.setHidden(not visible)
+        """Filtrar programas por texto de búsqueda (con espera entre pulsaciones)"""
+        self.available_proxy.set_query(self.search_edit.text())
             
     def add_program(self):
         """Agregar programa al perfil"""
-        current_item = self.available_list.currentItem()
-        if current_item:
-            program = current_item.data(Qt.UserRole)
+        current_index = self.available_list.currentIndex()
+        if current_index.isValid():
+            program = current_index.data(Qt.UserRole)
             
             # Verificar si ya está agregado
             for existing in self.selected_programs:
@@ -309,10 +318,52 @@ class ProfileEditor(QDialog):
                 'start_minimized': False,
                 'avoid_duplicates': True
             }
+            if program.get('source') == 'modern':
+                # La ruta es un AppUserModelID: se lanza por shell:AppsFolder y el proceso
+                # se busca por el ejecutable del manifiesto (si se conoce)
+                program_config['source'] = 'modern'
+                if program.get('process_name'):
+                    program_config['process_name'] = program['process_name']
             
             self.selected_programs.append(program_config)
             self.update_selected_list()
             
+    def capture_layout(self):
+        """Capturar las ventanas abiertas en un hilo aparte (el resultado llega con capture_finished)"""
+        self.capture_btn.setEnabled(False)
+
+        def work():
+            try:
+                self.capture_finished.emit(capture_current_layout(), '')
+            except Exception as e:
+                self.capture_finished.emit(None, str(e))
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def on_capture_finished(self, captured, error):
+        """Actualizar la posición de los programas ya añadidos y agregar el resto"""
+        self.capture_btn.setEnabled(True)
+        if error:
+            QMessageBox.critical(self, "Error", f"No se pudo capturar la disposición: {error}")
+            return
+        by_path = {os.path.normcase(p['path']): p for p in self.selected_programs}
+        added = updated = 0
+        for program in captured:
+            existing = by_path.get(os.path.normcase(program['path']))
+            if existing is not None:
+                existing['window_config'] = program['window_config']
+                existing['start_minimized'] = program['start_minimized']
+                if 'window_class' in program:
+                    existing['window_class'] = program['window_class']
+                updated += 1
+            else:
+                self.selected_programs.append(program)
+                added += 1
+        self.update_selected_list()
+        self.config_panel.setEnabled(False)
+        QMessageBox.information(self, "Disposición capturada",
+                                f"Programas añadidos: {added}\nProgramas actualizados: {updated}")
+            
     def remove_program(self):
         """Quitar programa del perfil"""
         current_row = self.selected_list.currentRow()
@@ -353,12 +404,14 @@ class ProfileEditor(QDialog):
             self.config_panel.setEnabled(True)
             # Cargar configuración en los controles
             config = program.get('window_config', {})
-            # Corregido: detectar correctamente el monitor
+            # El monitor se guarda tal cual: 'primary', 'secondary' o el índice
             monitor = config.get('monitor', 'primary')
-            if monitor == 'secondary':
-                self.monitor_combo.setCurrentText('Secundario')
-            else:
-                self.monitor_combo.setCurrentText('Principal')
+            index = self.monitor_combo.findData(monitor)
+            if index < 0:
+                # Índice de un monitor que ahora no está conectado: se conserva
+                self.monitor_combo.addItem(f"Monitor {monitor}", monitor)
+                index = self.monitor_combo.count() - 1
+            self.monitor_combo.setCurrentIndex(index)
             if config.get('maximized', False):
                 self.window_state_combo.setCurrentText('Maximizada')
             elif program.get('start_minimized', False):
@@ -384,7 +437,9 @@ class ProfileEditor(QDialog):
             program = self.selected_programs[current_row]
             
             # Actualizar configuración
-            monitor = 'secondary' if self.monitor_combo.currentText() == 'Secundario' else 'primary'
+            monitor = self.monitor_combo.currentData()
+            if monitor is None:
+                monitor = 'primary'
             state = self.window_state_combo.currentText()
             
             program['window_config'] = {
@@ -401,10 +456,10 @@ class ProfileEditor(QDialog):
             
     def load_existing_profile(self):
         """Cargar perfil existente si existe"""
-        profiles = self.profile_manager.load_profiles()
-        if self.profile_name in profiles:
-            profile = profiles[self.profile_name]
-            self.selected_programs = profile.get('programs', [])
+        profile = self.profile_manager.get_profile(self.profile_name)
+        if profile is not None:
+            # Copia: el perfil en caché es compartido y no debe modificarse
+            self.selected_programs = copy.deepcopy(profile.get('programs', []))
             self.update_selected_list()
             # Cargar estado del checkbox si existe
             self.close_others_checkbox.setChecked(profile.get('close_others', False))
@@ -427,7 +482,7 @@ class ProfileEditor(QDialog):
             
         profile_data = {
             'programs': self.selected_programs,
-            'created_at': self.profile_manager.load_profiles().get(self.profile_name, {}).get('created_at', ''),
+            'created_at': (self.profile_manager.get_profile(self.profile_name) or {}).get('created_at', ''),
             'modified_at': str(int(time.time())),
             'close_others': self.close_others_checkbox.isChecked(),
             'hotkey': self.profile_hotkey
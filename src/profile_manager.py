@@ -1,145 +1,284 @@
 import json
 import os
 import threading
-import time
-from pathlib import Path
-from src.window_manager import launch_and_place_window
+from src.window_manager import (launch_program, STRATEGY_EXISTING,
+                                STRATEGY_PID_TREE, STRATEGY_PROCESS_NAME, STRATEGY_TITLE)
+from src.window_placement import Placement, PlacementBatch
+from src.monitor_topology import get_shared_topology
+from src.profile_store import ProfileStore
+from src.launch_executor import LaunchExecutor, PHASE_STARTED, PHASE_HWND_FOUND, PHASE_PLACED
+from src.telemetry import TelemetryWriter, TELEMETRY_FILENAME
+from src.execution_plan import PlanCache, compile_program
+from src.profile_switch import ProfileSwitcher
+from src.window_snapshot import get_shared_snapshot
+from src.process_table import get_shared_process_table
 
 class ProfileManager:
-    def __init__(self):
+    def __init__(self, storage=None, max_launch_workers=6):
+        """
+        storage: 'json' (profiles.json, por defecto) o 'sqlite' (profiles.db).
+        Si no se indica, se usa la variable de entorno PROFILE_STORAGE.
+        max_launch_workers limita los programas que se lanzan a la vez entre todos los perfiles.
+        """
         self.data_dir = os.path.join(os.path.expanduser("~"), "AppData", "Local", "ProgramProfileManager")
         self.profiles_file = os.path.join(self.data_dir, "profiles.json")
+        self.profiles_db = os.path.join(self.data_dir, "profiles.db")
+        self.launch_hints_file = os.path.join(self.data_dir, "launch_hints.json")
+        self.telemetry_file = os.path.join(self.data_dir, TELEMETRY_FILENAME)
         os.makedirs(self.data_dir, exist_ok=True)
+        self.storage = storage or os.environ.get('PROFILE_STORAGE', 'json')
+        if self.storage == 'sqlite':
+            # La primera vez se migra profiles.json a la base de datos
+            from src.profile_sqlite import SqliteProfileStore
+            self.store = SqliteProfileStore(self.profiles_db, json_path=self.profiles_file)
+        else:
+            if self.storage != 'json':
+                print(f"[WARN] Almacenamiento de perfiles desconocido: {self.storage}, usando json")
+                self.storage = 'json'
+            self.store = ProfileStore(self.profiles_file)
+        self.telemetry = TelemetryWriter(self.telemetry_file)
+        self.executor = LaunchExecutor(self._launch_and_plan_program, max_workers=max_launch_workers)
+        self.plans = PlanCache(get_shared_topology())
+        self.switcher = ProfileSwitcher(get_shared_snapshot(), get_shared_process_table())
+        self._launch_hints = None
+        self._hints_lock = threading.Lock()
         
     def load_profiles(self):
-        if os.path.exists(self.profiles_file):
-            try:
-                with open(self.profiles_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                print(f"[ERROR] No se pudo leer el archivo de perfiles: {self.profiles_file}")
-                return {}
-        return {}
+        """Copia modificable de todos los perfiles (ver get_profile para lecturas rápidas)"""
+        return self.store.load()
+
+    def get_profile(self, profile_name):
+        """Perfil de solo lectura desde la caché en memoria, o None"""
+        return self.store.get(profile_name)
+
+    def profile_names(self):
+        return self.store.names()
         
     def save_profiles(self, profiles):
-        try:
-            with open(self.profiles_file, 'w', encoding='utf-8') as f:
-                json.dump(profiles, f, indent=2, ensure_ascii=False)
-            return True
-        except IOError as e:
-            print(f"[ERROR] No se pudo guardar el archivo de perfiles: {e}")
+        if self.store.replace_all(profiles) is False:
             return False
+        return self.store.flush()
             
     def save_profile(self, profile_name, profile_data):
-        profiles = self.load_profiles()
-        profiles[profile_name] = profile_data
-        saved = self.save_profiles(profiles)
-        return saved
+        """Guardar un perfil y escribirlo ya en disco. Devuelve False si no se ha podido."""
+        if not self.store.put(profile_name, profile_data):
+            return False
+        return self.store.flush()
         
     def delete_profile(self, profile_name):
-        profiles = self.load_profiles()
-        if profile_name in profiles:
-            del profiles[profile_name]
-            return self.save_profiles(profiles)
-        return False
+        """Eliminar un perfil y escribirlo ya en disco. Devuelve False si no existía o si falla."""
+        if not self.store.delete(profile_name):
+            return False
+        return self.store.flush()
         
     def profile_exists(self, profile_name):
-        profiles = self.load_profiles()
-        return profile_name in profiles
+        return profile_name in self.store
 
-    def execute_profile(self, profile_name):
-        """Ejecuta un perfil de programas en un hilo separado usando window_manager."""
-        def run_program_threaded(program_config):
-            try:
-                self._launch_and_place_program(program_config)
-            except Exception as e:
-                print(f"Error al lanzar {program_config.get('name', 'programa')}: {e}")
-
-        def run_profile_logic():
-            profiles = self.load_profiles()
-            if profile_name not in profiles:
-                print(f"Perfil '{profile_name}' no encontrado")
+    def get_plan(self, profile_name):
+        """
+        Plan de ejecución compilado del perfil (desde la caché), o None si no existe.
+        Se recompila solo si el perfil ha cambiado o ha cambiado la disposición de monitores.
+        """
+        # La instantánea del almacén conserva el mismo objeto de perfil mientras no cambie
+        profile = self.store.snapshot().get(profile_name)
+        if profile is None:
+            self.plans.invalidate(profile_name)
+            return None
+        return self.plans.get(profile_name, profile)
+
+    def prepare_plans(self):
+        """Compilar por adelantado los planes de todos los perfiles (p. ej. al arrancar)"""
+        for profile_name in self.profile_names():
+            self.get_plan(profile_name)
+
+    def flush(self):
+        """Escribir en disco los cambios de perfiles pendientes y la telemetría encolada"""
+        self.telemetry.close()
+        return self.store.flush()
+
+    def load_launch_hints(self):
+        """Estrategia de búsqueda de ventana que acertó la última vez, por ejecutable"""
+        with self._hints_lock:
+            if self._launch_hints is None:
+                self._launch_hints = {}
+                if os.path.exists(self.launch_hints_file):
+                    try:
+                        with open(self.launch_hints_file, 'r', encoding='utf-8') as f:
+                            self._launch_hints = json.load(f)
+                    except (json.JSONDecodeError, IOError):
+                        print(f"[WARN] No se pudo leer el archivo de estrategias: {self.launch_hints_file}")
+            return dict(self._launch_hints)
+
+    def record_launch_strategy(self, exe_path, strategy):
+        """Guardar qué estrategia encontró la ventana de exe_path"""
+        if not strategy or strategy == STRATEGY_EXISTING:
+            return
+        self.load_launch_hints()
+        key = os.path.normcase(exe_path)
+        with self._hints_lock:
+            if self._launch_hints.get(key) == strategy:
                 return
+            self._launch_hints[key] = strategy
+            try:
+                with open(self.launch_hints_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._launch_hints, f, indent=2, ensure_ascii=False)
+            except IOError as e:
+                print(f"[ERROR] No se pudo guardar el archivo de estrategias: {e}")
 
-            profile = profiles[profile_name]
-            threads = []
-            for program_config in profile.get('programs', []):
-                t = threading.Thread(target=run_program_threaded, args=(program_config,), daemon=True)
-                t.start()
-                threads.append(t)
-            print(f"Programas lanzados para el perfil '{profile_name}': {len(threads)}")
-
-        threading.Thread(target=run_profile_logic, daemon=True).start()
-
-    def _launch_and_place_program(self, program_config):
-        """Lanza y coloca el programa usando window_manager."""
-        exe_path = program_config['path']
-        window_cfg = program_config.get('window_config', {})
-        fallback_title = program_config.get('window_title')
-        maximize = window_cfg.get('maximized', False)
-        minimize = window_cfg.get('minimized', False)
-        width = window_cfg.get('width')
-        height = window_cfg.get('height')
-        x = window_cfg.get('x', 0)
-        y = window_cfg.get('y', 0)
-        monitor = window_cfg.get('monitor', 'primary')
-
-        # ---
-        # SOPORTE PARA monitor COMO ÍNDICE O COMO STRING ('primary'/'secondary')
-        # Se recomienda guardar el monitor como número (0=primario, 1=secundario, ...)
-        # Ejemplo de perfil recomendado:
-        #   "window_config": { "monitor": 1, ... }
-        # Si se usa 'primary' o 'secondary', se traduce a índice automáticamente.
-        from screeninfo import get_monitors
-        monitors = get_monitors()
-        monitor_index = 0
-        if isinstance(monitor, int):
-            if 0 <= monitor < len(monitors):
-                monitor_index = monitor
-            else:
-                print(f"[WARN] Monitor {monitor} fuera de rango, usando 0")
-                monitor_index = 0
-        elif isinstance(monitor, str):
-            if monitor == 'secondary' and len(monitors) > 1:
-                for idx, m in enumerate(monitors):
-                    if not getattr(m, 'is_primary', False):
-                        monitor_index = idx
-                        break
-                else:
-                    monitor_index = 1
-            elif monitor == 'primary':
-                for idx, m in enumerate(monitors):
-                    if getattr(m, 'is_primary', False):
-                        monitor_index = idx
-                        break
-                else:
-                    monitor_index = 0
+    def skip_strategies_for(self, exe_path):
+        """Si la ventana se encontró por PID la última vez, no buscar por título (lento y ambiguo)"""
+        strategy = self.load_launch_hints().get(os.path.normcase(exe_path))
+        if strategy in (STRATEGY_PID_TREE, STRATEGY_PROCESS_NAME):
+            return {STRATEGY_TITLE}
+        return set()
+
+    def execute_profile(self, profile_name, priority=None):
+        """
+        Ejecuta un perfil de programas en el ejecutor de lanzamientos (pool acotado de hilos).
+        Los programas se lanzan en el orden del editor y, cuando todos han resuelto su ventana,
+        se colocan juntas en una única transacción (PlacementBatch).
+        priority (o la clave 'priority' del perfil) adelanta este perfil frente a otros en cola.
+        Los programas se envían ya compilados (ver get_plan): monitor, geometría y reglas de
+        búsqueda están resueltos y el lanzamiento va directo a crear el proceso.
+        Devuelve el ProfileRun para esperar, consultar o cancelar la ejecución, o None si el
+        perfil no existe.
+        """
+        plan = self.get_plan(profile_name)
+        if plan is None:
+            print(f"Perfil '{profile_name}' no encontrado")
+            return None
+
+        if priority is None:
+            priority = plan.priority
+        run = self.executor.submit(
+            profile_name,
+            plan.programs,
+            priority=priority,
+            on_complete=self._place_run_windows
+        )
+        print(f"Programas en cola para el perfil '{profile_name}': {len(run)}")
+        return run
+
+    def switch_profile(self, profile_name, priority=None, close_others=False):
+        """
+        Cambiar al perfil de forma diferencial: con una sola instantánea del escritorio se
+        reutilizan las ventanas ya abiertas, solo se recolocan las que están fuera de su sitio
+        y solo se lanzan los programas que faltan (en el ejecutor, como execute_profile).
+        Si el perfil tiene close_others, las ventanas ajenas quedan en result.diff.close y solo
+        se cierran aquí con close_others=True; si no, se pueden cerrar después, tras
+        confirmarlo, con close_windows().
+        Devuelve un SwitchResult (result.run es None si no faltaba nada) o None si el perfil
+        no existe.
+        """
+        plan = self.get_plan(profile_name)
+        if plan is None:
+            print(f"Perfil '{profile_name}' no encontrado")
+            return None
+        if priority is None:
+            priority = plan.priority
+
+        def launch(programs):
+            return self.executor.submit(profile_name, programs, priority=priority,
+                                        on_complete=self._place_run_windows)
+
+        result = self.switcher.switch(plan, launch=launch, close_others=close_others)
+        diff = result.diff
+        print(f"Cambio a '{profile_name}': {len(diff.keep)} en su sitio, {len(diff.move)} recolocados, "
+              f"{len(diff.launch)} por lanzar, {len(result.closed)} cerrados "
+              f"de {len(diff.close)} ajenos ({result.elapsed * 1000:.0f} ms)")
+        return result
+
+    def close_windows(self, windows):
+        """Cerrar las ventanas ajenas propuestas por un cambio de perfil (result.diff.close)"""
+        return self.switcher.close_windows(windows)
+
+    def cancel_profile(self, profile_name=None):
+        """Cancelar las ejecuciones en curso de un perfil (o de todos)"""
+        return self.executor.cancel(profile_name)
+
+    def _place_run_windows(self, run):
+        """Colocar de una vez las ventanas resueltas por una ejecución de perfil"""
+        try:
+            self._apply_run_placements(run)
+        finally:
+            self.telemetry.record_run(run)
+
+    def _apply_run_placements(self, run):
+        if run.cancelled:
+            print(f"Ejecución del perfil '{run.profile_name}' cancelada")
+            return
+        batch = PlacementBatch()
+        placed_tasks = [task for task in run.tasks if task.result]
+        # Los monitores pueden haber cambiado desde que se compiló el plan
+        topology = self.plans.topology
+        topology.monitors()
+        for task in placed_tasks:
+            batch.add(self._current_placement(task, topology))
+        results = batch.apply()
+        placed = 0
+        for task, result in zip(placed_tasks, results):
+            if result.ok:
+                task.mark(PHASE_PLACED)
+                placed += 1
             else:
-                print(f"[WARN] Valor de monitor desconocido: {monitor}, usando 0")
-                monitor_index = 0
-        else:
-            print(f"[WARN] Tipo de monitor no soportado: {type(monitor)}, usando 0")
-            monitor_index = 0
-
-        print(f"Configurando programa: {program_config['name']} en monitor {monitor_index} (valor original: {monitor})")
-        hwnd = launch_and_place_window(
-            exe_path=exe_path,
-            monitor_index=monitor_index,
-            width=width,
-            height=height,
-            x_offset=x,
-            y_offset=y,
-            maximize=maximize,
-            minimize=minimize,
-            fallback_title=fallback_title,
-            timeout=10
+                print(f"No se pudo colocar la ventana {result.hwnd}: {result.error}")
+        print(f"Ventanas colocadas para el perfil '{run.profile_name}': {placed}/{len(run)} "
+              f"en {run.wall_time:.2f} s")
+
+    def _current_placement(self, task, topology):
+        """Placement de la tarea, recalculado si su monitor ya no tiene el rectángulo del plan"""
+        placement = task.result
+        program = task.program
+        if getattr(program, 'monitor_rect', None) is None:
+            return placement
+        if topology.rect(program.monitor_index) == program.monitor_rect:
+            return placement
+        program = compile_program(program.config, topology)
+        if program.monitor_rect is None:
+            return placement
+        print(f"Monitores cambiados: recolocando {program.name} en el monitor {program.monitor_index}")
+        return Placement(placement.hwnd, program.x, program.y, program.width, program.height,
+                         program.maximize, program.minimize)
+
+    def _launch_and_plan_program(self, program, cancel_event=None, on_phase=None):
+        """
+        Lanza el programa, espera a su ventana y devuelve su Placement (sin moverla todavía).
+        program es un ProgramPlan o, para llamadas sueltas, la configuración del programa.
+        """
+        if isinstance(program, dict):
+            program = compile_program(program, get_shared_topology())
+        if not program.exe_exists:
+            print(f"No se puede lanzar {program.name}: no existe {program.exe_path}")
+            if on_phase:
+                on_phase(PHASE_STARTED, failure='missing_exe')
+            return None
+
+        print(f"Configurando programa: {program.name} en monitor {program.monitor_index}")
+        result = launch_program(
+            program.exe_path,
+            real_process_name=program.process_name,
+            fallback_title=program.compiled_keyword,
+            substring_match=program.substring_match,
+            timeout=10,
+            skip_strategies=self.skip_strategies_for(program.exe_path),
+            cancel_event=cancel_event,
+            on_phase=on_phase,
+            packaged=program.packaged
         )
-        if hwnd:
-            print(f"Ventana configurada correctamente: {hwnd}")
-            return True
-        else:
-            print("No se pudo configurar la ventana.")
-            return False
+        hwnd = result.hwnd
+        self.record_launch_strategy(program.exe_path, result.strategy)
+        if on_phase and result.strategy:
+            on_phase(PHASE_HWND_FOUND, strategy=result.strategy)
+        if not hwnd:
+            print(f"No se pudo lanzar o encontrar la ventana de {program.name}.")
+            return None
+        if program.monitor_rect is None:
+            print(f"Monitor {program.monitor_index} no encontrado.")
+            if on_phase:
+                on_phase(PHASE_HWND_FOUND, failure='no_monitor')
+            return None
+        return Placement(hwnd, program.x, program.y, program.width, program.height,
+                         program.maximize, program.minimize)
 
     # ---
     # NOTA: Para máxima compatibilidad, guarda los perfiles con el monitor como número (0=primario, 1=secundario, ...)
@@ -0,0 +1,264 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+from types import MappingProxyType
+
+# Claves de perfil con columna propia; el resto se conserva en la columna extra (JSON)
+_PROFILE_COLUMNS = ('created_at', 'modified_at', 'close_others', 'hotkey', 'programs')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created_at TEXT,
+    modified_at TEXT,
+    close_others INTEGER NOT NULL DEFAULT 0,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS programs (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    path TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (profile_id, position)
+);
+CREATE TABLE IF NOT EXISTS hotkeys (
+    hotkey TEXT NOT NULL,
+    profile_id INTEGER NOT NULL UNIQUE REFERENCES profiles(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_hotkeys_hotkey ON hotkeys(hotkey);
+CREATE INDEX IF NOT EXISTS idx_programs_path ON programs(path);
+"""
+
+
+class SqliteProfileStore:
+    """
+    Almacén de perfiles en una base de datos SQLite local.
+    Misma interfaz que ProfileStore: cada perfil se guarda con un upsert transaccional
+    (sin reescribir el resto) y las consultas por nombre y hotkey usan índices.
+    La instantánea en memoria se invalida si otra conexión modifica la base de datos
+    (PRAGMA data_version).
+    """
+
+    def __init__(self, path, json_path=None):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._snapshot = None
+        self._data_version = None
+        if json_path:
+            self.migrate_from_json(json_path)
+
+    # --- Migración -------------------------------------------------------
+
+    def migrate_from_json(self, json_path):
+        """
+        Importar profiles.json una sola vez (la primera vez que se abre la base de datos).
+        El archivo JSON se deja intacto como copia de seguridad.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+            if row is not None:
+                return False
+            profiles = {}
+            if os.path.exists(json_path):
+                try:
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        profiles = json.load(f)
+                except (json.JSONDecodeError, IOError):
+                    print(f"[ERROR] No se pudo leer el archivo de perfiles: {json_path}")
+                    return False
+
+            def operation():
+                for name, profile in profiles.items():
+                    self._upsert(name, profile)
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)", (json_path,)
+                )
+                return True
+
+            if not self._write(operation, f"No se pudo migrar {json_path} a SQLite"):
+                return False
+            if profiles:
+                print(f"Migrados {len(profiles)} perfiles de {json_path} a {self.path}")
+            return True
+
+    # --- Lectura ---------------------------------------------------------
+
+    def _current_version(self):
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _row_to_profile(self, row, programs):
+        profile_id, name, created_at, modified_at, close_others, extra = row
+        profile = json.loads(extra) if extra else {}
+        profile['programs'] = programs
+        profile['created_at'] = created_at or ''
+        profile['modified_at'] = modified_at or ''
+        profile['close_others'] = bool(close_others)
+        hotkey = self._conn.execute(
+            "SELECT hotkey FROM hotkeys WHERE profile_id = ?", (profile_id,)
+        ).fetchone()
+        profile['hotkey'] = hotkey[0] if hotkey else ''
+        return profile
+
+    def _load_all(self):
+        programs = {}
+        for profile_id, data in self._conn.execute(
+                "SELECT profile_id, data FROM programs ORDER BY profile_id, position"):
+            programs.setdefault(profile_id, []).append(json.loads(data))
+        hotkeys = dict(self._conn.execute("SELECT profile_id, hotkey FROM hotkeys"))
+        profiles = {}
+        for profile_id, name, created_at, modified_at, close_others, extra in self._conn.execute(
+                "SELECT id, name, created_at, modified_at, close_others, extra FROM profiles"):
+            profile = json.loads(extra) if extra else {}
+            profile['programs'] = programs.get(profile_id, [])
+            profile['created_at'] = created_at or ''
+            profile['modified_at'] = modified_at or ''
+            profile['close_others'] = bool(close_others)
+            profile['hotkey'] = hotkeys.get(profile_id, '')
+            profiles[name] = profile
+        return profiles
+
+    def snapshot(self):
+        """Instantánea de solo lectura {nombre: perfil} (no modificar los perfiles)"""
+        with self._lock:
+            version = self._current_version()
+            if self._snapshot is None or version != self._data_version:
+                self._snapshot = MappingProxyType(self._load_all())
+                self._data_version = version
+            return self._snapshot
+
+    def load(self):
+        return copy.deepcopy(dict(self.snapshot()))
+
+    def get(self, profile_name):
+        """Perfil de solo lectura o None; sin instantánea cargada, consulta indexada por nombre"""
+        with self._lock:
+            if self._snapshot is not None and self._current_version() == self._data_version:
+                return self._snapshot.get(profile_name)
+            row = self._conn.execute(
+                "SELECT id, name, created_at, modified_at, close_others, extra FROM profiles WHERE name = ?",
+                (profile_name,)
+            ).fetchone()
+            if row is None:
+                return None
+            programs = [json.loads(data) for (data,) in self._conn.execute(
+                "SELECT data FROM programs WHERE profile_id = ? ORDER BY position", (row[0],)
+            )]
+            return self._row_to_profile(row, programs)
+
+    def __contains__(self, profile_name):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM profiles WHERE name = ?", (profile_name,)
+            ).fetchone() is not None
+
+    def names(self):
+        with self._lock:
+            return [name for (name,) in self._conn.execute("SELECT name FROM profiles ORDER BY id")]
+
+    def find_by_hotkey(self, hotkey):
+        """Nombre del perfil asociado a la hotkey, o None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT p.name FROM hotkeys h JOIN profiles p ON p.id = h.profile_id WHERE h.hotkey = ?",
+                (hotkey,)
+            ).fetchone()
+            return row[0] if row else None
+
+    # --- Escritura -------------------------------------------------------
+
+    def _upsert(self, profile_name, profile_data):
+        extra = {k: v for k, v in profile_data.items() if k not in _PROFILE_COLUMNS}
+        self._conn.execute(
+            """
+            INSERT INTO profiles (name, created_at, modified_at, close_others, extra)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                created_at = excluded.created_at,
+                modified_at = excluded.modified_at,
+                close_others = excluded.close_others,
+                extra = excluded.extra
+            """,
+            (profile_name, profile_data.get('created_at', ''), profile_data.get('modified_at', ''),
+             int(bool(profile_data.get('close_others', False))),
+             json.dumps(extra, ensure_ascii=False) if extra else None)
+        )
+        profile_id = self._conn.execute(
+            "SELECT id FROM profiles WHERE name = ?", (profile_name,)
+        ).fetchone()[0]
+        self._conn.execute("DELETE FROM programs WHERE profile_id = ?", (profile_id,))
+        self._conn.executemany(
+            "INSERT INTO programs (profile_id, position, name, path, data) VALUES (?, ?, ?, ?, ?)",
+            [(profile_id, position, program.get('name'), program.get('path'),
+              json.dumps(program, ensure_ascii=False))
+             for position, program in enumerate(profile_data.get('programs', []))]
+        )
+        self._conn.execute("DELETE FROM hotkeys WHERE profile_id = ?", (profile_id,))
+        if profile_data.get('hotkey'):
+            self._conn.execute(
+                "INSERT INTO hotkeys (hotkey, profile_id) VALUES (?, ?)",
+                (profile_data['hotkey'], profile_id)
+            )
+
+    def _write(self, operation, error_message="No se pudo guardar en la base de datos de perfiles"):
+        """
+        Ejecutar operation en una transacción. Cualquier error (también de datos que no se
+        pueden serializar) la deshace y devuelve False.
+        """
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                result = operation()
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                print(f"[ERROR] {error_message}: {e}")
+                return False
+            finally:
+                # Si BEGIN falló no hay transacción abierta; si falló COMMIT puede seguir abierta
+                if self._conn.in_transaction:
+                    try:
+                        self._conn.execute("ROLLBACK")
+                    except sqlite3.Error as e:
+                        print(f"[ERROR] No se pudo deshacer la transacción: {e}")
+                self._snapshot = None
+            return result
+
+    def put(self, profile_name, profile_data):
+        def operation():
+            self._upsert(profile_name, profile_data)
+            return True
+        return self._write(operation)
+
+    def delete(self, profile_name):
+        def operation():
+            cursor = self._conn.execute("DELETE FROM profiles WHERE name = ?", (profile_name,))
+            return cursor.rowcount > 0
+        return self._write(operation)
+
+    def replace_all(self, profiles):
+        def operation():
+            self._conn.execute("DELETE FROM profiles")
+            for name, profile in profiles.items():
+                self._upsert(name, profile)
+            return True
+        return self._write(operation)
+
+    def flush(self):
+        """Las escrituras ya son transaccionales; no hay nada pendiente"""
+        return True
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
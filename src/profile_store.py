@@ -0,0 +1,169 @@
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+import weakref
+from types import MappingProxyType
+
+_EMPTY = MappingProxyType({})
+
+# Almacenes con escrituras diferidas que hay que volcar al salir
+_open_stores = weakref.WeakSet()
+_atexit_lock = threading.Lock()
+_atexit_registered = False
+
+
+def _flush_open_stores():
+    for store in list(_open_stores):
+        store.flush()
+
+
+def _track(store):
+    """Registrar el almacén para volcarlo al salir (un único manejador atexit para todos)"""
+    global _atexit_registered
+    with _atexit_lock:
+        _open_stores.add(store)
+        if not _atexit_registered:
+            atexit.register(_flush_open_stores)
+            _atexit_registered = True
+
+
+class ProfileStore:
+    """
+    Almacén de perfiles en memoria respaldado por profiles.json.
+    Los lectores obtienen una instantánea inmutable sin bloqueo; como mucho cada
+    stat_interval segundos se comprueba si el mtime/tamaño del archivo han cambiado por
+    fuera y solo entonces se vuelve a leer. Las escrituras actualizan la instantánea al
+    momento y se agrupan en una única escritura diferida (archivo temporal + rename
+    atómico) tras flush_delay segundos; flush() escribe ya y devuelve si lo ha conseguido.
+    last_error guarda el error de la última escritura fallida (None si fue bien).
+    """
+
+    def __init__(self, path, flush_delay=0.5, stat_interval=1.0):
+        self.path = path
+        self.flush_delay = flush_delay
+        self.stat_interval = stat_interval
+        self.last_error = None
+        self._lock = threading.RLock()
+        self._snapshot = _EMPTY
+        self._stat = None
+        # -inf: un lector que vea _loaded antes de la primera comprobación pasa por el lock
+        self._checked_at = float('-inf')
+        self._loaded = False
+        self._dirty = False
+        self._timer = None
+        _track(self)
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _reload(self, stat):
+        profiles = {}
+        if stat is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    profiles = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                print(f"[ERROR] No se pudo leer el archivo de perfiles: {self.path}")
+                profiles = {}
+        self._snapshot = MappingProxyType(profiles)
+        self._stat = stat
+        self._loaded = True
+
+    def snapshot(self):
+        """
+        Instantánea de solo lectura {nombre: perfil}.
+        Los perfiles que contiene se comparten entre hilos: no deben modificarse.
+        """
+        if self._loaded and (self._dirty or time.monotonic() - self._checked_at < self.stat_interval):
+            return self._snapshot
+        with self._lock:
+            if not self._dirty:
+                now = time.monotonic()
+                stat = self._file_stat()
+                # Antes de _reload, que publica _loaded para los lectores sin bloqueo
+                self._checked_at = now
+                if not self._loaded or stat != self._stat:
+                    self._reload(stat)
+            return self._snapshot
+
+    def load(self):
+        """Copia modificable de todos los perfiles"""
+        return copy.deepcopy(dict(self.snapshot()))
+
+    def get(self, profile_name):
+        """Perfil de solo lectura (compartido) o None"""
+        return self.snapshot().get(profile_name)
+
+    def __contains__(self, profile_name):
+        return profile_name in self.snapshot()
+
+    def names(self):
+        return list(self.snapshot().keys())
+
+    def find_by_hotkey(self, hotkey):
+        """Nombre del perfil asociado a la hotkey, o None"""
+        for name, profile in self.snapshot().items():
+            if profile.get('hotkey') == hotkey:
+                return name
+        return None
+
+    def put(self, profile_name, profile_data):
+        with self._lock:
+            profiles = dict(self.snapshot())
+            profiles[profile_name] = copy.deepcopy(profile_data)
+            self._publish(profiles)
+            return True
+
+    def delete(self, profile_name):
+        with self._lock:
+            profiles = dict(self.snapshot())
+            if profile_name not in profiles:
+                return False
+            del profiles[profile_name]
+            self._publish(profiles)
+            return True
+
+    def replace_all(self, profiles):
+        with self._lock:
+            self.snapshot()
+            self._publish(copy.deepcopy(dict(profiles)))
+
+    def _publish(self, profiles):
+        self._snapshot = MappingProxyType(profiles)
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Escribir ya los cambios pendientes. Devuelve False si la escritura falla."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return True
+            tmp_path = self.path + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(dict(self._snapshot), f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except (IOError, OSError) as e:
+                print(f"[ERROR] No se pudo guardar el archivo de perfiles: {e}")
+                self.last_error = str(e)
+                return False
+            self.last_error = None
+            self._dirty = False
+            self._stat = self._file_stat()
+            self._checked_at = time.monotonic()
+            return True
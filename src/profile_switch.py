@@ -0,0 +1,184 @@
+import os
+import time
+from collections import namedtuple
+from src.window_snapshot import STATE_MAXIMIZED, STATE_MINIMIZED, STATE_NORMAL
+from src.window_placement import Placement, PlacementBatch
+
+# Clases de ventana del propio shell de Windows que nunca se cierran
+SHELL_CLASSES = frozenset({'Progman', 'WorkerW', 'Shell_TrayWnd', 'Shell_SecondaryTrayWnd'})
+
+# Diferencia entre el escritorio actual y el plan de un perfil:
+#   keep:   (ProgramPlan, hwnd) ya abiertos y colocados
+#   move:   (ProgramPlan, Placement) abiertos pero fuera de su sitio
+#   launch: ProgramPlan sin ventana, que hay que lanzar
+#   close:  WindowInfo de aplicaciones ajenas al perfil que se pueden cerrar (solo con
+#           close_others); solo se cierran si el usuario lo confirma o lo pide
+SwitchDiff = namedtuple('SwitchDiff', ['keep', 'move', 'launch', 'close'])
+
+# Resultado de un cambio de perfil: el diff aplicado, las colocaciones, las ventanas
+# cerradas (vacío si no se pidió cerrar) y la ejecución (ProfileRun) con los programas que faltaban
+SwitchResult = namedtuple('SwitchResult', ['diff', 'placements', 'closed', 'run', 'elapsed'])
+
+
+class Win32WindowCloser:
+    """Cierra ventanas pidiéndoselo a la aplicación (WM_CLOSE), como el botón de cerrar"""
+
+    def close(self, hwnd):
+        import win32con
+        import win32gui
+        win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+
+
+def _program_pids(program, processes):
+    """PIDs en ejecución que corresponden al programa del plan"""
+    if not program.process_name:
+        return set()
+    if program.substring_match:
+        return processes.pids_by_substring(program.process_name)
+    pids = processes.pids_by_exe(program.exe_path)
+    if not pids:
+        pids = processes.pids_by_name(program.process_name)
+    return pids
+
+
+def window_matches(program, window, tolerance=2):
+    """Si la ventana ya está donde y como indica el plan (con tolerancia en píxeles)"""
+    if program.minimize:
+        return window.state == STATE_MINIMIZED
+    rect = program.monitor_rect
+    if rect is None or window.rect is None:
+        return False
+    if program.maximize:
+        if window.state != STATE_MAXIMIZED:
+            return False
+        # Una ventana maximizada solo necesita estar en el monitor correcto
+        x, y, width, height = window.rect
+        cx, cy = x + width // 2, y + height // 2
+        return rect.x <= cx < rect.x + rect.width and rect.y <= cy < rect.y + rect.height
+    if window.state != STATE_NORMAL:
+        return False
+    target = (program.x, program.y, program.width, program.height)
+    return all(abs(a - b) <= tolerance for a, b in zip(window.rect, target))
+
+
+def is_app_window(window):
+    """
+    Ventana principal de una aplicación: con título, sin ventana dueña, que no sea una
+    ventana de herramientas ni esté oculta por DWM, y que no sea del shell.
+    Solo estas son candidatas a cerrarse con close_others.
+    """
+    return (bool(window.title) and window.owner is None and not window.tool_window
+            and not window.cloaked and window.class_name not in SHELL_CLASSES)
+
+
+def diff_desktop(plan, windows, processes, tolerance=2, protected_pids=(), find_by_title=None):
+    """
+    Comparar una sola instantánea del escritorio con el plan de un perfil.
+    windows es la lista de WindowInfo (en orden Z) y processes una ProcessTable ya refrescada.
+    Cada programa se queda con una ventana distinta de su proceso, prefiriendo la que ya está
+    bien colocada. Si el proceso está abierto pero sin ventana visible se deja en launch:
+    launch_program lo detecta como ya abierto y no lo vuelve a lanzar.
+    protected_pids son procesos cuyas ventanas nunca se proponen para cerrar (este proceso,
+    sus padres y sus hijos).
+    find_by_title(keyword) devuelve los hwnd cuyo título coincide: las apps empaquetadas se
+    buscan también así, porque su ventana suele ser de ApplicationFrameHost y no de su
+    proceso (o el proceso no se conoce). Los procesos de esas ventanas cuentan como del perfil.
+    """
+    by_pid = {}
+    by_hwnd = {}
+    for window in windows:
+        by_pid.setdefault(window.pid, []).append(window)
+        by_hwnd[window.hwnd] = window
+
+    keep, move, launch = [], [], []
+    claimed = set()
+    target_pids = set()
+    for program in plan.programs:
+        pids = _program_pids(program, processes)
+        target_pids |= pids
+        candidates = [w for pid in sorted(pids) for w in by_pid.get(pid, ()) if w.hwnd not in claimed]
+        if program.packaged and find_by_title is not None:
+            titled = [by_hwnd[hwnd] for hwnd in find_by_title(program.compiled_keyword) if hwnd in by_hwnd]
+            target_pids |= {w.pid for w in titled}
+            candidates.extend(w for w in titled if w.hwnd not in claimed and w not in candidates)
+        if not candidates:
+            launch.append(program)
+            continue
+        # Orden Z: la primera es la ventana principal más reciente
+        chosen = next((w for w in candidates if window_matches(program, w, tolerance)), None)
+        if chosen is not None:
+            claimed.add(chosen.hwnd)
+            keep.append((program, chosen.hwnd))
+            continue
+        chosen = candidates[0]
+        claimed.add(chosen.hwnd)
+        if program.monitor_rect is None:
+            keep.append((program, chosen.hwnd))
+            continue
+        move.append((program, Placement(chosen.hwnd, program.x, program.y, program.width,
+                                        program.height, program.maximize, program.minimize)))
+
+    close = []
+    if plan.close_others:
+        protected = set(protected_pids) | target_pids | {os.getpid()}
+        for window in windows:
+            if window.pid not in protected and is_app_window(window):
+                close.append(window)
+    return SwitchDiff(keep, move, launch, close)
+
+
+class ProfileSwitcher:
+    """
+    Cambio diferencial de perfil: una única instantánea de ventanas y procesos, comparada con
+    el plan compilado. Solo se recolocan las ventanas descolocadas (en un lote) y solo se
+    lanzan los programas que faltan. Si el perfil tiene close_others, las ventanas ajenas se
+    devuelven en diff.close y solo se cierran con close_others=True o con close_windows().
+    """
+
+    def __init__(self, snapshot, processes, placement_backend=None, closer=None, tolerance=2):
+        self.snapshot = snapshot
+        self.processes = processes
+        self.placement_backend = placement_backend
+        self.closer = closer if closer is not None else Win32WindowCloser()
+        self.tolerance = tolerance
+
+    def protected_pids(self):
+        """Este proceso, sus padres (consola, lanzador) y sus hijos: nunca se cierran"""
+        own = os.getpid()
+        return self.processes.ancestors(own) | self.processes.descendants(own)
+
+    def diff(self, plan):
+        self.snapshot.refresh(force=True)
+        self.processes.refresh(force=True)
+        return diff_desktop(plan, self.snapshot.windows(), self.processes, self.tolerance,
+                            protected_pids=self.protected_pids(),
+                            find_by_title=self.snapshot.find_by_title)
+
+    def switch(self, plan, launch=None, close_others=False):
+        """
+        Llevar el escritorio al plan. launch(programas) lanza los que faltan y devuelve
+        su ProfileRun (o None); se llama antes de colocar para no retrasar los lanzamientos.
+        Las ventanas de diff.close solo se cierran si close_others es True.
+        """
+        start = time.perf_counter()
+        diff = self.diff(plan)
+        run = launch(diff.launch) if launch is not None and diff.launch else None
+
+        batch = PlacementBatch(self.placement_backend)
+        for _, placement in diff.move:
+            batch.add(placement)
+        placements = batch.apply()
+
+        closed = self.close_windows(diff.close) if close_others else []
+        return SwitchResult(diff, placements, closed, run, time.perf_counter() - start)
+
+    def close_windows(self, windows):
+        """Pedir el cierre de las ventanas indicadas; devuelve los hwnd a los que se ha pedido"""
+        closed = []
+        for window in windows:
+            try:
+                self.closer.close(window.hwnd)
+                closed.append(window.hwnd)
+            except Exception as e:
+                print(f"[WARN] No se pudo cerrar '{window.title}' ({window.hwnd}): {e}")
+        return closed
@@ -0,0 +1,42 @@
+import json
+import os
+import time
+
+PROGRAMS_CACHE_FILENAME = "programs_cache.json"
+
+
+def default_programs_cache_path():
+    data_dir = os.path.join(os.path.expanduser("~"), "AppData", "Local", "ProgramProfileManager")
+    return os.path.join(data_dir, PROGRAMS_CACHE_FILENAME)
+
+
+def load_cached_programs(path=None):
+    """
+    Programas del último escaneo guardado: (lista, instante del escaneo).
+    Devuelve ([], None) si no hay caché o no se puede leer.
+    """
+    path = path or default_programs_cache_path()
+    if not os.path.exists(path):
+        return [], None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('programs', []), data.get('scanned_at')
+    except (json.JSONDecodeError, IOError, AttributeError):
+        print(f"[WARN] No se pudo leer la caché de programas: {path}")
+        return [], None
+
+
+def save_cached_programs(programs, path=None):
+    """Guardar el resultado de un escaneo (escritura atómica)"""
+    path = path or default_programs_cache_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'scanned_at': time.time(), 'programs': programs}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return True
+    except (IOError, OSError) as e:
+        print(f"[ERROR] No se pudo guardar la caché de programas: {e}")
+        return False
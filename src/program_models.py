@@ -0,0 +1,178 @@
+import os
+import time
+from PyQt5.QtCore import QAbstractListModel, QAbstractProxyModel, QModelIndex, Qt, QTimer
+from PyQt5.QtGui import QIcon
+from .program_search import ProgramSearchIndex
+
+# Espera tras la última tecla antes de filtrar
+SEARCH_DEBOUNCE_MS = 120
+
+
+class ProgramListModel(QAbstractListModel):
+    """
+    Lista de programas para las vistas. append() inserta un lote entero de una vez (escaneo
+    en curso); set_programs() la sustituye. Qt.UserRole devuelve el dict del programa.
+    label(programa) da el texto de cada fila; con icons=True se carga el icono del .exe
+    la primera vez que se pinta la fila.
+    """
+
+    def __init__(self, label=None, icons=False, parent=None):
+        super().__init__(parent)
+        self.programs = []
+        self.label = label or (lambda program: program['name'])
+        self.icons = icons
+        self._icon_cache = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.programs)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.programs):
+            return None
+        program = self.programs[index.row()]
+        if role == Qt.DisplayRole:
+            return self.label(program)
+        if role == Qt.UserRole:
+            return program
+        if role == Qt.DecorationRole and self.icons:
+            return self._icon(program.get('path', ''))
+        return None
+
+    def _icon(self, exe_path):
+        if exe_path not in self._icon_cache:
+            icon = None
+            if exe_path.lower().endswith('.exe') and os.path.exists(exe_path):
+                icon = QIcon(exe_path)
+                icon = None if icon.isNull() else icon
+            self._icon_cache[exe_path] = icon
+        return self._icon_cache[exe_path]
+
+    def set_programs(self, programs):
+        self.beginResetModel()
+        self.programs = list(programs)
+        self.endResetModel()
+
+    def append(self, programs):
+        if not programs:
+            return
+        first = len(self.programs)
+        self.beginInsertRows(QModelIndex(), first, first + len(programs) - 1)
+        self.programs.extend(programs)
+        self.endInsertRows()
+
+    def program(self, row):
+        return self.programs[row]
+
+
+def _indexes(search_index, programs):
+    indexed = search_index.programs
+    return len(indexed) == len(programs) and all(a is b for a, b in zip(indexed, programs))
+
+
+class ProgramSearchProxy(QAbstractProxyModel):
+    """
+    Vista filtrada y ordenada de un ProgramListModel según un ProgramSearchIndex.
+    set_query() se puede llamar en cada pulsación: la búsqueda se hace cuando el texto lleva
+    SEARCH_DEBOUNCE_MS sin cambiar. Sin consulta, las filas siguen el orden del modelo.
+    El índice se reconstruye cuando el modelo se sustituye y crece con cada lote insertado;
+    se puede pasar uno ya construido (el de la ventana principal) con set_index(), que se
+    reutiliza en cuanto el modelo tenga los mismos programas.
+    """
+
+    def __init__(self, parent=None, debounce_ms=SEARCH_DEBOUNCE_MS):
+        super().__init__(parent)
+        self.search_index = ProgramSearchIndex()
+        self._shared_index = None
+        self.query = ''
+        self.last_search_ms = None
+        self._pending = ''
+        self._rows = []
+        self._positions = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.apply_query)
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.modelReset.connect(self._on_source_reset)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        self._on_source_reset()
+
+    def set_index(self, search_index):
+        """Usar un índice ya construido sobre los mismos programas que el modelo (ahora o tras
+        el siguiente set_programs())"""
+        self._shared_index = search_index
+        self.search_index = search_index
+        if self.sourceModel() is not None:
+            self._on_source_reset()
+
+    def set_query(self, text):
+        self._pending = text
+        self._timer.start()
+
+    def apply_query(self):
+        self._timer.stop()
+        self.query = self._pending
+        self._refilter()
+
+    def _on_source_reset(self):
+        programs = self.sourceModel().programs
+        # Un índice compartido sobre los mismos programas se reutiliza
+        for candidate in (self._shared_index, self.search_index):
+            if candidate is not None and _indexes(candidate, programs):
+                self.search_index = candidate
+                break
+        else:
+            self.search_index = ProgramSearchIndex(programs)
+        self._refilter()
+
+    def _on_rows_inserted(self, parent, first, last):
+        programs = self.sourceModel().programs[first:last + 1]
+        self.search_index.add(programs)
+        if self.query.strip():
+            self._refilter()
+            return
+        # Sin consulta las filas nuevas van al final, como en el modelo
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(programs) - 1)
+        for row in range(first, last + 1):
+            self._positions[row] = len(self._rows)
+            self._rows.append(row)
+        self.endInsertRows()
+
+    def _refilter(self):
+        start = time.perf_counter()
+        rows = self.search_index.search(self.query)
+        self.last_search_ms = (time.perf_counter() - start) * 1000
+        count = self.sourceModel().rowCount() if self.sourceModel() is not None else 0
+        if len(self.search_index) > count:
+            # Índice compartido que ya tiene programas de un escaneo posterior
+            rows = [row for row in rows if row < count]
+        self.beginResetModel()
+        self._rows = rows
+        self._positions = {row: position for position, row in enumerate(rows)}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self._rows) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._rows):
+            return QModelIndex()
+        return self.sourceModel().index(self._rows[proxy_index.row()], 0)
+
+    def mapFromSource(self, source_index):
+        position = self._positions.get(source_index.row()) if source_index.isValid() else None
+        return self.index(position, 0) if position is not None else QModelIndex()
@@ -1,211 +1,577 @@
 import os
-import winreg
-import psutil
-from pathlib import Path
+import hashlib
 import subprocess
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from src.exe_resolver import ExecutableResolver
+from src.folder_walker import FolderWalker
+from src.shell_links import ShellLinkError, read_lnk
+from src.start_menu import (PACKAGES_KEY, PACKAGE_VALUES, read_package_manifest, shortcut_program,
+                            start_menu_roots)
+from src.scan_cache import ScanCache, default_scan_cache_path
 
+# Claves de desinstalación que se recorren: (colmena, ruta)
+REGISTRY_PATHS = [
+    ('HKLM', r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ('HKLM', r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ('HKCU', r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
+]
+
+# Valores de una clave de desinstalación que usa el escáner
+REGISTRY_VALUES = ('DisplayName', 'InstallLocation', 'UninstallString', 'DisplayIcon', 'Publisher')
+
+# Tiempo máximo por fuente de escaneo, en segundos (contado desde el inicio del escaneo)
+SOURCE_TIMEOUTS = {'registry': 20, 'folders': 30, 'shortcuts': 15, 'modern': 15}
+
+# Niveles de subcarpetas del menú Inicio que se recorren
+SHORTCUT_MAX_DEPTH = 4
+
+# Programas por lote al entregar resultados durante el escaneo
+STREAM_BATCH_SIZE = 200
+
+
+class _SourceStop:
+    """
+    Parada de una fuente de escaneo: se comporta como un threading.Event (is_set) y se activa
+    si se cancela el escaneo o cuando el escaneo deja de esperarla (tiempo agotado o escaneo
+    terminado). Una fuente abandonada ya no entrega lotes, progreso ni entradas de caché.
+    """
+
+    def __init__(self, cancel=None):
+        self.cancel = cancel
+        self.abandoned = threading.Event()
+
+    def is_set(self):
+        return self.abandoned.is_set() or (self.cancel is not None and self.cancel.is_set())
+
+
+class WinregRegistry:
+    """Registro real de Windows (winreg)"""
+
+    def _hive(self, hive):
+        import winreg
+        return {'HKLM': winreg.HKEY_LOCAL_MACHINE, 'HKCU': winreg.HKEY_CURRENT_USER}[hive]
+
+    def subkeys(self, hive, path):
+        """Lista de (nombre, última escritura) de las subclaves; OSError si la clave no existe"""
+        import winreg
+        result = []
+        with winreg.OpenKey(self._hive(hive), path) as key:
+            for i in range(winreg.QueryInfoKey(key)[0]):
+                try:
+                    name = winreg.EnumKey(key, i)
+                    with winreg.OpenKey(key, name) as subkey:
+                        result.append((name, winreg.QueryInfoKey(subkey)[2]))
+                except OSError:
+                    continue
+        return result
+
+    def values(self, hive, path, name, names=REGISTRY_VALUES):
+        """Valores de names presentes en la subclave"""
+        import winreg
+        values = {}
+        with winreg.OpenKey(self._hive(hive), path + '\\' + name) as subkey:
+            for value_name in names:
+                try:
+                    values[value_name] = winreg.QueryValueEx(subkey, value_name)[0]
+                except FileNotFoundError:
+                    continue
+        return values
+
+
+def powershell_start_apps(timeout=SOURCE_TIMEOUTS['modern']):
+    """
+    Lista de aplicaciones del menú Inicio (Get-StartApps) como dicts con Name y AppID.
+    Solo se usa si se pide (use_powershell): arrancar PowerShell cuesta segundos.
+    """
+    result = subprocess.run([
+        "powershell", "-Command",
+        "Get-StartApps | ConvertTo-Json"
+    ], capture_output=True, text=True, check=True, timeout=timeout)
+    apps = json.loads(result.stdout) if result.stdout.strip() else []
+    if isinstance(apps, dict):  # Solo una app
+        apps = [apps]
+    return apps
+
+
+def start_apps_fingerprint():
+    """
+    Huella barata de lo que cambia al instalar o quitar aplicaciones del menú Inicio:
+    mtime de las carpetas Programs del menú Inicio (y sus subcarpetas) y de las carpetas
+    de paquetes. Si no cambia, se reutiliza el último resultado de Get-StartApps.
+    """
+    program_data = os.environ.get('PROGRAMDATA', r'C:\ProgramData')
+    roots = [
+        os.path.join(os.environ.get('APPDATA', ''), r"Microsoft\Windows\Start Menu\Programs"),
+        os.path.join(program_data, r"Microsoft\Windows\Start Menu\Programs"),
+    ]
+    packages = [
+        os.path.join(os.environ.get('LOCALAPPDATA', ''), "Packages"),
+        os.path.join(os.environ.get('ProgramFiles', r'C:\Program Files'), "WindowsApps"),
+    ]
+    stamps = []
+    for root in roots:
+        try:
+            stamps.append((root, os.stat(root).st_mtime_ns))
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stamps.append((entry.path, entry.stat(follow_symlinks=False).st_mtime_ns))
+        except OSError:
+            stamps.append((root, None))
+    for folder in packages:
+        try:
+            stamps.append((folder, os.stat(folder).st_mtime_ns))
+        except OSError:
+            stamps.append((folder, None))
+    return hashlib.sha1(repr(sorted(stamps, key=repr)).encode('utf-8')).hexdigest()
 
 
 class ProgramScanner:
-    def __init__(self):
+    """
+    Escáner de programas instalados: registro, carpetas comunes, accesos directos del menú
+    Inicio y aplicaciones empaquetadas.
+    Los resultados de cada fuente se guardan en una ScanCache persistente y un nuevo escaneo
+    solo vuelve a leer lo que ha cambiado (subclaves con otra fecha de escritura, carpetas con
+    otro mtime).
+    Las fuentes (registro, cada carpeta raíz, el menú Inicio y los paquetes) se recorren a la
+    vez en un pool de hilos, cada una con su tiempo máximo: un fallo o un retraso en una no
+    pierde las demás.
+    Las carpetas se recorren con un FolderWalker (profundidad, exclusiones y límite de entradas).
+    use_powershell=True recurre a Get-StartApps si no se pueden leer los paquetes.
+    registry, folders, start_menu, start_apps y fingerprint permiten sustituir las fuentes en
+    pruebas.
+    """
+
+    def __init__(self, cache=None, registry=None, folders=None, start_apps=None, fingerprint=None,
+                 timeouts=None, walker=None, start_menu=None, use_powershell=False):
         self.cached_programs = []
-        
-    def scan_installed_programs(self):
-        """Escanear programas instalados en Windows"""
+        self.cache = cache if cache is not None else ScanCache(default_scan_cache_path())
+        self.registry = registry if registry is not None else WinregRegistry()
+        self.folders = folders
+        self.start_menu = start_menu
+        self.use_powershell = use_powershell
+        self.start_apps = start_apps if start_apps is not None else powershell_start_apps
+        self.fingerprint = fingerprint if fingerprint is not None else start_apps_fingerprint
+        self.timeouts = dict(SOURCE_TIMEOUTS, **(timeouts or {}))
+        # Entradas reutilizadas y releídas por fuente en el último escaneo
+        self.last_scan_stats = {}
+        # Por fuente: {'seconds', 'programs', 'error'} del último escaneo
+        self.last_scan_timings = {}
+        self.last_scan_cancelled = False
+        self._streamed = set()
+        self._stats_lock = threading.Lock()
+        self.walker = walker if walker is not None else FolderWalker()
+        self.walker.cache = self.cache
+        self.walker.is_system = self._is_system_executable
+        self.walker.count = lambda reused: self._count('folders', reused)
+        self.resolver = ExecutableResolver(cache=self.cache, is_system=self._is_system_executable,
+                                           count=lambda reused: self._count('executables', reused))
+
+    def _sources(self):
+        """
+        Fuentes de escaneo: (nombre, sección de caché, función, tiempo máximo).
+        Cada función se llama como scan(seen, cancel) y es un generador de programas.
+        """
+        sources = [('registry', 'registry', self._scan_registry, self.timeouts['registry'])]
+        for folder in self._common_folders():
+            if os.path.exists(folder):
+                sources.append((f"folders:{folder}", 'folders',
+                                lambda seen, cancel, folder=folder: self._scan_folder(folder, seen, cancel),
+                                self.timeouts['folders']))
+        sources.append(('shortcuts', 'shortcuts', self._scan_shortcuts, self.timeouts['shortcuts']))
+        sources.append(('modern', 'modern', self._scan_modern_apps, self.timeouts['modern']))
+        return sources
+
+    def scan_installed_programs(self, force=False, max_workers=None, on_batch=None, on_progress=None,
+                                cancel=None):
+        """
+        Escanear programas instalados en Windows.
+        force=True descarta la caché y vuelve a leerlo todo.
+        on_batch(fuente, programas) recibe los programas nuevos (sin duplicados) en lotes según
+        los va encontrando cada fuente; on_progress(fuente, terminadas, total) al acabar cada
+        fuente. Ambos se llaman desde los hilos del escaneo.
+        cancel (threading.Event) detiene el escaneo: se devuelve lo encontrado hasta entonces,
+        last_scan_cancelled queda a True y no se poda la caché.
+        Una fuente que supera su tiempo se abandona: lo que encuentre después se descarta.
+        Los resultados se unen y se quitan duplicados al final, en el orden de las fuentes.
+        """
+        if force:
+            self.cache.clear()
+        self.last_scan_stats = {}
+        self.last_scan_timings = {}
+        self.last_scan_cancelled = False
+        self._streamed = set()
+        sources = self._sources()
+        progress = {'done': 0, 'total': len(sources)}
+        started = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=max_workers or len(sources), thread_name_prefix='scan')
+        futures = []
+        for name, section, scan, timeout in sources:
+            seen = set()
+            stop = _SourceStop(cancel)
+            future = pool.submit(self._run_source, name, scan, seen, on_batch, stop)
+            if on_progress is not None:
+                future.add_done_callback(
+                    lambda f, name=name, stop=stop: self._report_progress(name, progress, on_progress, stop))
+            futures.append((name, section, seen, timeout, future, stop))
+
         programs = []
-        
-        try:
-            programs.extend(self._scan_registry())
-            programs.extend(self._scan_common_folders())
-            programs.extend(self._scan_modern_apps())  # <-- Esto debe existir y devolver lista
-        except Exception as e:
-            print(f"[!] Error escaneando programas: {e}")
-        
+        completed = {}
+        for name, section, seen, timeout, future, stop in futures:
+            remaining = max(0, started + timeout - time.perf_counter())
+            try:
+                programs.extend(future.result(timeout=remaining))
+            except FutureTimeout:
+                # Sigue en su hilo, pero desde ahora no escribe en la caché ni entrega nada
+                self._abandon([stop])
+                print(f"[!] La fuente {name} superó {timeout} s y se descarta")
+                self.last_scan_timings[name] = {'seconds': timeout, 'programs': 0, 'error': 'timeout'}
+                completed.setdefault(section, []).append(None)
+                continue
+            except Exception as e:
+                print(f"[!] Error escaneando programas ({name}): {e}")
+                self.last_scan_timings.setdefault(name, {'seconds': None, 'programs': 0})['error'] = str(e)
+                completed.setdefault(section, []).append(None)
+                continue
+            completed.setdefault(section, []).append(seen)
+        # Antes de guardar la caché se abandonan todas: ya no llega nada de este escaneo
+        self._abandon([stop for *_, stop in futures])
+        pool.shutdown(wait=False, cancel_futures=True)
+        self.last_scan_cancelled = cancel is not None and cancel.is_set()
+
+        # Solo se podan las secciones cuyas fuentes terminaron todas (si no, se perderían entradas)
+        if not self.last_scan_cancelled:
+            for section, seen_sets in completed.items():
+                if None not in seen_sets:
+                    self.cache.prune(section, set().union(*seen_sets))
+            # Los ejecutables elegidos solo se guardan mientras exista la carpeta de instalación
+            folders = self.cache.keys('executables')
+            self.cache.prune('executables', {folder for folder in folders if os.path.isdir(folder)})
+        self.cache.save()
+
         # Eliminar duplicados y ordenar
         unique_programs = self._remove_duplicates(programs)
         unique_programs.sort(key=lambda x: x['name'].lower())
-        
+
         self.cached_programs = unique_programs
         return unique_programs
-        
 
-    
-    def _scan_modern_apps(self):
-        """Escanear aplicaciones modernas (Microsoft Store/UWP apps)"""
+    def _abandon(self, stops):
+        # Con el lock: ningún lote ni progreso de esas fuentes sale después de esto
+        with self._stats_lock:
+            for stop in stops:
+                stop.abandoned.set()
+
+    def _run_source(self, name, scan, seen, on_batch=None, stop=None):
+        """Recorrer una fuente hasta el final o hasta que stop (un _SourceStop) se active"""
+        stop = stop if stop is not None else _SourceStop()
+        timings = self.last_scan_timings
+        start = time.perf_counter()
+        programs = []
+        pending = []
+        try:
+            for program in scan(seen, stop):
+                if stop.is_set():
+                    break
+                programs.append(program)
+                if on_batch is not None:
+                    pending.append(program)
+                    if len(pending) >= STREAM_BATCH_SIZE:
+                        self._emit_batch(name, pending, on_batch, stop)
+                        pending = []
+        except Exception:
+            if not stop.abandoned.is_set():
+                timings[name] = {'seconds': time.perf_counter() - start, 'programs': 0}
+            raise
+        if pending:
+            self._emit_batch(name, pending, on_batch, stop)
+        if not stop.abandoned.is_set():
+            timings[name] = {'seconds': time.perf_counter() - start,
+                             'programs': len(programs), 'error': None}
+        return programs
+
+    def _emit_batch(self, name, programs, on_batch, stop):
+        """
+        Entregar solo los programas que ninguna fuente ha entregado aún. Se entrega con el lock
+        tomado: una vez abandonada la fuente (ver scan_installed_programs) no sale ningún lote.
+        """
+        with self._stats_lock:
+            if stop.abandoned.is_set():
+                return
+            fresh = []
+            for program in programs:
+                key = (program['name'].lower(), program['path'].lower())
+                if key not in self._streamed:
+                    self._streamed.add(key)
+                    fresh.append(program)
+            if fresh:
+                on_batch(name, fresh)
+
+    def _report_progress(self, name, progress, on_progress, stop):
+        with self._stats_lock:
+            if stop.abandoned.is_set():
+                return
+            progress['done'] += 1
+            done = progress['done']
+        on_progress(name, done, progress['total'])
+
+    def format_scan_timings(self):
+        """Resumen de tiempos por fuente del último escaneo"""
+        parts = []
+        for name, timing in self.last_scan_timings.items():
+            if timing.get('error'):
+                parts.append(f"{name}: {timing['error']}")
+            else:
+                parts.append(f"{name}: {timing['programs']} en {timing['seconds']:.2f} s")
+        return '; '.join(parts)
+
+    def _count(self, source, reused):
+        with self._stats_lock:
+            stats = self.last_scan_stats.setdefault(source, {'reused': 0, 'read': 0})
+            stats['reused' if reused else 'read'] += 1
+
+    def _scan_shortcuts(self, seen=None, cancel=None):
+        """
+        Generador de los accesos directos (.lnk) de las carpetas Programs del menú Inicio.
+        Cada carpeta se guarda en caché con su mtime, como las carpetas de instalación.
+        cancel se comprueba antes de cada carpeta.
+        """
+        seen = seen if seen is not None else set()
+        roots = self.start_menu if self.start_menu is not None else start_menu_roots()
+        stack = [(root, 0) for root in reversed(roots)]
+        while stack:
+            if cancel is not None and cancel.is_set():
+                return
+            folder, depth = stack.pop()
+            try:
+                stamp = os.stat(folder).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(folder)
+            entry = self.cache.get('shortcuts', folder, stamp)
+            if entry is not None:
+                self._count('shortcuts', True)
+            else:
+                entry = {'stamp': stamp, 'programs': [], 'subdirs': []}
+                try:
+                    with os.scandir(folder) as entries:
+                        for item in entries:
+                            if item.is_dir():
+                                entry['subdirs'].append(item.name)
+                            elif item.name.lower().endswith('.lnk'):
+                                try:
+                                    program = shortcut_program(item.path, read_lnk(item.path),
+                                                               self._is_system_executable)
+                                except (OSError, ShellLinkError):
+                                    continue
+                                if program:
+                                    entry['programs'].append(program)
+                except OSError:
+                    pass
+                self._count('shortcuts', False)
+                self.cache.put('shortcuts', folder, entry, cancel)
+            for program in entry['programs']:
+                yield dict(program)
+            if depth < SHORTCUT_MAX_DEPTH:
+                stack.extend((os.path.join(folder, name), depth + 1)
+                             for name in reversed(entry['subdirs']))
+
+    def _scan_modern_apps(self, seen=None, cancel=None):
+        """
+        Generador de las aplicaciones empaquetadas (Microsoft Store/UWP) de shell:AppsFolder,
+        leídas del registro de paquetes del usuario y del AppxManifest.xml de cada paquete.
+        Cada paquete se guarda en caché con la fecha de escritura de su clave.
+        cancel se comprueba antes de cada paquete.
+        """
+        seen = seen if seen is not None else set()
+        hive, path = PACKAGES_KEY
+        try:
+            packages = self.registry.subkeys(hive, path)
+        except OSError:
+            packages = None
+        if not packages:
+            if self.use_powershell:
+                yield from self._scan_start_apps(seen, cancel)
+            return
+
+        for package, last_write in packages:
+            if cancel is not None and cancel.is_set():
+                return
+            key = f"{hive}\\{path}\\{package}"
+            seen.add(key)
+            entry = self.cache.get('modern', key, last_write)
+            if entry is not None:
+                self._count('modern', True)
+                for program in entry['programs']:
+                    yield dict(program)
+                continue
+            try:
+                values = self.registry.values(hive, path, package, PACKAGE_VALUES)
+            except OSError:
+                continue
+            root_folder = values.get('PackageRootFolder')
+            found = read_package_manifest(root_folder) if root_folder else []
+            self._count('modern', False)
+            self.cache.put('modern', key, {'stamp': last_write, 'programs': found}, cancel)
+            for program in found:
+                yield dict(program)
+
+    def _scan_start_apps(self, seen, cancel=None):
+        """Alternativa con PowerShell (Get-StartApps), reutilizada mientras no cambie la huella"""
+        seen.add('start_apps')
+        stamp = self.fingerprint()
+        entry = self.cache.get('modern', 'start_apps', stamp)
+        if entry is not None:
+            self._count('modern', True)
+            return list(entry['programs'])
+
         programs = []
         try:
             # Ejecutar PowerShell para obtener lista de apps
-            result = subprocess.run([
-                "powershell", "-Command",
-                "Get-StartApps | ConvertTo-Json"
-            ], capture_output=True, text=True, check=True)
-
-            apps = json.loads(result.stdout)
-
-            if isinstance(apps, dict):  # Solo una app
-                apps = [apps]
-
-            for app in apps:
-                name = app.get('Name')
-                app_id = app.get('AppID')
-                if name and app_id and not app_id.endswith('.exe'):
-                    programs.append({
-                        'name': name,
-                        'path': app_id,
-                        'source': 'modern'
-                    })
-        except subprocess.CalledProcessError as e:
+            apps = self.start_apps()
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError, ValueError) as e:
             print(f"[!] Error al escanear apps modernas: {e}")
+            return programs
 
+        for app in apps:
+            name = app.get('Name')
+            app_id = app.get('AppID')
+            if name and app_id and not app_id.endswith('.exe'):
+                programs.append({
+                    'name': name,
+                    'path': app_id,
+                    'source': 'modern'
+                })
+        result_hash = hashlib.sha1(json.dumps(programs, sort_keys=True).encode('utf-8')).hexdigest()
+        previous = self.cache.entry('modern', 'start_apps')
+        if previous is not None and previous.get('hash') == result_hash:
+            # Misma lista que la última vez: solo se actualiza la huella
+            self._count('modern', True)
+        else:
+            self._count('modern', False)
+        self.cache.put('modern', 'start_apps', {'stamp': stamp, 'hash': result_hash, 'programs': programs},
+                       cancel)
         return programs
 
-    def _scan_registry(self):
-        """Escanear el registro de Windows para programas instalados"""
-        programs = []
-        
-        # Rutas del registro donde se almacenan los programas instalados
-        registry_paths = [
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
-            (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
-        ]
-        
-        for hkey, path in registry_paths:
+    def _scan_registry(self, seen=None, cancel=None):
+        """
+        Generador de los programas instalados según el registro de Windows.
+        seen recibe las claves visitadas (para podar la caché al final del escaneo).
+        cancel se comprueba antes de cada clave.
+        """
+        seen = seen if seen is not None else set()
+
+        for hive, path in REGISTRY_PATHS:
             try:
-                with winreg.OpenKey(hkey, path) as key:
-                    for i in range(winreg.QueryInfoKey(key)[0]):
-                        try:
-                            subkey_name = winreg.EnumKey(key, i)
-                            with winreg.OpenKey(key, subkey_name) as subkey:
-                                program = self._extract_program_info(subkey)
-                                if program:
-                                    programs.append(program)
-                        except (OSError, FileNotFoundError):
-                            continue
+                subkeys = self.registry.subkeys(hive, path)
             except (OSError, FileNotFoundError):
                 continue
-                
-        return programs
-        
-    def _extract_program_info(self, subkey):
-        """Extraer información del programa desde el registro"""
+            for subkey_name, last_write in subkeys:
+                if cancel is not None and cancel.is_set():
+                    return
+                key = f"{hive}\\{path}\\{subkey_name}"
+                seen.add(key)
+                entry = self.cache.get('registry', key, last_write)
+                # Si el ejecutable ya no existe, la entrada se vuelve a leer
+                if entry is not None and (entry['program'] is None
+                                          or os.path.exists(entry['program']['path'])):
+                    self._count('registry', True)
+                    if entry['program']:
+                        yield dict(entry['program'])
+                    continue
+                try:
+                    program = self._extract_program_info(self.registry.values(hive, path, subkey_name),
+                                                         cancel)
+                except (OSError, FileNotFoundError):
+                    continue
+                self._count('registry', False)
+                self.cache.put('registry', key, {'stamp': last_write, 'program': program}, cancel)
+                if program:
+                    yield dict(program)
+
+    def _extract_program_info(self, values, cancel=None):
+        """Extraer información del programa desde los valores de su clave de registro"""
         try:
             # Obtener nombre del programa
-            try:
-                name = winreg.QueryValueEx(subkey, "DisplayName")[0]
-            except FileNotFoundError:
+            name = values.get("DisplayName")
+            if not name:
                 return None
-                
-            # Obtener ruta del ejecutable
-            exe_path = None
-            try:
-                # Intentar obtener la ruta del ejecutable
-                install_location = winreg.QueryValueEx(subkey, "InstallLocation")[0]
-                if install_location and os.path.exists(install_location):
-                    # Buscar ejecutables en la carpeta de instalación
-                    for file in os.listdir(install_location):
-                        if file.lower().endswith('.exe'):
-                            exe_path = os.path.join(install_location, file)
-                            break
-            except FileNotFoundError:
-                pass
-                
+
+            # Elegir el ejecutable principal: DisplayIcon, parecido con el nombre, tamaño...
+            exe_path = self.resolver.resolve(values.get("InstallLocation"), name,
+                                             values.get("DisplayIcon"), cancel)
+
             # Si no encontramos la ruta, intentar con UninstallString
             if not exe_path:
-                try:
-                    uninstall_string = winreg.QueryValueEx(subkey, "UninstallString")[0]
-                    if uninstall_string and '.exe' in uninstall_string:
-                        # Extraer la ruta del ejecutable del string de desinstalación
-                        parts = uninstall_string.split('.exe')
-                        if parts:
-                            potential_path = parts[0] + '.exe'
-                            potential_path = potential_path.strip('"')
-                            if os.path.exists(potential_path):
-                                exe_path = potential_path
-                except FileNotFoundError:
-                    pass
-                    
+                uninstall_string = values.get("UninstallString")
+                if uninstall_string and '.exe' in uninstall_string:
+                    # Extraer la ruta del ejecutable del string de desinstalación
+                    parts = uninstall_string.split('.exe')
+                    if parts:
+                        potential_path = parts[0] + '.exe'
+                        potential_path = potential_path.strip('"')
+                        if os.path.exists(potential_path):
+                            exe_path = potential_path
+
             if exe_path and os.path.exists(exe_path):
-                return {
+                program = {
                     'name': name,
                     'path': exe_path,
                     'source': 'registry'
                 }
-                
+                # El editor solo sirve para buscar; no todos los programas lo indican
+                if values.get("Publisher"):
+                    program['publisher'] = values["Publisher"]
+                return program
+
         except Exception:
             pass
-            
+
         return None
-        
-    def _scan_common_folders(self):
-        """Escanear carpetas comunes donde se instalan programas"""
-        programs = []
-        
-        common_folders = [
+
+    def _common_folders(self):
+        if self.folders is not None:
+            return list(self.folders)
+        return [
             r"C:\Program Files",
             r"C:\Program Files (x86)",
             os.path.join(os.path.expanduser("~"), "AppData", "Local", "Programs")
         ]
-        
-        for folder in common_folders:
-            if os.path.exists(folder):
-                programs.extend(self._scan_folder(folder))
-                
-        return programs
-        
-    def _scan_folder(self, folder_path, max_depth=2, current_depth=0):
-        """Escanear una carpeta en busca de ejecutables"""
-        programs = []
-        
-        if current_depth >= max_depth:
-            return programs
-            
-        try:
-            for item in os.listdir(folder_path):
-                item_path = os.path.join(folder_path, item)
-                
-                if os.path.isfile(item_path) and item.lower().endswith('.exe'):
-                    # Filtrar ejecutables del sistema y desinstaladores
-                    if not self._is_system_executable(item.lower()):
-                        programs.append({
-                            'name': os.path.splitext(item)[0],
-                            'path': item_path,
-                            'source': 'folder'
-                        })
-                        
-                elif os.path.isdir(item_path) and current_depth < max_depth - 1:
-                    # Buscar recursivamente en subdirectorios
-                    programs.extend(self._scan_folder(item_path, max_depth, current_depth + 1))
-                    
-        except (PermissionError, OSError):
-            pass
-            
-        return programs
-        
+
+    def _scan_folder(self, folder_path, visited=None, cancel=None):
+        """
+        Escanear una carpeta raíz en busca de ejecutables (ver FolderWalker); es un generador.
+        El contenido directo de cada carpeta se guarda en caché con su mtime (que cambia al
+        añadir o quitar entradas); si no ha cambiado, solo se comprueban sus subcarpetas.
+        """
+        return self.walker.walk(folder_path, visited=visited, cancel=cancel)
+
     def _is_system_executable(self, filename):
         """Verificar si un ejecutable es del sistema o desinstalador"""
         system_keywords = [
             'uninstall', 'uninst', 'setup', 'install', 'update', 'updater',
             'crash', 'error', 'debug', 'log', 'temp', 'cache'
         ]
-        
+
         return any(keyword in filename for keyword in system_keywords)
-        
+
     def _remove_duplicates(self, programs):
         """Eliminar programas duplicados"""
         seen = set()
         unique_programs = []
-        
+
         for program in programs:
             # Usar el nombre y la ruta como clave única
             key = (program['name'].lower(), program['path'].lower())
             if key not in seen:
                 seen.add(key)
                 unique_programs.append(program)
-                
+
         return unique_programs
-        
+
     def get_cached_programs(self):
         """Obtener la lista de programas en caché"""
-        return self.cached_programs
\ No newline at end of file
+        return self.cached_programs
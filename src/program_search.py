@@ -0,0 +1,188 @@
+"""
+Índice de búsqueda de programas para los selectores de la interfaz.
+
+Se construye una vez por escaneo (y crece con los lotes que llegan durante el escaneo) sobre
+el nombre, el nombre del ejecutable y el editor de cada programa. Se indexa el vocabulario,
+no cada programa: palabra -> programas con su puntuación, prefijo -> palabras y trigrama ->
+palabras (para coincidencias en medio de palabra y con erratas).
+
+    python -m tests.bench_program_search    # tiempos por pulsación con 5000 programas
+"""
+import os
+import re
+import unicodedata
+
+# Peso de cada campo en la puntuación
+FIELD_WEIGHTS = (('name', 3.0), ('exe', 2.0), ('publisher', 1.0))
+
+# Fracción de trigramas que debe compartir una palabra con errata para contar
+FUZZY_MIN_OVERLAP = 0.5
+
+# Consultas de hasta este largo que se guardan ya ordenadas (son las de más resultados)
+SHORT_QUERY = 2
+
+_SEPARATORS = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text):
+    """Minúsculas, sin tildes y con cualquier separador convertido en un espacio"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return _SEPARATORS.sub(' ', text.lower()).strip()
+
+
+def _trigrams(word):
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def program_fields(program):
+    """Textos por los que se busca un programa: (peso, texto normalizado)"""
+    path = program.get('path', '')
+    exe = os.path.splitext(os.path.basename(path))[0] if path.lower().endswith('.exe') else ''
+    values = {'name': program.get('name', ''), 'exe': exe, 'publisher': program.get('publisher', '')}
+    return [(weight, normalize(values[field])) for field, weight in FIELD_WEIGHTS if values[field]]
+
+
+class ProgramSearchIndex:
+    """
+    Búsqueda por palabras: cada palabra de la consulta debe coincidir con el principio de una
+    palabra de algún campo (puntuación completa), con un trozo de ella (la mitad) o, si no hay
+    nada de eso, con una errata (según los trigramas compartidos). Las consultas de una o dos
+    letras que no empiezan ninguna palabra se buscan dentro de los nombres.
+    search() devuelve las posiciones de los programas de mejor a peor coincidencia.
+    """
+
+    def __init__(self, programs=()):
+        self.programs = []
+        self._names = []
+        self._position_words = []
+        self._order = []
+        self._word_positions = {}
+        self._prefix_words = {}
+        self._trigram_words = {}
+        self._short_results = {}
+        self.add(programs)
+
+    def __len__(self):
+        return len(self.programs)
+
+    def add(self, programs):
+        """Añadir programas al índice (sus posiciones siguen a las existentes)"""
+        for program in programs:
+            position = len(self.programs)
+            self.programs.append(program)
+            self._names.append(normalize(program.get('name', '')))
+            words = {}
+            for weight, text in program_fields(program):
+                for word_number, word in enumerate(text.split()):
+                    # Coincidir con la primera palabra del campo puntúa algo más
+                    score = weight + (1.0 if word_number == 0 else 0.0)
+                    positions = self._word_positions.get(word)
+                    if positions is None:
+                        positions = self._word_positions[word] = {}
+                        self._index_word(word)
+                    if positions.get(position, 0.0) < score:
+                        positions[position] = score
+                        words[word] = score
+            self._position_words.append(list(words.items()))
+        # Desempate: por nombre
+        order = sorted(range(len(self._names)), key=self._names.__getitem__)
+        self._order = [0] * len(order)
+        for rank, position in enumerate(order):
+            self._order[position] = rank
+        self._short_results = {}
+
+    def _index_word(self, word):
+        for length in range(1, len(word) + 1):
+            self._prefix_words.setdefault(word[:length], []).append(word)
+        for trigram in _trigrams(word):
+            self._trigram_words.setdefault(trigram, []).append(word)
+
+    def _match_word(self, word, candidates=None):
+        """
+        Puntuación por programa de una palabra de la consulta: {posición: puntuación}.
+        Con candidates (lo que dejaron las palabras anteriores) solo cuentan esos; las palabras
+        de una o dos letras, que coinciden con casi todo, se comprueban en cada candidato.
+        """
+        if candidates is not None:
+            if len(word) < 3:
+                return self._match_candidates(word, candidates)
+            return {position: score for position, score in self._match_word(word).items()
+                    if position in candidates}
+        matches = [(candidate, 1.0) for candidate in self._prefix_words.get(word, ())]
+        if len(word) >= 3:
+            # En medio de una palabra: palabras con todos los trigramas interiores
+            inner = [self._trigram_words.get(word[i:i + 3]) for i in range(len(word) - 2)]
+            if all(inner):
+                inner.sort(key=len)
+                found = set(inner[0]).intersection(*inner[1:])
+                matches.extend((candidate, 0.5) for candidate in found
+                               if word in candidate and not candidate.startswith(word))
+            if not matches:
+                # Erratas: palabras que comparten buena parte de los trigramas
+                trigrams = _trigrams(word)
+                hits = {}
+                for trigram in trigrams:
+                    for candidate in self._trigram_words.get(trigram, ()):
+                        hits[candidate] = hits.get(candidate, 0) + 1
+                needed = len(trigrams) * FUZZY_MIN_OVERLAP
+                matches = [(candidate, 0.5 * count / len(trigrams))
+                           for candidate, count in hits.items() if count >= needed]
+
+        scores = {}
+        for candidate, factor in matches:
+            for position, score in self._word_positions[candidate].items():
+                score *= factor
+                if scores.get(position, 0.0) < score:
+                    scores[position] = score
+        return scores
+
+    def _match_candidates(self, word, candidates):
+        scores = {}
+        for position in candidates:
+            best = 0.0
+            for candidate, score in self._position_words[position]:
+                if score > best and candidate.startswith(word):
+                    best = score
+            if best:
+                scores[position] = best
+        return scores
+
+    def search(self, query, limit=None):
+        """Posiciones de los programas que coinciden, de mejor a peor (todos si no hay consulta)"""
+        normalized = normalize(query)
+        ranked = self._short_results.get(normalized)
+        if ranked is None:
+            ranked = self._search(normalized)
+            if len(normalized) <= SHORT_QUERY:
+                self._short_results[normalized] = ranked
+        return ranked[:limit] if limit is not None else list(ranked)
+
+    def _search(self, normalized):
+        words = normalized.split()
+        if not words:
+            return list(range(len(self.programs)))
+        ranked = self._search_words(words)
+        if not ranked and len(normalized) <= SHORT_QUERY:
+            # Una o dos letras que no empiezan ninguna palabra (ni tienen trigramas): se
+            # buscan dentro de los nombres, en orden alfabético
+            ranked = [position for position, name in enumerate(self._names) if normalized in name]
+            ranked.sort(key=self._order.__getitem__)
+        return ranked
+
+    def _search_words(self, words):
+        # Primero la palabra más larga: suele ser la más selectiva
+        words.sort(key=len, reverse=True)
+        scores = None
+        for word in words:
+            matched = self._match_word(word, scores)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {position: score + matched[position]
+                          for position, score in scores.items() if position in matched}
+            if not scores:
+                return []
+        order = self._order
+        return sorted(scores, key=lambda position: (-scores[position], order[position]))
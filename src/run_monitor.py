@@ -0,0 +1,22 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class ProfileRunMonitor(QObject):
+    """
+    Reenvía al hilo de la interfaz los cambios de las ejecuciones de perfil.
+    Los oyentes de ProfileRun se llaman desde los hilos del ejecutor; las señales Qt
+    emitidas desde ahí se entregan en el hilo de este objeto (el de la interfaz).
+    """
+    program_phase = pyqtSignal(str, str, str)  # perfil, programa, fase
+    run_finished = pyqtSignal(object)  # ProfileRun
+
+    def watch(self, run):
+        run.add_listener(self._on_run_event)
+        return run
+
+    def _on_run_event(self, run, task, phase):
+        if task is None:
+            self.run_finished.emit(run)
+        else:
+            self.program_phase.emit(run.profile_name, task.name, phase)
+
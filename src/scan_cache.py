@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+
+SCAN_CACHE_FILENAME = "scan_cache.json"
+SCAN_CACHE_VERSION = 6
+SCAN_CACHE_SECTIONS = ('registry', 'folders', 'shortcuts', 'modern', 'executables')
+
+
+def default_scan_cache_path():
+    data_dir = os.path.join(os.path.expanduser("~"), "AppData", "Local", "ProgramProfileManager")
+    return os.path.join(data_dir, SCAN_CACHE_FILENAME)
+
+
+class ScanCache:
+    """
+    Caché persistente del escaneo de programas, por fuente:
+      registry: clave de desinstalación -> {'stamp': última escritura, 'program': programa o None}
+      folders:  carpeta -> {'stamp': mtime, 'programs': [...], 'subdirs': [...]}
+      shortcuts: carpeta del menú Inicio -> {'stamp': mtime, 'programs': [...], 'subdirs': [...]}
+      modern:   clave del paquete -> {'stamp': última escritura, 'programs': [...]}
+                y 'start_apps' -> {'stamp': huella, 'hash': hash del resultado, 'programs': [...]}
+                (solo con la alternativa de PowerShell)
+      executables: carpeta de instalación -> {'stamp': mtime, 'folders': [[subcarpeta, mtime]],
+                   'candidates': [[ruta, tamaño, nivel]]}
+    Una entrada solo se reutiliza si su sello coincide con el actual. path=None no persiste.
+    Se puede usar desde varios hilos de escaneo a la vez: todo acceso a data pasa por el lock.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.data = self._load()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _empty(self):
+        data = {section: {} for section in SCAN_CACHE_SECTIONS}
+        data['version'] = SCAN_CACHE_VERSION
+        return data
+
+    def _load(self):
+        empty = self._empty()
+        if not self.path or not os.path.exists(self.path):
+            return empty
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            print(f"[WARN] Caché de escaneo ilegible, se descarta: {self.path}")
+            return empty
+        if not isinstance(data, dict) or data.get('version') != SCAN_CACHE_VERSION:
+            return empty
+        for section in SCAN_CACHE_SECTIONS:
+            data.setdefault(section, {})
+        return data
+
+    def get(self, section, key, stamp):
+        """Entrada guardada si su sello coincide, o None"""
+        with self._lock:
+            entry = self.data[section].get(key)
+        if entry is not None and entry.get('stamp') == stamp:
+            return entry
+        return None
+
+    def entry(self, section, key):
+        """Entrada guardada sin comprobar su sello, o None"""
+        with self._lock:
+            return self.data[section].get(key)
+
+    def keys(self, section):
+        with self._lock:
+            return list(self.data[section])
+
+    def put(self, section, key, entry, cancel=None):
+        """
+        Guardar una entrada. Si cancel está activado (la fuente se ha cancelado o el escaneo
+        ya no la espera) se descarta: un resultado tardío no llega a la caché ya guardada.
+        """
+        with self._lock:
+            if cancel is not None and cancel.is_set():
+                return
+            self.data[section][key] = entry
+            self._dirty = True
+
+    def prune(self, section, keep):
+        """Quitar las entradas que ya no existen (claves de registro o carpetas borradas)"""
+        with self._lock:
+            stale = [key for key in self.data[section] if key not in keep]
+            for key in stale:
+                del self.data[section][key]
+            if stale:
+                self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self.data = self._empty()
+            self._dirty = True
+
+    def save(self):
+        """Guardar en disco si ha cambiado algo (escritura atómica)"""
+        if not self.path:
+            return True
+        with self._lock:
+            if not self._dirty:
+                return True
+            text = json.dumps(self.data, ensure_ascii=False)
+            self._dirty = False
+        tmp = self.path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp, self.path)
+        except (IOError, OSError) as e:
+            with self._lock:
+                self._dirty = True
+            print(f"[ERROR] No se pudo guardar la caché de escaneo: {e}")
+            return False
+        return True
@@ -0,0 +1,52 @@
+import threading
+import time
+from PyQt5.QtCore import QThread, pyqtSignal
+from .program_catalog import save_cached_programs
+
+
+class ScanWorker(QThread):
+    """
+    Escaneo de programas en un hilo de trabajo.
+    Los programas llegan por batch_ready en lotes según los encuentra cada fuente, sin
+    duplicados; al terminar, scan_finished trae la lista completa y ordenada.
+    Las señales se entregan en el hilo de la interfaz.
+    """
+    batch_ready = pyqtSignal(object)  # lista de programas
+    progress = pyqtSignal(str, int, int)  # fuente, fuentes terminadas, total
+    scan_finished = pyqtSignal(object, object, bool)  # programas, error, cancelado
+
+    def __init__(self, scanner, force=False, parent=None):
+        super().__init__(parent)
+        self.scanner = scanner
+        self.force = force
+        self.started_at = None
+        # Segundos hasta el primer lote (None si no llegó ninguno)
+        self.first_result_after = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self):
+        self.started_at = time.perf_counter()
+        try:
+            programs = self.scanner.scan_installed_programs(
+                force=self.force, on_batch=self._on_batch,
+                on_progress=lambda name, done, total: self.progress.emit(name, done, total),
+                cancel=self._cancel)
+        except Exception as e:
+            self.scan_finished.emit(None, e, False)
+            return
+        cancelled = self.scanner.last_scan_cancelled
+        if not cancelled:
+            # Un escaneo cancelado está incompleto: no sustituye al último guardado
+            save_cached_programs(programs)
+        self.scan_finished.emit(programs, None, cancelled)
+
+    def _on_batch(self, source, programs):
+        if self.first_result_after is None:
+            self.first_result_after = time.perf_counter() - self.started_at
+        self.batch_ready.emit(programs)
@@ -0,0 +1,169 @@
+"""
+Lectura de accesos directos de Windows (.lnk, formato MS-SHLLINK) en Python puro.
+
+Solo se extrae lo que necesita el escáner: destino, argumentos, carpeta de trabajo, icono y
+el AppUserModelID (de las apps empaquetadas y de las que lo fijan en su acceso directo).
+Funciona en cualquier sistema, así que se puede comprobar fuera de Windows:
+
+    python -m pytest tests/test_shell_links.py    # lee accesos directos generados
+"""
+import os
+import re
+import struct
+import uuid
+from collections import namedtuple
+
+LINK_CLSID = uuid.UUID('00021401-0000-0000-C000-000000000046').bytes_le
+HEADER_SIZE = 0x4C
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 0x1
+HAS_LINK_INFO = 0x2
+HAS_NAME = 0x4
+HAS_RELATIVE_PATH = 0x8
+HAS_WORKING_DIR = 0x10
+HAS_ARGUMENTS = 0x20
+HAS_ICON_LOCATION = 0x40
+IS_UNICODE = 0x80
+
+# Bloques de ExtraData
+ENVIRONMENT_BLOCK = 0xA0000001
+PROPERTY_STORE_BLOCK = 0xA0000009
+
+# Propiedad System.AppUserModel.ID
+APP_USER_MODEL_FMTID = uuid.UUID('9F4C2855-9F79-4B39-A8D0-E1D42DE1D5F3').bytes_le
+APP_USER_MODEL_ID_PID = 5
+VT_LPWSTR = 0x1F
+
+ShellLink = namedtuple('ShellLink', ['target', 'arguments', 'working_dir', 'icon_location',
+                                     'description', 'app_id'])
+
+
+class ShellLinkError(ValueError):
+    """El archivo no es un acceso directo válido"""
+
+
+def _expand_env(value):
+    """Expandir %VARIABLE% como lo hace Windows (las desconocidas se dejan tal cual)"""
+    return re.sub(r'%([^%]+)%', lambda m: os.environ.get(m.group(1), m.group(0)), value)
+
+
+def _c_string(data, offset, unicode=False):
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b'\0\0':
+            end += 2
+        return data[offset:end].decode('utf-16-le', errors='replace')
+    end = data.find(b'\0', offset)
+    end = len(data) if end < 0 else end
+    return data[offset:end].decode('cp1252', errors='replace')
+
+
+def _read_link_info(data, start):
+    size, header_size, flags = struct.unpack_from('<III', data, start)
+    if not flags & 0x1:  # Sin VolumeIDAndLocalBasePath (destino en red)
+        return None
+    base_offset, _, suffix_offset = struct.unpack_from('<III', data, start + 16)
+    if header_size >= 0x24:
+        base_unicode, suffix_unicode = struct.unpack_from('<II', data, start + 28)
+        base = _c_string(data, start + base_unicode, unicode=True)
+        suffix = _c_string(data, start + suffix_unicode, unicode=True) if suffix_unicode else ''
+    else:
+        base = _c_string(data, start + base_offset)
+        suffix = _c_string(data, start + suffix_offset) if suffix_offset else ''
+    return base + suffix
+
+
+def _read_property_store(data, start, end):
+    """AppUserModelID de un PropertyStoreDataBlock, o None"""
+    offset = start
+    while offset + 24 <= end:
+        storage_size, = struct.unpack_from('<I', data, offset)
+        if storage_size == 0:
+            break
+        fmtid = data[offset + 8:offset + 24]
+        value_offset = offset + 24
+        storage_end = min(offset + storage_size, end)
+        while value_offset + 4 <= storage_end:
+            value_size, = struct.unpack_from('<I', data, value_offset)
+            if value_size == 0:
+                break
+            if fmtid == APP_USER_MODEL_FMTID:
+                pid, = struct.unpack_from('<I', data, value_offset + 4)
+                value_type, = struct.unpack_from('<H', data, value_offset + 9)
+                if pid == APP_USER_MODEL_ID_PID and value_type == VT_LPWSTR:
+                    length, = struct.unpack_from('<I', data, value_offset + 13)
+                    raw = data[value_offset + 17:value_offset + 17 + length * 2]
+                    return raw.decode('utf-16-le', errors='replace').rstrip('\0')
+            value_offset += value_size
+        offset += storage_size
+    return None
+
+
+def parse_lnk(data, link_path=None):
+    """
+    Analizar el contenido de un .lnk. link_path (la ruta del propio acceso directo) permite
+    resolver destinos relativos. Lanza ShellLinkError si no es un acceso directo.
+    """
+    if len(data) < HEADER_SIZE or struct.unpack_from('<I', data, 0)[0] != HEADER_SIZE \
+            or data[4:20] != LINK_CLSID:
+        raise ShellLinkError("Cabecera de acceso directo no válida")
+    flags, = struct.unpack_from('<I', data, 20)
+    unicode = bool(flags & IS_UNICODE)
+    try:
+        offset = HEADER_SIZE
+        if flags & HAS_LINK_TARGET_ID_LIST:
+            # La lista de identificadores de shell no hace falta: se salta
+            id_list_size, = struct.unpack_from('<H', data, offset)
+            offset += 2 + id_list_size
+
+        target = None
+        if flags & HAS_LINK_INFO:
+            link_info_size, = struct.unpack_from('<I', data, offset)
+            target = _read_link_info(data, offset)
+            offset += link_info_size
+
+        strings = {}
+        for flag, key in ((HAS_NAME, 'description'), (HAS_RELATIVE_PATH, 'relative_path'),
+                          (HAS_WORKING_DIR, 'working_dir'), (HAS_ARGUMENTS, 'arguments'),
+                          (HAS_ICON_LOCATION, 'icon_location')):
+            if flags & flag:
+                count, = struct.unpack_from('<H', data, offset)
+                offset += 2
+                size = count * 2 if unicode else count
+                raw = data[offset:offset + size]
+                strings[key] = raw.decode('utf-16-le' if unicode else 'cp1252', errors='replace')
+                offset += size
+
+        app_id = None
+        env_target = None
+        while offset + 8 <= len(data):
+            block_size, signature = struct.unpack_from('<II', data, offset)
+            if block_size < 8:
+                break
+            if signature == ENVIRONMENT_BLOCK:
+                env_target = _c_string(data, offset + 8 + 260, unicode=True) or \
+                    _c_string(data, offset + 8)
+            elif signature == PROPERTY_STORE_BLOCK:
+                app_id = _read_property_store(data, offset + 8, offset + block_size) or app_id
+            offset += block_size
+    except struct.error as e:
+        raise ShellLinkError(f"Acceso directo truncado: {e}")
+
+    # Preferencia: destino con variables de entorno, ruta local, ruta relativa al acceso directo
+    if env_target:
+        target = _expand_env(env_target)
+    if not target and strings.get('relative_path') and link_path:
+        target = os.path.normpath(os.path.join(os.path.dirname(link_path), strings['relative_path']))
+    return ShellLink(target=target or None,
+                     arguments=strings.get('arguments', ''),
+                     working_dir=strings.get('working_dir', ''),
+                     icon_location=_expand_env(strings.get('icon_location', '')),
+                     description=strings.get('description', ''),
+                     app_id=app_id)
+
+
+def read_lnk(path):
+    """Leer y analizar un .lnk del disco (OSError o ShellLinkError si falla)"""
+    with open(path, 'rb') as f:
+        return parse_lnk(f.read(), link_path=path)
@@ -0,0 +1,125 @@
+"""
+Índice del menú Inicio sin PowerShell: accesos directos (.lnk) de las carpetas Programs del
+usuario y de todos los usuarios, y aplicaciones empaquetadas (las de shell:AppsFolder que no
+tienen acceso directo) a partir del registro de paquetes y su AppxManifest.xml.
+"""
+import hashlib
+import os
+import xml.etree.ElementTree as ET
+
+START_MENU_SUBPATH = r"Microsoft\Windows\Start Menu\Programs"
+
+# Paquetes instalados para el usuario: una subclave por paquete (nombre completo)
+PACKAGES_KEY = ('HKCU', r"Software\Classes\Local Settings\Software\Microsoft\Windows"
+                        r"\CurrentVersion\AppModel\Repository\Packages")
+PACKAGE_VALUES = ('PackageRootFolder',)
+
+# Alfabeto de los identificadores de editor de los nombres de familia de paquete
+_PUBLISHER_ID_ALPHABET = '0123456789abcdefghjkmnpqrstvwxyz'
+
+
+def start_menu_roots():
+    """Carpetas Programs del menú Inicio: la del usuario y la de todos los usuarios"""
+    program_data = os.environ.get('PROGRAMDATA', r'C:\ProgramData')
+    return [
+        os.path.join(os.environ.get('APPDATA', ''), START_MENU_SUBPATH),
+        os.path.join(program_data, START_MENU_SUBPATH),
+    ]
+
+
+def shortcut_program(link_path, link, is_system):
+    """
+    Programa que representa un acceso directo (ShellLink), o None.
+    Un destino .exe existente da un programa normal; si no, el AppUserModelID (apps
+    empaquetadas) da uno 'modern'. Los desinstaladores y similares se descartan.
+    """
+    name = os.path.splitext(os.path.basename(link_path))[0]
+    if is_system(name.lower()):
+        return None
+    target = link.target
+    if target and target.lower().endswith('.exe'):
+        if is_system(os.path.basename(target).lower()):
+            return None
+        if os.path.exists(target):
+            return {'name': name, 'path': target, 'source': 'shortcut'}
+    if link.app_id:
+        return {'name': name, 'path': link.app_id, 'source': 'modern'}
+    return None
+
+
+def package_family_name(name, publisher):
+    """
+    Nombre de familia de un paquete (Nombre_idEditor): el id son los 8 primeros bytes del
+    SHA-256 del editor en UTF-16 codificados en base32 (13 caracteres).
+    """
+    digest = hashlib.sha256(publisher.encode('utf-16-le')).digest()[:8]
+    bits = int.from_bytes(digest, 'big') << 1
+    publisher_id = ''.join(_PUBLISHER_ID_ALPHABET[(bits >> (60 - 5 * i)) & 0x1f] for i in range(13))
+    return f"{name}_{publisher_id}"
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element, name):
+    for child in element.iter():
+        if _local(child.tag) == name:
+            return (child.text or '').strip()
+    return ''
+
+
+def parse_appx_manifest(text):
+    """
+    Aplicaciones de un AppxManifest.xml como programas 'modern' con su AppUserModelID
+    (familia!Id) y, si el manifiesto lo indica (Executable), el nombre del proceso que se
+    ejecuta (process_name). Los marcos de trabajo y las apps ocultas de la lista
+    (AppListEntry="none") no se incluyen. Lanza ValueError si el manifiesto no es válido.
+    """
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as e:
+        raise ValueError(f"Manifiesto no válido: {e}")
+    identity = next((e for e in root.iter() if _local(e.tag) == 'Identity'), None)
+    if identity is None or not identity.get('Name') or not identity.get('Publisher'):
+        raise ValueError("Manifiesto sin identidad de paquete")
+    package_name = identity.get('Name')
+    properties = next((e for e in root if _local(e.tag) == 'Properties'), None)
+    if properties is not None and _child_text(properties, 'Framework').lower() == 'true':
+        return []
+    package_display = _child_text(properties, 'DisplayName') if properties is not None else ''
+    publisher = _child_text(properties, 'PublisherDisplayName') if properties is not None else ''
+    family = package_family_name(package_name, identity.get('Publisher'))
+
+    programs = []
+    for app in root.iter():
+        if _local(app.tag) != 'Application' or not app.get('Id'):
+            continue
+        visual = next((e for e in app.iter() if _local(e.tag) == 'VisualElements'), None)
+        if visual is not None and visual.get('AppListEntry', '').lower() == 'none':
+            continue
+        # Los nombres ms-resource: necesitan el shell para resolverse; se usa el del paquete
+        name = visual.get('DisplayName', '') if visual is not None else ''
+        if not name or name.startswith('ms-resource:'):
+            name = package_display
+        if not name or name.startswith('ms-resource:'):
+            name = package_name.split('.')[-1]
+        program = {'name': name, 'path': f"{family}!{app.get('Id')}", 'source': 'modern'}
+        if publisher and not publisher.startswith('ms-resource:'):
+            program['publisher'] = publisher
+        executable = app.get('Executable', '')
+        # '$targetnametoken$.exe' y similares solo aparecen en paquetes de desarrollo
+        if executable.lower().endswith('.exe') and '$' not in executable:
+            program['process_name'] = os.path.basename(executable.replace('\\', '/'))
+        programs.append(program)
+    return programs
+
+
+def read_package_manifest(root_folder):
+    """Programas del AppxManifest.xml de la carpeta de un paquete ([] si no hay manifiesto)"""
+    path = os.path.join(root_folder, 'AppxManifest.xml')
+    try:
+        with open(path, 'rb') as f:
+            return parse_appx_manifest(f.read())
+    except (OSError, ValueError):
+        return []
@@ -0,0 +1,279 @@
+import glob
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+
+from src.launch_executor import (PHASE_QUEUED, PHASE_STARTED, PHASE_SPAWNED, PHASE_PID_FOUND,
+                                 PHASE_HWND_FOUND, PHASE_FINISHED, PHASE_PLACED)
+
+TELEMETRY_FILENAME = "launch_telemetry.jsonl"
+
+# Duraciones que se registran por programa: nombre -> (fase inicial, fase final)
+DURATIONS = {
+    'queue_wait': (PHASE_QUEUED, PHASE_STARTED),
+    'spawn': (PHASE_STARTED, PHASE_SPAWNED),
+    'pid': (PHASE_STARTED, PHASE_PID_FOUND),
+    'window': (PHASE_STARTED, PHASE_HWND_FOUND),
+    'place': (PHASE_FINISHED, PHASE_PLACED),
+    'total': (PHASE_QUEUED, PHASE_PLACED),
+}
+
+
+def records_from_run(run):
+    """Un registro por programa de la ejecución: perfil, estrategia, duraciones y resultado"""
+    records = []
+    now = time.time()
+    for task in run.tasks:
+        durations = {}
+        for label, (start, end) in DURATIONS.items():
+            duration = task.duration(start, end)
+            if duration is not None:
+                durations[label] = round(duration, 4)
+        if 'total' not in durations:
+            duration = task.duration(PHASE_QUEUED, PHASE_FINISHED)
+            if duration is not None:
+                durations['total'] = round(duration, 4)
+        if run.cancelled and task.status != 'done':
+            outcome = 'cancelled'
+        elif PHASE_PLACED in task.timestamps:
+            outcome = 'placed'
+        elif task.details.get('failure'):
+            # Motivo concreto indicado por el lanzador (missing_exe, no_monitor, ...)
+            outcome = task.details['failure']
+        elif PHASE_HWND_FOUND in task.timestamps:
+            outcome = 'not_placed'
+        elif task.status == 'failed' and task.error is None:
+            outcome = 'timeout'
+        else:
+            outcome = task.status if task.error is None else 'error'
+        records.append({
+            'ts': round(now, 3),
+            'profile': run.profile_name,
+            'program': task.name,
+            'path': task.program_config.get('path'),
+            'strategy': task.details.get('strategy'),
+            'outcome': outcome,
+            'durations': durations,
+            'run_wall_time': round(run.wall_time, 4)
+        })
+    return records
+
+
+class TelemetryWriter:
+    """
+    Registro persistente de lanzamientos en JSONL con rotación por tamaño.
+    record()/record_run() solo encolan: la escritura la hace un hilo en segundo plano por
+    lotes, así la telemetría no añade latencia a los hilos de lanzamiento.
+    """
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backups=3, flush_interval=1.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def record(self, record):
+        self._ensure_thread()
+        self._queue.put(record)
+
+    def record_run(self, run):
+        self._ensure_thread()
+        # Se calcula en el hilo de escritura para no retrasar al que terminó la ejecución
+        self._queue.put(run)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch):
+        lines = []
+        for item in batch:
+            records = [item] if isinstance(item, dict) else records_from_run(item)
+            lines.extend(json.dumps(r, ensure_ascii=False) for r in records)
+        if not lines:
+            return
+        try:
+            self._rotate_if_needed()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except (IOError, OSError) as e:
+            print(f"[ERROR] No se pudo escribir la telemetría: {e}")
+
+    def _rotate_if_needed(self):
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+        except OSError:
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self):
+        """Escribir lo pendiente y parar el hilo de escritura"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+
+def _rotated_paths(path):
+    """Rotaciones de path (path.1, path.2, ...) de la más antigua a la más reciente"""
+    numbered = []
+    for rotated in glob.glob(f"{glob.escape(path)}.*"):
+        suffix = rotated[len(path) + 1:]
+        if suffix.isdigit():
+            numbered.append((int(suffix), rotated))
+    return [rotated for _, rotated in sorted(numbered, reverse=True)]
+
+
+def load_records(path):
+    """Leer el registro actual y sus rotaciones (más antiguas primero)"""
+    paths = _rotated_paths(path) + [path]
+    records = []
+    for p in paths:
+        if not os.path.exists(p):
+            continue
+        with open(p, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return records
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    # Percentil por rango más cercano
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_records(records):
+    """
+    Un registro por ejecución de perfil a partir de los de sus programas (comparten ts y
+    run_wall_time). La ejecución falla si falla alguno de sus programas.
+    """
+    runs = {}
+    for record in records:
+        run_key = (record.get('profile'), record.get('ts'), record.get('run_wall_time'))
+        run = runs.get(run_key)
+        if run is None:
+            run = runs[run_key] = {'profile': record.get('profile'), 'outcome': 'placed',
+                                   'durations': {'run_wall_time': record.get('run_wall_time')}}
+        if record.get('outcome') not in ('placed', 'cancelled'):
+            run['outcome'] = record.get('outcome')
+    return list(runs.values())
+
+
+def aggregate(records, key='program', metric='window'):
+    """
+    Agregar registros por 'program' (perfil + programa) o por 'profile'.
+    Devuelve {clave: {runs, failures, p50, p95, max}} sobre la duración metric.
+    Por perfil se cuenta cada ejecución una vez y se mide su duración total
+    (run_wall_time), no la suma de sus programas.
+    """
+    if key == 'profile':
+        records = run_records(records)
+        metric = 'run_wall_time'
+    groups = {}
+    for record in records:
+        if key == 'profile':
+            group = record.get('profile')
+        else:
+            group = f"{record.get('profile')} / {record.get('program')}"
+        stats = groups.setdefault(group, {'runs': 0, 'failures': 0, 'values': [], 'strategies': {}})
+        stats['runs'] += 1
+        if record.get('outcome') not in ('placed', 'cancelled'):
+            stats['failures'] += 1
+        strategy = record.get('strategy')
+        if strategy:
+            stats['strategies'][strategy] = stats['strategies'].get(strategy, 0) + 1
+        value = record.get('durations', {}).get(metric)
+        if value is not None:
+            stats['values'].append(value)
+
+    report = {}
+    for group, stats in groups.items():
+        values = stats.pop('values')
+        stats['p50'] = _percentile(values, 50)
+        stats['p95'] = _percentile(values, 95)
+        stats['max'] = max(values) if values else None
+        report[group] = stats
+    return report
+
+
+def format_report(records, metric='window'):
+    """Informe de texto con p50/p95/max por programa y por perfil"""
+    def fmt(value):
+        return f"{value:7.2f}" if value is not None else "      -"
+
+    lines = []
+    for key, title in (('program', 'Programa'), ('profile', 'Perfil')):
+        report = aggregate(records, key=key, metric=metric)
+        label = metric if key == 'program' else 'duración de la ejecución'
+        lines.append(f"{title} ({label}, segundos)")
+        lines.append(f"{'':40} {'runs':>5} {'fallos':>6} {'p50':>7} {'p95':>7} {'max':>7}")
+        ordered = sorted(report.items(), key=lambda item: -(item[1]['p95'] or 0))
+        for group, stats in ordered:
+            lines.append(f"{group[:40]:40} {stats['runs']:5} {stats['failures']:6} "
+                         f"{fmt(stats['p50'])} {fmt(stats['p95'])} {fmt(stats['max'])}")
+        lines.append("")
+    return '\n'.join(lines)
+
+
+def default_telemetry_path():
+    data_dir = os.path.join(os.path.expanduser("~"), "AppData", "Local", "ProgramProfileManager")
+    return os.path.join(data_dir, TELEMETRY_FILENAME)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else default_telemetry_path()
+    records = load_records(path)
+    if not records:
+        print(f"No hay telemetría en {path}")
+    else:
+        print(format_report(records))
@@ -0,0 +1,152 @@
+import bisect
+import functools
+import re
+from collections import namedtuple
+
+_TOKEN_SPLIT = re.compile(r'[\s\-_.]+')
+
+# Pesos de puntuación
+WEIGHT_EXACT_TOKEN = 3
+WEIGHT_PREFIX_TOKEN = 2
+WEIGHT_SUBSTRING_TOKEN = 1
+WEIGHT_PHRASE = 5
+WEIGHT_CLASS = 4
+WEIGHT_PROCESS = 4
+
+
+def tokenize(text):
+    """Separar un texto en tokens en minúsculas"""
+    return [t for t in _TOKEN_SPLIT.split(text.lower()) if t]
+
+
+# Palabra clave precompilada: se calcula una vez por keyword y se reutiliza en cada tick
+CompiledKeyword = namedtuple('CompiledKeyword', ['phrase', 'tokens', 'class_names'])
+
+# Keywords distintas que se guardan compiladas (las de los perfiles caben de sobra)
+COMPILED_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(keyword, class_names):
+    phrase = keyword.lower().strip()
+    tokens = tuple(dict.fromkeys(tokenize(phrase)))
+    return CompiledKeyword(phrase, tokens, frozenset(c.lower() for c in class_names))
+
+
+def compile_keyword(keyword, class_names=()):
+    """
+    Precompilar una keyword de título (con caché acotada por keyword y clases).
+    class_names son las clases de ventana esperadas; las vacías se ignoran.
+    """
+    return _compile(keyword, tuple(c for c in class_names if c))
+
+
+_Entry = namedtuple('_Entry', ['order', 'title', 'tokens', 'class_name', 'pid'])
+
+
+class TitleIndex:
+    """
+    Índice invertido token -> hwnd de los títulos de ventana.
+    update() recibe la enumeración actual y solo reindexa las ventanas nuevas o cuyo
+    título ha cambiado; el vocabulario se mantiene ordenado para búsquedas por prefijo.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._postings = {}
+        self._vocabulary = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def update(self, windows):
+        """Sincronizar el índice con una lista de WindowInfo (en orden de enumeración)"""
+        seen = set()
+        for order, window in enumerate(windows):
+            hwnd = window.hwnd
+            seen.add(hwnd)
+            title = (window.title or '').lower()
+            class_name = (getattr(window, 'class_name', '') or '').lower()
+            entry = self._entries.get(hwnd)
+            if entry is not None and entry.title == title:
+                if entry.order != order or entry.pid != window.pid or entry.class_name != class_name:
+                    self._entries[hwnd] = entry._replace(order=order, pid=window.pid, class_name=class_name)
+                continue
+            if entry is not None:
+                self._unindex(hwnd, entry)
+            tokens = frozenset(tokenize(title))
+            self._entries[hwnd] = _Entry(order, title, tokens, class_name, window.pid)
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    bisect.insort(self._vocabulary, token)
+                postings.add(hwnd)
+
+        for hwnd in [h for h in self._entries if h not in seen]:
+            self._unindex(hwnd, self._entries.pop(hwnd))
+
+    def _unindex(self, hwnd, entry):
+        for token in entry.tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(hwnd)
+            if not postings:
+                del self._postings[token]
+                pos = bisect.bisect_left(self._vocabulary, token)
+                if pos < len(self._vocabulary) and self._vocabulary[pos] == token:
+                    del self._vocabulary[pos]
+
+    def _prefix_tokens(self, prefix):
+        vocabulary = self._vocabulary
+        pos = bisect.bisect_left(vocabulary, prefix)
+        while pos < len(vocabulary) and vocabulary[pos].startswith(prefix):
+            yield vocabulary[pos]
+            pos += 1
+
+    def search(self, keyword, boost_pids=None):
+        """
+        Devolver los hwnd candidatos ordenados por puntuación (mejor primero).
+        Por cada token de la keyword puntúa coincidencia exacta > prefijo > subcadena;
+        la frase completa en el título y la clase/proceso esperados suman un extra.
+        La búsqueda por subcadena solo se usa si no hay coincidencias exactas ni por prefijo.
+        """
+        if not isinstance(keyword, CompiledKeyword):
+            keyword = compile_keyword(keyword)
+        if not keyword.tokens:
+            return []
+
+        scores = {}
+        for token in keyword.tokens:
+            best = {}
+            for title_token in self._prefix_tokens(token):
+                weight = WEIGHT_EXACT_TOKEN if title_token == token else WEIGHT_PREFIX_TOKEN
+                for hwnd in self._postings[title_token]:
+                    if best.get(hwnd, 0) < weight:
+                        best[hwnd] = weight
+            for hwnd, weight in best.items():
+                scores[hwnd] = scores.get(hwnd, 0) + weight
+
+        if not scores:
+            for token in keyword.tokens:
+                for title_token, postings in self._postings.items():
+                    if token in title_token:
+                        for hwnd in postings:
+                            scores[hwnd] = scores.get(hwnd, 0) + WEIGHT_SUBSTRING_TOKEN
+
+        ranked = []
+        for hwnd, score in scores.items():
+            entry = self._entries[hwnd]
+            if keyword.phrase and keyword.phrase in entry.title:
+                score += WEIGHT_PHRASE
+            if keyword.class_names and entry.class_name in keyword.class_names:
+                score += WEIGHT_CLASS
+            if boost_pids and entry.pid in boost_pids:
+                score += WEIGHT_PROCESS
+            # A igual puntuación, gana el título más ajustado a la keyword y luego el orden Z
+            extra_tokens = len(entry.tokens) - len(keyword.tokens)
+            ranked.append((-score, extra_tokens, entry.order, hwnd))
+
+        ranked.sort()
+        return [hwnd for _, _, _, hwnd in ranked]
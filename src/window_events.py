@@ -0,0 +1,238 @@
+import sys
+import threading
+
+# Eventos de WinEvent que indican que puede haber aparecido la ventana esperada
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_NAMECHANGE = 0x800C
+
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+WM_QUIT = 0x0012
+
+
+class PollingEventSource:
+    """
+    Fuente de eventos de respaldo: despierta a los lanzamientos cada intervalo,
+    igual que el antiguo bucle con time.sleep(0.05).
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, notify):
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(self.interval):
+                notify(None, None)
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+class Win32WinEventSource:
+    """
+    Fuente de eventos real basada en SetWinEventHook.
+    Los hooks fuera de contexto necesitan un bucle de mensajes, así que viven en su propio hilo.
+    Si el hilo no instala los hooks en start_timeout segundos, start() falla (y el hub pasa
+    al sondeo); el hilo abandonado quita sus hooks y termina en cuanto arranque.
+    """
+
+    EVENTS = (EVENT_OBJECT_CREATE, EVENT_OBJECT_SHOW, EVENT_OBJECT_NAMECHANGE)
+
+    def __init__(self, start_timeout=1.0):
+        self.start_timeout = start_timeout
+        self._thread = None
+        self._thread_id = None
+        self._lock = threading.Lock()
+        self._error = None
+
+    def start(self, notify):
+        ready = threading.Event()
+        abandoned = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(notify, ready, abandoned), daemon=True)
+        self._thread.start()
+        ready.wait(self.start_timeout)
+        with self._lock:
+            if not ready.is_set():
+                abandoned.set()
+        if abandoned.is_set():
+            self._thread = None
+            raise OSError(f"Los hooks de WinEvent no se instalaron en {self.start_timeout} s")
+        if self._error:
+            self._thread.join()
+            self._thread = None
+            raise OSError(self._error)
+
+    def _run(self, notify, ready, abandoned):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+            wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+        ]
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+
+        def callback(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+            # Solo interesan las ventanas en sí, no sus elementos internos
+            if hwnd and id_object == OBJID_WINDOW and id_child == CHILDID_SELF:
+                notify(hwnd, event)
+
+        # Mantener la referencia mientras dure el bucle para que el GC no libere el callback
+        proc = WinEventProc(callback)
+
+        hooks = []
+        error = None
+        for event in self.EVENTS:
+            hook = user32.SetWinEventHook(
+                event, event, None, proc, 0, 0,
+                WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+            )
+            if not hook:
+                error = f"SetWinEventHook falló para el evento {hex(event)}"
+                break
+            hooks.append(hook)
+
+        # Un start() que ya ha dejado de esperar no debe ver el estado de este hilo
+        with self._lock:
+            if not abandoned.is_set():
+                self._error = error
+                self._thread_id = kernel32.GetCurrentThreadId()
+                ready.set()
+        if error or abandoned.is_set():
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
+            return
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        for hook in hooks:
+            user32.UnhookWinEvent(hook)
+
+    def stop(self):
+        if self._thread:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join()
+            self._thread = None
+
+
+def create_default_event_source():
+    """WinEvent en Windows, sondeo en el resto de plataformas"""
+    if sys.platform == 'win32':
+        return Win32WinEventSource()
+    return PollingEventSource()
+
+
+class WindowEventHub:
+    """
+    Punto de espera compartido para los lanzamientos.
+    Cada evento de ventana incrementa una generación y despierta a todos los que esperan.
+    La fuente solo está activa mientras haya algún lanzamiento suscrito; si no se puede
+    arrancar, se vuelve al sondeo.
+    max_wait limita cada espera para revisar periódicamente aunque no lleguen eventos.
+    """
+
+    def __init__(self, source=None, max_wait=0.5):
+        self.source = source if source is not None else create_default_event_source()
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        # Lock separado para arrancar/parar la fuente: su hilo puede estar bloqueado en _notify
+        self._lifecycle = threading.Lock()
+        self._generation = 0
+        self._subscribers = 0
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def _notify(self, hwnd, event):
+        with self._cond:
+            self._generation += 1
+            self._cond.notify_all()
+
+    def acquire(self):
+        with self._lifecycle:
+            self._subscribers += 1
+            if self._subscribers > 1:
+                return
+            try:
+                self.source.start(self._notify)
+            except Exception as e:
+                print(f"[WARN] No se pudo iniciar la fuente de eventos de ventana ({e}), usando sondeo")
+                self.source = PollingEventSource()
+                self.source.start(self._notify)
+
+    def release(self):
+        with self._lifecycle:
+            self._subscribers -= 1
+            if self._subscribers == 0:
+                self.source.stop()
+
+    def subscribe(self):
+        return _Subscription(self)
+
+    def wait(self, generation, timeout=None):
+        """Esperar a que llegue un evento posterior a generation y devolver la generación actual"""
+        if timeout is None:
+            timeout = self.max_wait
+        with self._cond:
+            self._cond.wait_for(lambda: self._generation != generation, min(timeout, self.max_wait))
+            return self._generation
+
+
+class _Subscription:
+    def __init__(self, hub):
+        self.hub = hub
+
+    def __enter__(self):
+        self.hub.acquire()
+        return self.hub
+
+    def __exit__(self, exc_type, exc, tb):
+        self.hub.release()
+        return False
+
+
+_shared_hub = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_event_hub():
+    """Hub de eventos compartido por todos los lanzamientos pendientes"""
+    global _shared_hub
+    with _shared_lock:
+        if _shared_hub is None:
+            _shared_hub = WindowEventHub()
+        return _shared_hub
+
+
+def set_shared_event_hub(hub):
+    """Sustituir el hub compartido (por ejemplo, con una fuente guionizada)"""
+    global _shared_hub
+    with _shared_lock:
+        _shared_hub = hub
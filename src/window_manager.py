@@ -1,158 +1,230 @@
 import subprocess
 import time
-import win32gui
-import win32process
-import psutil
 import os
-import win32con
-from screeninfo import get_monitors
-import re
-
-def find_existing_pid(process_name):
-    for proc in psutil.process_iter(['pid', 'name', 'exe']):
-        try:
-            if proc.info['name'] and process_name.lower() in proc.info['name'].lower():
-                return proc.info['pid']
-        except Exception:
-            pass
-    return None
+from collections import namedtuple
+from src.window_snapshot import get_shared_snapshot
+from src.process_table import get_shared_process_table
+from src.window_events import get_shared_event_hub
+from src.window_placement import Placement, PlacementBatch
+from src.monitor_topology import get_shared_topology
+from src.launch_executor import PHASE_SPAWNED, PHASE_PID_FOUND, PHASE_HWND_FOUND
+
+def find_existing_pid(process_name, substring=False):
+    """
+    Buscar el PID de un proceso en la tabla de procesos compartida.
+    Por defecto compara el nombre exacto del ejecutable (o la ruta completa si se pasa una);
+    substring=True mantiene la comparación antigua por subcadena.
+    Sin process_name (app empaquetada de proceso desconocido) devuelve None.
+    """
+    if not process_name:
+        return None
+    table = get_shared_process_table()
+    table.refresh()
+    return table.find_pid(process_name, substring=substring)
 
 def find_hwnd_by_pid(pid):
-    hwnds = []
-    def callback(hwnd, hwnds_list):
-        if win32gui.IsWindowVisible(hwnd):
-            try:
-                _, win_pid = win32process.GetWindowThreadProcessId(hwnd)
-                if win_pid == pid:
-                    hwnds_list.append(hwnd)
-            except Exception:
-                pass
-        return True
-    win32gui.EnumWindows(callback, hwnds)
-    return hwnds
+    snapshot = get_shared_snapshot()
+    snapshot.refresh()
+    return snapshot.find_by_pid(pid)
 
 def find_hwnd_by_title(keyword):
-    keyword = keyword.lower()
-    words = [w for w in re.split(r'[\s\-_.]+', keyword) if w]
-    hwnds = []
-    scores = []
-
-    def callback(hwnd, hwnds_list):
-        if win32gui.IsWindowVisible(hwnd):
-            title = win32gui.GetWindowText(hwnd).lower()
-            # Coincidencia exacta
-            if keyword in title:
-                hwnds_list.append((hwnd, title, len(words)))
-            else:
-                # Coincidencia parcial: cuenta cuántas palabras de la keyword están en el título
-                match_count = sum(1 for w in words if w in title)
-                if match_count > 0:
-                    hwnds_list.append((hwnd, title, match_count))
-        return True
-
-
-    win32gui.EnumWindows(callback, hwnds)
-    if not hwnds:
-        return []
-    # Ordena por número de palabras coincidentes (mayor primero)
-    hwnds.sort(key=lambda x: x[2], reverse=True)
-    # Devuelve solo los hwnd (puedes devolver el título si quieres)
-    return [hwnd for hwnd, title, score in hwnds]
-
-# ...el resto de tu código igual...
-
-# En launch_program_and_get_hwnd, la llamada a find_hwnd_by_title ya usará la nueva lógica.
-
-def launch_program_and_get_hwnd(exe_path, real_process_name=None, timeout=10, fallback_title=None):
+    snapshot = get_shared_snapshot()
+    snapshot.refresh()
+    return snapshot.find_by_title(keyword)
+
+# Estrategias con las que se puede localizar la ventana de un programa
+STRATEGY_EXISTING = 'existing'
+STRATEGY_PID_TREE = 'pid_tree'
+STRATEGY_PROCESS_NAME = 'process_name'
+STRATEGY_TITLE = 'title'
+
+# Resultado de un lanzamiento: hwnd encontrado, PID dueño de la ventana y estrategia que acertó
+LaunchResult = namedtuple('LaunchResult', ['hwnd', 'pid', 'strategy'])
+
+def launch_program(exe_path, real_process_name=None, timeout=10, fallback_title=None, substring_match=False, skip_strategies=(), cancel_event=None, on_phase=None, packaged=False):
     """
-    Lanza un ejecutable y devuelve el HWND de la ventana principal.
+    Lanza un ejecutable y devuelve un LaunchResult con el HWND de la ventana principal.
     Si ya está abierto, devuelve el hwnd de la ventana existente.
-    Si no encuentra por PID, busca por palabra clave en el título de la ventana.
+    Tras lanzar, busca primero en el árbol de procesos del PID lanzado (lanzadores que
+    arrancan un hijo, como Update.exe de Discord o las apps Electron), después por nombre
+    de proceso y por último por palabra clave en el título de la ventana.
+    skip_strategies permite saltarse estrategias que no acertaron en ejecuciones anteriores;
+    solo se vuelven a probar pasada la mitad del timeout.
+    fallback_title puede ser una CompiledKeyword ya compilada (planes de ejecución).
+    Si cancel_event se activa, se deja de esperar la ventana (el proceso lanzado sigue abierto).
+    packaged=True indica que exe_path es el AppUserModelID de una app empaquetada: se abre
+    con shell:AppsFolder y la ventana se busca por real_process_name (el Executable del
+    manifiesto) o, si no se conoce, solo por título (también para ver si ya está abierta).
+    on_phase(fase) se llama al lanzar el proceso (spawned), al identificar su PID real
+    (pid_found) y al encontrar la ventana (hwnd_found).
     """
-    process_name = real_process_name if real_process_name else os.path.basename(exe_path)
+    if on_phase is None:
+        on_phase = lambda phase: None
+    if real_process_name:
+        process_name = real_process_name
+    elif packaged:
+        # El AppUserModelID no es el nombre de ningún proceso: solo se busca por título
+        process_name = None
+    else:
+        process_name = os.path.basename(exe_path)
+    keyword = fallback_title if fallback_title else os.path.splitext(os.path.basename(exe_path))[0]
+    table = get_shared_process_table()
 
     # 1. Buscar si ya está abierto
-    existing_pid = find_existing_pid(process_name)
+    if process_name is None:
+        hwnds = find_hwnd_by_title(keyword)
+        if hwnds:
+            print(f"Ya está abierto (por título): {exe_path}, HWND(s): {hwnds}")
+            on_phase(PHASE_HWND_FOUND)
+            return LaunchResult(hwnds[0], None, STRATEGY_EXISTING)
+    existing_pid = find_existing_pid(process_name, substring=substring_match)
     if existing_pid:
         print(f"Ya está abierto: {process_name} (PID: {existing_pid})")
+        on_phase(PHASE_PID_FOUND)
         hwnds = find_hwnd_by_pid(existing_pid)
         if hwnds:
             print(f"HWND(s) encontrados: {hwnds}")
-            return hwnds[0]
-        keyword = fallback_title if fallback_title else os.path.splitext(os.path.basename(exe_path))[0]
+            on_phase(PHASE_HWND_FOUND)
+            return LaunchResult(hwnds[0], existing_pid, STRATEGY_EXISTING)
         hwnds = find_hwnd_by_title(keyword)
         if hwnds:
             print(f"HWND(s) encontrados por título: {hwnds}")
-            return hwnds[0]
+            on_phase(PHASE_HWND_FOUND)
+            return LaunchResult(hwnds[0], existing_pid, STRATEGY_EXISTING)
         print("No se encontró la ventana principal ni por PID ni por título.")
-        return None
+        return LaunchResult(None, existing_pid, None)
+
+    if cancel_event is not None and cancel_event.is_set():
+        return LaunchResult(None, None, None)
 
-    # 2. Lanzar el ejecutable
-    proc = subprocess.Popen([exe_path])
+    # 2. Lanzar el ejecutable (conservando el PID para seguir a sus hijos)
+    if packaged:
+        # La app la arranca el shell, no explorer.exe: su árbol de procesos no sirve
+        proc = subprocess.Popen(['explorer.exe', 'shell:AppsFolder\\' + exe_path])
+    else:
+        proc = subprocess.Popen([exe_path])
     print(f"Lanzado: {exe_path} (PID launcher: {proc.pid})")
+    on_phase(PHASE_SPAWNED)
 
     # 3. Esperar a que el proceso real aparezca y su ventana esté lista (máximo timeout segundos)
     start_time = time.time()
-    target_pid = None
-    hwnd = None
-    keyword = fallback_title if fallback_title else os.path.splitext(os.path.basename(exe_path))[0]
+    snapshot = get_shared_snapshot()
+    hub = get_shared_event_hub()
+    skip_strategies = set(skip_strategies)
 
-    while time.time() - start_time < timeout:
-        # Buscar PID real
-        pid = find_existing_pid(process_name)
-        if pid:
-            target_pid = pid
-            # Buscar ventana por PID
-            hwnds = find_hwnd_by_pid(target_pid)
-            if hwnds:
-                print(f"HWND(s) encontrados: {hwnds}")
-                hwnd = hwnds[0]
-                break
-        # Si no se encuentra por PID, buscar por título
-        hwnds = find_hwnd_by_title(keyword)
-        if hwnds:
-            print(f"HWND(s) encontrados por título: {hwnds}")
-            hwnd = hwnds[0]
-            break
-        time.sleep(0.05)  # Muy reactivo, revisa cada 50ms
+    with hub.subscribe():
+        generation = hub.generation
+        while True:
+            # Una sola enumeración de ventanas por tick o por evento, compartida con el resto de lanzamientos
+            refreshed = snapshot.refresh(generation=generation)
+            table.refresh()
+            if refreshed:
+                # Los dueños de las ventanas nuevas pueden haber nacido después del último tick de la tabla
+                table.refresh_pids(snapshot.pids())
+            elapsed = time.time() - start_time
+            if skip_strategies and elapsed > timeout / 2:
+                skip_strategies = set()
 
-    if hwnd:
-        return hwnd
+            tree = table.descendants(proc.pid)
+            named_pid = table.find_pid(process_name, substring=substring_match) if process_name else None
+            if named_pid or len(tree) > 1:
+                on_phase(PHASE_PID_FOUND)
+
+            # Árbol de procesos del lanzador
+            if STRATEGY_PID_TREE not in skip_strategies:
+                for pid in sorted(tree):
+                    hwnds = snapshot.find_by_pid(pid)
+                    if hwnds:
+                        print(f"HWND(s) encontrados en el árbol del PID {proc.pid}: {hwnds}")
+                        on_phase(PHASE_PID_FOUND)
+                        on_phase(PHASE_HWND_FOUND)
+                        return LaunchResult(hwnds[0], pid, STRATEGY_PID_TREE)
+
+            # Buscar PID real por nombre de proceso
+            if STRATEGY_PROCESS_NAME not in skip_strategies and named_pid:
+                hwnds = snapshot.find_by_pid(named_pid)
+                if hwnds:
+                    print(f"HWND(s) encontrados: {hwnds}")
+                    on_phase(PHASE_HWND_FOUND)
+                    return LaunchResult(hwnds[0], named_pid, STRATEGY_PROCESS_NAME)
+
+            # Si no se encuentra por PID, buscar por título (favoreciendo ventanas del proceso esperado)
+            if STRATEGY_TITLE not in skip_strategies:
+                hwnds = snapshot.find_by_title(
+                    keyword, boost_pids=(table.pids_by_name(process_name) if process_name else set()) | tree
+                )
+                if hwnds:
+                    print(f"HWND(s) encontrados por título: {hwnds}")
+                    on_phase(PHASE_HWND_FOUND)
+                    return LaunchResult(hwnds[0], None, STRATEGY_TITLE)
+
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                break
+            if cancel_event is not None and cancel_event.is_set():
+                print(f"Lanzamiento cancelado: {exe_path}")
+                return LaunchResult(None, None, None)
+            # Dormir hasta que aparezca o cambie alguna ventana (o venza la espera máxima)
+            generation = hub.wait(generation, remaining)
 
     print("No se encontró la ventana principal ni por PID ni por título.")
-    return None
+    return LaunchResult(None, None, None)
 
-def move_window_to_monitor(hwnd, monitor_index=0, width=None, height=None, x_offset=0, y_offset=0, maximize=False, minimize=False):
+def launch_program_and_get_hwnd(exe_path, real_process_name=None, timeout=10, fallback_title=None, substring_match=False):
     """
-    Mueve y redimensiona una ventana dada su HWND al monitor especificado.
+    Lanza un ejecutable y devuelve el HWND de la ventana principal (o None).
+    Ver launch_program para el detalle de la búsqueda.
     """
-    monitors = get_monitors()
-    print("Monitores detectados:")
-    for i, m in enumerate(monitors):
-        print(f"{i}: ({m.x},{m.y}) {m.width}x{m.height}")
-    if monitor_index >= len(monitors):
-        print(f"Monitor {monitor_index} no encontrado. Hay {len(monitors)} monitores.")
-        return
+    return launch_program(
+        exe_path,
+        real_process_name=real_process_name,
+        timeout=timeout,
+        fallback_title=fallback_title,
+        substring_match=substring_match
+    ).hwnd
+
+def plan_window_placement(hwnd, monitor_index=0, width=None, height=None, x_offset=0, y_offset=0, maximize=False, minimize=False):
+    """
+    Calcula la colocación absoluta de una ventana en el monitor especificado.
+    Devuelve un Placement o None si el monitor no existe.
+    """
+    topology = get_shared_topology()
+    m = topology.rect(monitor_index)
+    if m is None:
+        print(f"Monitor {monitor_index} no encontrado. Hay {len(topology.monitors())} monitores.")
+        return None
 
-    m = monitors[monitor_index]
     x = m.x + x_offset
     y = m.y + y_offset
     w = width if width else m.width
     h = height if height else m.height
+    return Placement(hwnd, x, y, w, h, maximize, minimize)
 
-    # Siempre restaurar primero, mover y luego maximizar/minimizar si corresponde
-    win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-    time.sleep(0.05)
-    win32gui.SetWindowPos(hwnd, win32con.HWND_TOP, x, y, w, h, 0)
-    print(f"Ventana movida a monitor {monitor_index} en ({x},{y}) tamaño {w}x{h}")
+def move_window_to_monitor(hwnd, monitor_index=0, width=None, height=None, x_offset=0, y_offset=0, maximize=False, minimize=False):
+    """
+    Mueve y redimensiona una ventana dada su HWND al monitor especificado.
+    Para colocar varias ventanas a la vez usa PlacementBatch con plan_window_placement.
+    """
+    placement = plan_window_placement(
+        hwnd,
+        monitor_index=monitor_index,
+        width=width,
+        height=height,
+        x_offset=x_offset,
+        y_offset=y_offset,
+        maximize=maximize,
+        minimize=minimize
+    )
+    if placement is None:
+        return
 
-    if maximize:
-        time.sleep(0.05)
-        win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
-        print(f"Ventana maximizada en monitor {monitor_index}")
-    elif minimize:
-        win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
-        print(f"Ventana minimizada en monitor {monitor_index}")
+    batch = PlacementBatch()
+    batch.add(placement)
+    result = batch.apply()[0]
+    if result.ok:
+        print(f"Ventana movida a monitor {monitor_index} en ({placement.x},{placement.y}) tamaño {placement.width}x{placement.height}")
+    else:
+        print(f"No se pudo colocar la ventana {hwnd}: {result.error}")
 
 def launch_and_place_window(
     exe_path,
@@ -165,7 +237,8 @@ def launch_and_place_window(
     minimize=False,
     real_process_name=None,
     timeout=10,
-    fallback_title=None
+    fallback_title=None,
+    substring_match=False
 ):
     """
     Lanza un programa y lo coloca en el monitor y posición/tamaño deseados.
@@ -174,7 +247,8 @@ def launch_and_place_window(
         exe_path,
         real_process_name=real_process_name,
         timeout=timeout,
-        fallback_title=fallback_title
+        fallback_title=fallback_title,
+        substring_match=substring_match
     )
     if hwnd:
         move_window_to_monitor(
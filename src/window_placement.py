@@ -0,0 +1,160 @@
+import threading
+from collections import namedtuple
+
+# Posición final deseada de una ventana (coordenadas absolutas de escritorio)
+Placement = namedtuple('Placement', ['hwnd', 'x', 'y', 'width', 'height', 'maximize', 'minimize'])
+
+# Resultado de colocar una ventana: ok=False lleva el motivo en error
+PlacementResult = namedtuple('PlacementResult', ['hwnd', 'ok', 'error'])
+
+
+class Win32PlacementBackend:
+    """Backend real: BeginDeferWindowPos/DeferWindowPos/EndDeferWindowPos vía user32"""
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        import win32con
+        import win32gui
+
+        self._ctypes = ctypes
+        self._win32con = win32con
+        self._win32gui = win32gui
+        self._user32 = ctypes.windll.user32
+        self._user32.BeginDeferWindowPos.restype = wintypes.HANDLE
+        self._user32.BeginDeferWindowPos.argtypes = [ctypes.c_int]
+        self._user32.DeferWindowPos.restype = wintypes.HANDLE
+        self._user32.DeferWindowPos.argtypes = [
+            wintypes.HANDLE, wintypes.HWND, wintypes.HWND,
+            ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.UINT
+        ]
+        self._user32.EndDeferWindowPos.restype = wintypes.BOOL
+        self._user32.EndDeferWindowPos.argtypes = [wintypes.HANDLE]
+
+    def is_window(self, hwnd):
+        return bool(self._win32gui.IsWindow(hwnd))
+
+    def needs_restore(self, hwnd):
+        return bool(self._win32gui.IsIconic(hwnd) or self._win32gui.IsZoomed(hwnd))
+
+    def restore(self, hwnd):
+        self._win32gui.ShowWindow(hwnd, self._win32con.SW_RESTORE)
+
+    def begin(self, count):
+        handle = self._user32.BeginDeferWindowPos(count)
+        if not handle:
+            raise OSError("BeginDeferWindowPos falló")
+        return handle
+
+    def defer(self, handle, placement):
+        handle = self._user32.DeferWindowPos(
+            handle, placement.hwnd, self._win32con.HWND_TOP,
+            placement.x, placement.y, placement.width, placement.height,
+            self._win32con.SWP_NOACTIVATE
+        )
+        if not handle:
+            raise OSError(f"DeferWindowPos falló para {placement.hwnd}")
+        return handle
+
+    def end(self, handle):
+        if not self._user32.EndDeferWindowPos(handle):
+            raise OSError("EndDeferWindowPos falló")
+
+    def set_window_pos(self, placement):
+        self._win32gui.SetWindowPos(
+            placement.hwnd, self._win32con.HWND_TOP,
+            placement.x, placement.y, placement.width, placement.height, 0
+        )
+
+    def maximize(self, hwnd):
+        self._win32gui.ShowWindow(hwnd, self._win32con.SW_MAXIMIZE)
+
+    def minimize(self, hwnd):
+        self._win32gui.ShowWindow(hwnd, self._win32con.SW_MINIMIZE)
+
+
+class PlacementBatch:
+    """
+    Colocación por lotes de las ventanas de una ejecución de perfil.
+    Todas las ventanas se mueven en una sola transacción DeferWindowPos (un único redibujado)
+    y después se maximizan/minimizan las que lo requieran.
+    Si la transacción falla, se recurre a SetWindowPos ventana por ventana.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._placements = []
+        self._lock = threading.Lock()
+
+    def add(self, placement):
+        with self._lock:
+            self._placements.append(placement)
+
+    def __len__(self):
+        return len(self._placements)
+
+    def apply(self):
+        """Aplicar todas las colocaciones y devolver un PlacementResult por ventana, en orden"""
+        with self._lock:
+            placements = list(self._placements)
+            self._placements = []
+        if not placements:
+            return []
+
+        backend = self.backend if self.backend is not None else Win32PlacementBackend()
+        results = {}
+
+        valid = []
+        seen = set()
+        # Si dos programas resolvieron la misma ventana, gana la última colocación
+        for placement in reversed(placements):
+            if placement.hwnd in seen:
+                continue
+            seen.add(placement.hwnd)
+            try:
+                if backend.is_window(placement.hwnd):
+                    valid.append(placement)
+                else:
+                    results[placement.hwnd] = PlacementResult(placement.hwnd, False, "La ventana ya no existe")
+            except Exception as e:
+                results[placement.hwnd] = PlacementResult(placement.hwnd, False, str(e))
+        valid.reverse()
+
+        # SetWindowPos no tiene efecto sobre ventanas minimizadas o maximizadas
+        for placement in valid:
+            try:
+                if backend.needs_restore(placement.hwnd):
+                    backend.restore(placement.hwnd)
+            except Exception:
+                pass
+
+        if valid:
+            try:
+                handle = backend.begin(len(valid))
+                for placement in valid:
+                    handle = backend.defer(handle, placement)
+                backend.end(handle)
+                for placement in valid:
+                    results[placement.hwnd] = PlacementResult(placement.hwnd, True, None)
+            except Exception as e:
+                # Un fallo en DeferWindowPos invalida toda la transacción
+                print(f"[WARN] Colocación por lotes fallida ({e}), colocando ventana por ventana")
+                for placement in valid:
+                    try:
+                        backend.set_window_pos(placement)
+                        results[placement.hwnd] = PlacementResult(placement.hwnd, True, None)
+                    except Exception as single_error:
+                        results[placement.hwnd] = PlacementResult(placement.hwnd, False, str(single_error))
+
+        for placement in valid:
+            if not results[placement.hwnd].ok:
+                continue
+            try:
+                if placement.maximize:
+                    backend.maximize(placement.hwnd)
+                elif placement.minimize:
+                    backend.minimize(placement.hwnd)
+            except Exception as e:
+                results[placement.hwnd] = PlacementResult(placement.hwnd, False, str(e))
+
+        return [results[placement.hwnd] for placement in placements]
@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import namedtuple
+from src.title_matcher import TitleIndex, CompiledKeyword, compile_keyword
+
+# Estados de una ventana de nivel superior
+STATE_NORMAL = 'normal'
+STATE_MAXIMIZED = 'maximized'
+STATE_MINIMIZED = 'minimized'
+
+# Información mínima de una ventana visible de nivel superior.
+# rect es (x, y, ancho, alto) en coordenadas absolutas de escritorio, o None si no se conoce.
+# owner es el HWND de la ventana dueña (diálogos, paletas) o None; tool_window indica
+# WS_EX_TOOLWINDOW y cloaked que DWM la oculta (apps suspendidas, otros escritorios virtuales).
+WindowInfo = namedtuple('WindowInfo', ['hwnd', 'pid', 'title', 'class_name', 'rect', 'state',
+                                       'owner', 'tool_window', 'cloaked'],
+                        defaults=('', None, STATE_NORMAL, None, False, False))
+
+GW_OWNER = 4
+GWL_EXSTYLE = -20
+WS_EX_TOOLWINDOW = 0x00000080
+DWMWA_CLOAKED = 14
+
+
+class Win32WindowSource:
+    """Fuente real de ventanas: una única llamada a EnumWindows por enumeración"""
+
+    def _is_cloaked(self, hwnd):
+        import ctypes
+        from ctypes import wintypes
+        cloaked = wintypes.DWORD()
+        result = ctypes.windll.dwmapi.DwmGetWindowAttribute(
+            wintypes.HWND(hwnd), DWMWA_CLOAKED, ctypes.byref(cloaked), ctypes.sizeof(cloaked))
+        return result == 0 and cloaked.value != 0
+
+    def enum_windows(self):
+        import win32gui
+        import win32process
+
+        windows = []
+
+        def callback(hwnd, _):
+            if win32gui.IsWindowVisible(hwnd):
+                try:
+                    _, pid = win32process.GetWindowThreadProcessId(hwnd)
+                except Exception:
+                    pid = None
+                try:
+                    left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+                    rect = (left, top, right - left, bottom - top)
+                except Exception:
+                    rect = None
+                if win32gui.IsIconic(hwnd):
+                    state = STATE_MINIMIZED
+                elif win32gui.IsZoomed(hwnd):
+                    state = STATE_MAXIMIZED
+                else:
+                    state = STATE_NORMAL
+                try:
+                    owner = win32gui.GetWindow(hwnd, GW_OWNER) or None
+                    tool_window = bool(win32gui.GetWindowLong(hwnd, GWL_EXSTYLE) & WS_EX_TOOLWINDOW)
+                    cloaked = self._is_cloaked(hwnd)
+                except Exception:
+                    owner, tool_window, cloaked = None, False, False
+                windows.append(WindowInfo(hwnd, pid, win32gui.GetWindowText(hwnd),
+                                          win32gui.GetClassName(hwnd), rect, state,
+                                          owner, tool_window, cloaked))
+            return True
+
+        win32gui.EnumWindows(callback, None)
+        return windows
+
+
+class WindowSnapshot:
+    """
+    Instantánea compartida del escritorio.
+    Se enumeran las ventanas como mucho una vez por tick, sin importar cuántos
+    lanzamientos estén esperando, y se indexan por PID y por tokens del título
+    (TitleIndex, actualizado incrementalmente entre ticks).
+    """
+
+    def __init__(self, source=None, tick=0.05):
+        self.source = source if source is not None else Win32WindowSource()
+        self.tick = tick
+        self._lock = threading.Lock()
+        self._taken_at = None
+        self._generation = None
+        self._windows = []
+        self._by_pid = {}
+        self._title_index = TitleIndex()
+
+    def refresh(self, force=False, generation=None):
+        """
+        Tomar una nueva instantánea si la actual tiene más de un tick.
+        generation es la generación de eventos de ventana que ha despertado al llamador:
+        si es más reciente que la de la instantánea, se vuelve a enumerar en cuanto acabe
+        el tick actual, así una ráfaga de eventos sigue costando como mucho una enumeración
+        por tick (y una sola por generación, aunque la pidan varios hilos).
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = 0
+                if not force and self._taken_at is not None:
+                    age = now - self._taken_at
+                    newer_event = generation is not None and (
+                        self._generation is None or generation > self._generation)
+                    if age < self.tick:
+                        if not newer_event:
+                            return False
+                        delay = self.tick - age
+                if not delay:
+                    self._take(now, generation)
+                    return True
+            # Fuera del lock: otro hilo puede enumerar mientras tanto y cubrir este evento
+            time.sleep(delay)
+
+    def _take(self, now, generation):
+        windows = self.source.enum_windows()
+        by_pid = {}
+        for window in windows:
+            by_pid.setdefault(window.pid, []).append(window.hwnd)
+        self._title_index.update(windows)
+
+        self._windows = windows
+        self._by_pid = by_pid
+        self._taken_at = now
+        if generation is not None and (self._generation is None or generation > self._generation):
+            self._generation = generation
+
+    def windows(self):
+        return list(self._windows)
+
+    def pids(self):
+        """PIDs con alguna ventana visible en la instantánea"""
+        return list(self._by_pid)
+
+    def find_by_pid(self, pid):
+        """Devolver los HWND visibles del proceso indicado"""
+        return list(self._by_pid.get(pid, ()))
+
+    def find_by_pids(self, pids):
+        """Devolver los HWND visibles de cualquiera de los procesos indicados"""
+        by_pid = self._by_pid
+        hwnds = []
+        for pid in pids:
+            hwnds.extend(by_pid.get(pid, ()))
+        return hwnds
+
+    def find_by_title(self, keyword, boost_pids=None, class_names=()):
+        """
+        Buscar ventanas por palabra clave en el título, mejor candidata primero.
+        boost_pids y class_names favorecen las ventanas del proceso o clase esperados.
+        keyword puede ser una CompiledKeyword ya compilada (p. ej. de un plan de ejecución).
+        """
+        if isinstance(keyword, CompiledKeyword):
+            compiled = keyword
+        else:
+            compiled = compile_keyword(keyword, class_names)
+        with self._lock:
+            return self._title_index.search(compiled, boost_pids=boost_pids)
+
+
+_shared_snapshot = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_snapshot():
+    """Instantánea compartida por todos los lanzamientos pendientes"""
+    global _shared_snapshot
+    with _shared_lock:
+        if _shared_snapshot is None:
+            _shared_snapshot = WindowSnapshot()
+        return _shared_snapshot
+
+
+def set_shared_snapshot(snapshot):
+    """Sustituir la instantánea compartida (por ejemplo, con una fuente falsa)"""
+    global _shared_snapshot
+    with _shared_lock:
+        _shared_snapshot = snapshot
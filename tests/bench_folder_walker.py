@@ -0,0 +1,50 @@
+"""
+Recorrido de carpetas de instalación: FolderWalker (os.scandir) frente al recorrido
+anterior con os.listdir en un árbol de 100k archivos.
+
+    python -m tests.bench_folder_walker
+"""
+import tempfile
+import time
+
+from src.folder_walker import FolderWalker
+from src.program_scanner import ProgramScanner
+from src.scan_cache import ScanCache
+from tests.fixtures import build_install_tree, listdir_walk
+
+
+def main():
+    is_system = ProgramScanner(cache=ScanCache(None))._is_system_executable
+    with tempfile.TemporaryDirectory() as root:
+        created = build_install_tree(root)
+        print(f"Árbol generado: {created} archivos")
+        for depth in (2, 3):
+            start = time.perf_counter()
+            old = listdir_walk(root, is_system, max_depth=depth)
+            old_elapsed = time.perf_counter() - start
+
+            walker = FolderWalker(max_depth=depth, exclude=(), entry_budget=None, is_system=is_system)
+            start = time.perf_counter()
+            new = list(walker.walk(root))
+            new_elapsed = time.perf_counter() - start
+            assert sorted(p['path'] for p in new) == sorted(p['path'] for p in old)
+
+            walker = FolderWalker(max_depth=depth, is_system=is_system)
+            start = time.perf_counter()
+            first = None
+            pruned = 0
+            for _ in walker.walk(root):
+                pruned += 1
+                if first is None:
+                    first = time.perf_counter() - start
+            pruned_elapsed = time.perf_counter() - start
+
+            truncated = ", límite alcanzado" if walker.truncated else ""
+            print(f"Profundidad {depth}: listdir {old_elapsed * 1000:.1f} ms ({len(old)} programas), "
+                  f"scandir {new_elapsed * 1000:.1f} ms; con exclusiones y límite por defecto "
+                  f"{pruned_elapsed * 1000:.1f} ms ({pruned} programas{truncated}, "
+                  f"primero a los {first * 1000:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Latencia desde el disparo hasta el lanzamiento del primer programa:
+cliente IPC contra la instancia en marcha frente a la línea de comandos en frío.
+
+    python -m tests.bench_ipc
+
+Usa un directorio de datos temporal y un lanzador que solo anota la hora, así que el
+tiempo en frío es una cota inferior: en Windows se suman la carga de pywin32/psutil,
+la primera lectura de procesos y ventanas y la detección de monitores.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from src.ipc import IpcServer
+
+
+def main(rounds=5):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, USERPROFILE=home)
+        # El ProfileManager de este proceso usa el directorio temporal; se restaura al terminar
+        saved = {key: os.environ.get(key) for key in ('HOME', 'USERPROFILE')}
+        os.environ['HOME'] = os.environ['USERPROFILE'] = home
+        try:
+            from src.profile_manager import ProfileManager
+            from src.monitor_topology import MonitorTopology, MonitorRect, set_shared_topology
+
+            # Monitores fijos: la medida no depende de la pantalla del equipo
+            set_shared_topology(MonitorTopology(lambda: [MonitorRect(0, 0, 1920, 1080, True)]))
+            manager = ProfileManager()
+            programs = [{'name': f'App {i}', 'path': f'C:\\Apps\\app{i}.exe'} for i in range(5)]
+            manager.save_profile('Bench', {'programs': programs})
+            manager.flush()
+
+            spawned = []
+            event = threading.Event()
+            lock = threading.Lock()
+
+            def launcher(program, cancel_event, on_phase):
+                with lock:
+                    if not event.is_set():
+                        spawned.append(time.time())
+                        event.set()
+                return None
+
+            manager.executor.launcher = launcher
+            server = IpcServer(manager).start()
+            client_code = "from src.ipc import send_command; send_command('run', profile='Bench')"
+            warm = []
+            for _ in range(rounds):
+                event.clear()
+                start = time.time()
+                subprocess.run([sys.executable, '-c', client_code], cwd=root, env=env, check=True)
+                event.wait(5)
+                warm.append(spawned[-1] - start)
+            server.stop()
+            manager.flush()
+
+            # Mismo lanzador en un proceso nuevo: imprime la hora del primer lanzamiento
+            cold_code = "\n".join([
+                "import time, threading",
+                "from src.profile_manager import ProfileManager",
+                "from src.monitor_topology import MonitorTopology, MonitorRect, set_shared_topology",
+                "set_shared_topology(MonitorTopology(lambda: [MonitorRect(0, 0, 1920, 1080, True)]))",
+                "m = ProfileManager()",
+                "first = threading.Lock()",
+                "done = threading.Event()",
+                "def launcher(program, cancel_event, on_phase):",
+                "    if first.acquire(blocking=False):",
+                "        print('spawned', time.time(), flush=True)",
+                "        done.set()",
+                "m.executor.launcher = launcher",
+                "m.execute_profile('Bench')",
+                "done.wait(5)",
+                "m.flush()",
+            ])
+            cold = []
+            for _ in range(rounds):
+                start = time.time()
+                output = subprocess.run([sys.executable, '-c', cold_code], cwd=root, env=env, check=True,
+                                        capture_output=True, text=True).stdout.splitlines()
+                spawned_at = next(float(line.split()[1]) for line in output if line.startswith('spawned '))
+                cold.append(spawned_at - start)
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    print(f"Disparo -> lanzamiento (mejor de {rounds}): IPC {min(warm) * 1000:.1f} ms, "
+          f"línea de comandos en frío {min(cold) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
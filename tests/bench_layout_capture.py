@@ -0,0 +1,33 @@
+"""
+Captura de la disposición actual con 50 ventanas en dos monitores.
+
+    python -m tests.bench_layout_capture
+"""
+import time
+
+from src.layout_capture import capture_current_layout
+from src.monitor_topology import MonitorTopology, MonitorRect
+from src.process_table import ProcessTable, ProcessInfo
+from src.window_snapshot import WindowSnapshot, WindowInfo, STATE_MAXIMIZED
+from tests.fakes import StaticProcessSource, StaticWindowSource
+
+
+def main():
+    processes = [ProcessInfo(1000 + i, f'app{i}.exe', f'C:\\Apps\\app{i}.exe') for i in range(50)]
+    windows = [WindowInfo(i, 1000 + i, f'Ventana {i}', 'App',
+                          (100 + (i % 2) * 1920 + i, 50, 800, 600),
+                          STATE_MAXIMIZED if i % 7 == 0 else 'normal')
+               for i in range(50)]
+    source = StaticProcessSource(processes)
+    topology = MonitorTopology(lambda: [MonitorRect(0, 0, 1920, 1080, True),
+                                        MonitorRect(1920, 0, 1920, 1080, False)])
+    table = ProcessTable(source)
+    start = time.perf_counter()
+    programs = capture_current_layout(WindowSnapshot(StaticWindowSource(windows)), table, topology)
+    elapsed = time.perf_counter() - start
+    print(f"{len(windows)} ventanas -> {len(programs)} programas en {elapsed * 1000:.2f} ms "
+          f"({source.info_count} consultas de proceso)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Almacén de perfiles en memoria frente a leer profiles.json en cada consulta, y almacén
+JSON frente a SQLite con 10, 100 y 1000 perfiles.
+
+    python -m tests.bench_profile_store
+"""
+import json
+import os
+import tempfile
+import time
+
+from src.profile_sqlite import SqliteProfileStore
+from src.profile_store import ProfileStore
+from tests.fixtures import sample_profiles
+
+
+def bench_cache():
+    profiles = sample_profiles(1000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'profiles.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(profiles, f, indent=2, ensure_ascii=False)
+
+        rounds = 20
+        start = time.perf_counter()
+        for _ in range(rounds):
+            with open(path, 'r', encoding='utf-8') as f:
+                'Perfil 500' in json.load(f)
+        parse = (time.perf_counter() - start) / rounds
+
+        store = ProfileStore(path)
+        start = time.perf_counter()
+        store.snapshot()
+        cold = time.perf_counter() - start
+
+        rounds = 10000
+        start = time.perf_counter()
+        for _ in range(rounds):
+            'Perfil 500' in store
+        warm = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for i in range(100):
+            store.put(f"Perfil {i}", profiles[f"Perfil {i}"])
+        puts = (time.perf_counter() - start) / 100
+        start = time.perf_counter()
+        store.flush()
+        flush = time.perf_counter() - start
+
+        print(f"1000 perfiles: json.load por consulta {parse * 1000:.2f} ms, "
+              f"carga inicial {cold * 1000:.2f} ms, consulta en caché {warm * 1e6:.2f} µs, "
+              f"put {puts * 1000:.3f} ms, flush agrupado de 100 puts {flush * 1000:.2f} ms")
+
+
+def bench_backends():
+    def measure(store_factory, profiles, tmp):
+        store = store_factory(tmp)
+        store.replace_all(profiles)
+        store.flush()
+        if hasattr(store, 'close'):
+            store.close()
+
+        start = time.perf_counter()
+        store = store_factory(tmp)
+        store.snapshot()
+        load = time.perf_counter() - start
+
+        names = list(profiles)
+        target = names[len(names) // 2]
+        start = time.perf_counter()
+        store.put(target, profiles[target])
+        store.flush()
+        save = time.perf_counter() - start
+
+        rounds = 1000
+        start = time.perf_counter()
+        for _ in range(rounds):
+            store.get(target)
+            store.find_by_hotkey(profiles[target]['hotkey'])
+        lookup = (time.perf_counter() - start) / rounds
+        if hasattr(store, 'close'):
+            store.close()
+        return load, save, lookup
+
+    backends = [
+        ('json', lambda tmp: ProfileStore(os.path.join(tmp, 'profiles.json'))),
+        ('sqlite', lambda tmp: SqliteProfileStore(os.path.join(tmp, 'profiles.db'))),
+    ]
+    for count in (10, 100, 1000):
+        profiles = sample_profiles(count)
+        for label, factory in backends:
+            with tempfile.TemporaryDirectory() as tmp:
+                load, save, lookup = measure(factory, profiles, tmp)
+            print(f"{count:>5} perfiles [{label:>6}]: carga {load * 1000:.2f} ms, "
+                  f"guardar uno {save * 1000:.2f} ms, consulta nombre+hotkey {lookup * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    bench_cache()
+    bench_backends()
@@ -0,0 +1,45 @@
+"""
+Cambio diferencial de perfil con 10 programas (la mitad fuera de su sitio) y 40 ventanas ajenas.
+
+    python -m tests.bench_profile_switch
+"""
+from src.execution_plan import compile_profile
+from src.monitor_topology import MonitorTopology, MonitorRect
+from src.process_table import ProcessTable, ProcessInfo
+from src.profile_switch import ProfileSwitcher
+from src.window_snapshot import WindowSnapshot, WindowInfo
+from tests.fakes import (RecordingPlacementBackend, RecordingWindowCloser, StaticProcessSource,
+                         StaticWindowSource)
+
+
+def main():
+    topology = MonitorTopology(lambda: [MonitorRect(0, 0, 1920, 1080, True),
+                                        MonitorRect(1920, 0, 1920, 1080, False)])
+    programs = [{'name': f'App {i}', 'path': f'C:\\Apps\\app{i}.exe',
+                 'window_config': {'monitor': i % 2, 'x': 10 * i, 'y': 0, 'width': 800, 'height': 600}}
+                for i in range(10)]
+    plan = compile_profile('Trabajo', {'programs': programs, 'close_others': True}, topology)
+
+    processes = [ProcessInfo(1000 + i, f'app{i}.exe', f'C:\\Apps\\app{i}.exe') for i in range(10)]
+    processes += [ProcessInfo(2000 + i, f'other{i}.exe', f'C:\\Other\\other{i}.exe') for i in range(40)]
+    windows = []
+    for program, info in zip(plan.programs, processes):
+        # La mitad ya está en su sitio y la otra mitad desplazada
+        offset = 0 if info.pid % 2 else 50
+        windows.append(WindowInfo(info.pid, info.pid, program.name, 'App',
+                                  (program.x + offset, program.y, program.width, program.height)))
+    windows += [WindowInfo(info.pid, info.pid, f'Otra {info.pid}', 'Other', (0, 0, 640, 480))
+                for info in processes[10:]]
+
+    switcher = ProfileSwitcher(WindowSnapshot(StaticWindowSource(windows)),
+                               ProcessTable(StaticProcessSource(processes)),
+                               placement_backend=RecordingPlacementBackend(),
+                               closer=RecordingWindowCloser())
+    result = switcher.switch(plan, launch=lambda missing: None)
+    diff = result.diff
+    print(f"{len(windows)} ventanas: {len(diff.keep)} en su sitio, {len(diff.move)} recolocadas, "
+          f"{len(diff.launch)} por lanzar, {len(result.closed)} cerradas en {result.elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Escaneo de programas en un equipo simulado (400 programas con su clave de desinstalación,
+su carpeta y su acceso directo, más 50 apps empaquetadas): inicial, sin cambios y con cambios.
+
+    python -m tests.bench_program_scanner
+"""
+import os
+import tempfile
+import time
+
+from src.program_scanner import ProgramScanner, REGISTRY_PATHS
+from src.scan_cache import ScanCache, SCAN_CACHE_FILENAME
+from tests.fixtures import build_scan_fixture
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        registry, folders, start_menu = build_scan_fixture(root)
+        cache_path = os.path.join(root, SCAN_CACHE_FILENAME)
+
+        def start_apps():
+            raise AssertionError("No debe hacer falta PowerShell")
+
+        def scanner():
+            return ProgramScanner(cache=ScanCache(cache_path), registry=registry, folders=folders,
+                                  start_menu=start_menu, start_apps=start_apps)
+
+        for label in ("Escaneo inicial", "Sin cambios"):
+            registry.values_reads = 0
+            start = time.perf_counter()
+            s = scanner()
+            programs = s.scan_installed_programs()
+            elapsed = time.perf_counter() - start
+            sources = {}
+            for program in programs:
+                sources[program['source']] = sources.get(program['source'], 0) + 1
+            print(f"{label}: {len(programs)} programas {sources} en {elapsed * 1000:.1f} ms, "
+                  f"{registry.values_reads} claves leídas, {s.last_scan_stats}")
+
+        # Un programa actualizado y otro instalado en una carpeta nueva
+        hive, path = REGISTRY_PATHS[0]
+        last_write, values = registry.keys[(hive, path)]['App0']
+        registry.set(hive, path, 'App0', last_write + 1, values)
+        new_folder = os.path.join(folders[0], "Vendor new", "New App")
+        os.makedirs(new_folder)
+        with open(os.path.join(new_folder, "newapp.exe"), 'wb'):
+            pass
+        registry.values_reads = 0
+        start = time.perf_counter()
+        s = scanner()
+        programs = s.scan_installed_programs()
+        elapsed = time.perf_counter() - start
+        print(f"Con cambios: {len(programs)} programas en {elapsed * 1000:.1f} ms, "
+              f"{registry.values_reads} claves leídas, {s.last_scan_stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Tiempos por pulsación del índice de búsqueda de programas con 5000 programas.
+
+    python -m tests.bench_program_search
+"""
+import random
+import time
+
+from src.program_search import ProgramSearchIndex
+
+
+def sample_programs(count=5000, seed=1):
+    rng = random.Random(seed)
+    words = ['Visual', 'Studio', 'Code', 'Google', 'Chrome', 'Mozilla', 'Firefox', 'Adobe',
+             'Acrobat', 'Reader', 'Microsoft', 'Office', 'Teams', 'Steam', 'Discord', 'Spotify',
+             'Notepad', 'Python', 'Git', 'Docker', 'Desktop', 'Player', 'Editor', 'Manager',
+             'Tools', 'Studio', 'Cámara', 'Música', 'Fotos', 'Calculadora', 'Terminal', 'Node']
+    publishers = ['Microsoft Corporation', 'Google LLC', 'Mozilla', 'Adobe Inc.', 'Valve',
+                  'JetBrains s.r.o.', 'Python Software Foundation', '']
+    programs = []
+    for i in range(count):
+        name = ' '.join(rng.sample(words, rng.randint(1, 3))) + f" {i}"
+        exe = rng.choice(words).lower() + rng.choice(['', '64', '_x64', 'app'])
+        programs.append({'name': name, 'path': rf"C:\Program Files\{name}\{exe}.exe",
+                         'publisher': rng.choice(publishers), 'source': 'registry'})
+    return programs
+
+
+def main():
+    programs = sample_programs()
+
+    start = time.perf_counter()
+    index = ProgramSearchIndex(programs)
+    print(f"Índice de {len(programs)} programas construido en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Mediana de cada pulsación sin los resultados guardados de las consultas cortas
+    for typed in ("visual studio", "calculdora", "jetbrains", "udio cod"):
+        index = ProgramSearchIndex(programs)
+        times = []
+        for length in range(1, len(typed) + 1):
+            elapsed = []
+            for _ in range(5):
+                index._short_results = {}
+                start = time.perf_counter()
+                result = index.search(typed[:length])
+                elapsed.append(time.perf_counter() - start)
+            elapsed = sorted(elapsed)[2] * 1000
+            times.append(f"{typed[:length]!r}: {elapsed:.3f} ms ({len(result)})")
+        print('; '.join(times))
+        best = result[0] if result else None
+        print(f"   mejor resultado de {typed!r}: {programs[best]['name'] if best is not None else '-'}")
+
+    # La búsqueda anterior: subcadena en el nombre de cada programa
+    start = time.perf_counter()
+    for _ in range(200):
+        [p for p in programs if 'visual' in p['name'].lower()]
+    print(f"Recorrido lineal (filtro anterior, sin ordenar): "
+          f"{(time.perf_counter() - start) / 200 * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
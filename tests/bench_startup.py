@@ -0,0 +1,59 @@
+"""
+Medir el arranque de la interfaz:
+
+    python -m tests.bench_startup
+
+- primer pintado: desde el inicio del proceso hasta el primer Paint de la ventana principal
+- interactiva: hasta que el bucle de eventos queda libre después del primer pintado, con la
+  lista de perfiles y los programas del último escaneo ya cargados
+"""
+import sys
+import time
+
+_PROCESS_START = time.perf_counter()
+
+
+def main():
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    imported_at = time.perf_counter()
+    from src.main_window import MainWindow
+    marks = {'qt_import': imported_at}
+
+    class PaintProbe(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and 'first_paint' not in marks:
+                marks['first_paint'] = time.perf_counter()
+                # Las tareas diferidas del arranque (singleShot(0)) ya están en cola delante
+                QTimer.singleShot(0, interactive)
+            return False
+
+    def interactive():
+        marks['interactive'] = time.perf_counter()
+        window.close()
+        app.quit()
+
+    window = MainWindow()
+    marks['window_created'] = time.perf_counter()
+    probe = PaintProbe()
+    window.installEventFilter(probe)
+    window.show()
+    QTimer.singleShot(10000, app.quit)
+    app.exec_()
+
+    def ms(mark):
+        return f"{(marks[mark] - _PROCESS_START) * 1000:7.1f} ms" if mark in marks else "      -"
+
+    print(f"Qt importado:        {ms('qt_import')}")
+    print(f"Ventana creada:      {ms('window_created')}")
+    print(f"Primer pintado:      {ms('first_paint')}")
+    print(f"Interactiva:         {ms('interactive')}")
+    heavy = [m for m in ('src.program_scanner', 'src.profile_editor', 'winreg')
+             if m in sys.modules]
+    print(f"Módulos pesados cargados al arrancar: {', '.join(heavy) if heavy else 'ninguno'}")
+
+
+if __name__ == "__main__":
+    main()
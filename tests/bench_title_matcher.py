@@ -0,0 +1,75 @@
+"""
+Búsqueda de ventanas por título: TitleIndex frente al recorrido anterior de todos los títulos.
+
+    python -m tests.bench_title_matcher
+"""
+import random
+import time
+
+from src.title_matcher import TitleIndex, compile_keyword, tokenize
+from src.window_snapshot import WindowInfo
+
+
+def naive_search(windows, keyword):
+    """Algoritmo anterior de find_hwnd_by_title"""
+    keyword = keyword.lower()
+    words = tokenize(keyword)
+    hwnds = []
+    for window in windows:
+        title = window.title.lower()
+        if keyword in title:
+            hwnds.append((window.hwnd, len(words)))
+        else:
+            match_count = sum(1 for w in words if w in title)
+            if match_count > 0:
+                hwnds.append((window.hwnd, match_count))
+    hwnds.sort(key=lambda x: x[1], reverse=True)
+    return [hwnd for hwnd, _ in hwnds]
+
+
+def main():
+    words = ['visual', 'studio', 'code', 'google', 'chrome', 'mozilla', 'firefox', 'notepad',
+             'explorer', 'discord', 'spotify', 'slack', 'terminal', 'powershell', 'outlook',
+             'teams', 'word', 'excel', 'document', 'project', 'readme', 'main', 'untitled']
+    rng = random.Random(42)
+    keywords = ['Visual Studio Code', 'chrome', 'Discord', 'notepad++', 'spotify']
+
+    for size in (100, 1000, 10000):
+        windows = [
+            WindowInfo(hwnd, hwnd % 97, ' - '.join(rng.choice(words) for _ in range(rng.randint(1, 6))))
+            for hwnd in range(1, size + 1)
+        ]
+        index = TitleIndex()
+        start = time.perf_counter()
+        index.update(windows)
+        build = time.perf_counter() - start
+
+        # Un 1% de ventanas cambia de título entre ticks
+        changed = list(windows)
+        for i in rng.sample(range(size), max(1, size // 100)):
+            changed[i] = changed[i]._replace(title=changed[i].title + ' *')
+        start = time.perf_counter()
+        index.update(changed)
+        incremental = time.perf_counter() - start
+
+        rounds = 20
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for keyword in keywords:
+                naive_search(changed, keyword)
+        naive = (time.perf_counter() - start) / (rounds * len(keywords))
+
+        compiled = [compile_keyword(k) for k in keywords]
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for keyword in compiled:
+                index.search(keyword)
+        indexed = (time.perf_counter() - start) / (rounds * len(keywords))
+
+        print(f"{size:>6} ventanas: construir {build * 1000:.2f} ms, "
+              f"actualizar 1% {incremental * 1000:.2f} ms, "
+              f"búsqueda antigua {naive * 1000:.3f} ms, indexada {indexed * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Dobles de prueba de las fuentes del sistema (procesos, ventanas, eventos, registro, ...)
+para probar y medir el núcleo fuera de Windows.
+"""
+import struct
+import threading
+import time
+
+from src.launch_executor import PHASE_SPAWNED, PHASE_PID_FOUND, PHASE_HWND_FOUND
+from src.process_table import UNKNOWN_CREATE_TIME
+from src.program_scanner import REGISTRY_VALUES
+from src.shell_links import (APP_USER_MODEL_FMTID, APP_USER_MODEL_ID_PID, ENVIRONMENT_BLOCK,
+                             HAS_ARGUMENTS, HAS_ICON_LOCATION, HAS_LINK_INFO, HAS_NAME,
+                             HAS_WORKING_DIR, HEADER_SIZE, IS_UNICODE, LINK_CLSID,
+                             PROPERTY_STORE_BLOCK, VT_LPWSTR)
+from src.window_events import EVENT_OBJECT_SHOW
+
+
+class StaticProcessSource:
+    """
+    Fuente de procesos en memoria.
+    Los procesos sin create_time reciben UNKNOWN_CREATE_TIME, como los de otro usuario.
+    """
+
+    def __init__(self, processes=None):
+        self.processes = {}
+        self.info_count = 0
+        for process in processes or []:
+            self.add(process)
+
+    def add(self, process):
+        if process.create_time is None:
+            process = process._replace(create_time=UNKNOWN_CREATE_TIME)
+        self.processes[process.pid] = process
+
+    def remove(self, pid):
+        self.processes.pop(pid, None)
+
+    def pids(self):
+        return list(self.processes)
+
+    def info(self, pid):
+        self.info_count += 1
+        return self.processes.get(pid)
+
+    def create_time(self, pid):
+        process = self.processes.get(pid)
+        return process.create_time if process is not None else None
+
+
+class StaticWindowSource:
+    """Fuente de ventanas en memoria"""
+
+    def __init__(self, windows=None):
+        self.windows = list(windows or [])
+        self.enum_count = 0
+
+    def set_windows(self, windows):
+        self.windows = list(windows)
+
+    def enum_windows(self):
+        self.enum_count += 1
+        return list(self.windows)
+
+
+class ScriptedEventSource:
+    """
+    Fuente de eventos de ventana guionizada.
+    script es una lista de (retardo_en_segundos, hwnd, evento) que se emiten en orden
+    al arrancar; emit() permite disparar eventos a mano.
+    """
+
+    def __init__(self, script=None):
+        self.script = list(script or [])
+        self.emitted = []
+        self._notify = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, notify):
+        self._notify = notify
+        self._stop.clear()
+        if self.script:
+            self._thread = threading.Thread(target=self._play, daemon=True)
+            self._thread.start()
+
+    def _play(self):
+        for delay, hwnd, event in self.script:
+            if self._stop.wait(delay):
+                return
+            self.emit(hwnd, event)
+
+    def emit(self, hwnd=None, event=EVENT_OBJECT_SHOW):
+        self.emitted.append((time.monotonic(), hwnd, event))
+        if self._notify:
+            self._notify(hwnd, event)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._notify = None
+
+
+class RecordingPlacementBackend:
+    """
+    Backend de colocación que registra las llamadas en self.calls.
+    failing_hwnds simula ventanas para las que DeferWindowPos/SetWindowPos fallan;
+    missing_hwnds simula ventanas que ya no existen.
+    """
+
+    def __init__(self, failing_hwnds=(), missing_hwnds=(), restored_hwnds=()):
+        self.calls = []
+        self.failing_hwnds = set(failing_hwnds)
+        self.missing_hwnds = set(missing_hwnds)
+        self.restored_hwnds = set(restored_hwnds)
+
+    def is_window(self, hwnd):
+        return hwnd not in self.missing_hwnds
+
+    def needs_restore(self, hwnd):
+        return hwnd in self.restored_hwnds
+
+    def restore(self, hwnd):
+        self.calls.append(('restore', hwnd))
+
+    def begin(self, count):
+        self.calls.append(('begin', count))
+        return object()
+
+    def defer(self, handle, placement):
+        if placement.hwnd in self.failing_hwnds:
+            raise OSError(f"DeferWindowPos falló para {placement.hwnd}")
+        self.calls.append(('defer', placement.hwnd, placement.x, placement.y,
+                           placement.width, placement.height))
+        return handle
+
+    def end(self, handle):
+        self.calls.append(('end',))
+
+    def set_window_pos(self, placement):
+        if placement.hwnd in self.failing_hwnds:
+            raise OSError(f"SetWindowPos falló para {placement.hwnd}")
+        self.calls.append(('set_window_pos', placement.hwnd, placement.x, placement.y,
+                           placement.width, placement.height))
+
+    def maximize(self, hwnd):
+        self.calls.append(('maximize', hwnd))
+
+    def minimize(self, hwnd):
+        self.calls.append(('minimize', hwnd))
+
+
+class RecordingWindowCloser:
+    """Cierre de ventanas que registra los hwnd en self.closed"""
+
+    def __init__(self):
+        self.closed = []
+
+    def close(self, hwnd):
+        self.closed.append(hwnd)
+
+
+class FakeLauncher:
+    """
+    Lanzador para probar el ejecutor: cada programa tarda delays[nombre] segundos
+    (o default_delay), respetando la cancelación. Registra el orden de inicio y la
+    concurrencia máxima alcanzada.
+    """
+
+    def __init__(self, delays=None, default_delay=0.01, failing=()):
+        self.delays = dict(delays or {})
+        self.default_delay = default_delay
+        self.failing = set(failing)
+        self.started = []
+        self.max_concurrency = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, program, cancel_event, on_phase=None):
+        name = getattr(program, 'config', program).get('name')
+        on_phase = on_phase or (lambda phase: None)
+        with self._lock:
+            self.started.append(name)
+            self._active += 1
+            self.max_concurrency = max(self.max_concurrency, self._active)
+        try:
+            on_phase(PHASE_SPAWNED)
+            delay = self.delays.get(name, self.default_delay)
+            if cancel_event.wait(delay / 2):
+                return None
+            on_phase(PHASE_PID_FOUND)
+            if cancel_event.wait(delay / 2):
+                return None
+            if name in self.failing:
+                return None
+            on_phase(PHASE_HWND_FOUND)
+            return name
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+class FakeRegistry:
+    """
+    Registro en memoria.
+    keys: {(colmena, ruta): {subclave: (última escritura, {valor: dato})}}
+    values_reads cuenta las subclaves leídas (lo que la caché debe evitar).
+    """
+
+    def __init__(self, keys=None):
+        self.keys = keys or {}
+        self.values_reads = 0
+
+    def set(self, hive, path, name, last_write, values):
+        self.keys.setdefault((hive, path), {})[name] = (last_write, dict(values))
+
+    def subkeys(self, hive, path):
+        if (hive, path) not in self.keys:
+            raise OSError(f"No existe la clave {hive}\\{path}")
+        return [(name, stamp) for name, (stamp, _) in self.keys[(hive, path)].items()]
+
+    def values(self, hive, path, name, names=REGISTRY_VALUES):
+        self.values_reads += 1
+        return dict(self.keys[(hive, path)][name][1])
+
+
+def _string_data(value):
+    encoded = value.encode('utf-16-le')
+    return struct.pack('<H', len(encoded) // 2) + encoded
+
+
+def _property_store(app_id):
+    text = (app_id + '\0').encode('utf-16-le')
+    length = len(text) // 2
+    text += b'\0' * (-len(text) % 4)
+    value = struct.pack('<IB', APP_USER_MODEL_ID_PID, 0) + struct.pack('<HHI', VT_LPWSTR, 0, length) + text
+    value = struct.pack('<I', 4 + len(value)) + value
+    storage = struct.pack('<I', 0x53505331) + APP_USER_MODEL_FMTID + value + struct.pack('<I', 0)
+    storage = struct.pack('<I', 4 + len(storage)) + storage
+    store = storage + struct.pack('<I', 0)
+    return struct.pack('<II', 8 + len(store), PROPERTY_STORE_BLOCK) + store
+
+
+def build_lnk(target=None, arguments='', working_dir='', icon_location='', description='',
+              app_id=None, env_target=None):
+    """
+    Generar un .lnk mínimo (Unicode, con LinkInfo local).
+    env_target escribe el destino en un bloque de variables de entorno, como hacen los
+    instaladores que usan %ProgramFiles%.
+    """
+    flags = IS_UNICODE
+    body = b''
+    if target:
+        flags |= HAS_LINK_INFO
+        base = target.encode('cp1252', errors='replace') + b'\0'
+        base_unicode = target.encode('utf-16-le') + b'\0\0'
+        header_size = 0x24
+        base_offset = header_size
+        suffix_offset = base_offset + len(base)
+        base_unicode_offset = suffix_offset + 1
+        suffix_unicode_offset = base_unicode_offset + len(base_unicode)
+        tail = base + b'\0' + base_unicode + b'\0\0'
+        size = header_size + len(tail)
+        body += struct.pack('<IIIIIIIII', size, header_size, 0x1, 0, base_offset, 0, suffix_offset,
+                            base_unicode_offset, suffix_unicode_offset) + tail
+    for flag, value in ((HAS_NAME, description), (HAS_WORKING_DIR, working_dir),
+                        (HAS_ARGUMENTS, arguments), (HAS_ICON_LOCATION, icon_location)):
+        if value:
+            flags |= flag
+            body += _string_data(value)
+    if env_target:
+        ansi = env_target.encode('cp1252', errors='replace')[:259].ljust(260, b'\0')
+        wide = env_target.encode('utf-16-le')[:518].ljust(520, b'\0')
+        body += struct.pack('<II', 0x314, ENVIRONMENT_BLOCK) + ansi + wide
+    if app_id:
+        body += _property_store(app_id)
+    body += struct.pack('<I', 0)
+
+    header = struct.pack('<I', HEADER_SIZE) + LINK_CLSID + struct.pack('<II', flags, 0x20)
+    header += b'\0' * 24 + struct.pack('<IiIH', 0, 0, 1, 0) + b'\0' * 10
+    return header + body
+
+
+def build_appx_manifest(name, publisher, apps, framework=False):
+    """AppxManifest.xml mínimo; apps: lista de (Id, DisplayName) o (Id, DisplayName, Executable)"""
+    applications = ''.join(
+        f'<Application Id="{app[0]}"' + (f' Executable="{app[2]}"' if len(app) > 2 else '')
+        + f'><uap:VisualElements DisplayName="{app[1]}"/></Application>'
+        for app in apps)
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<Package xmlns="http://schemas.microsoft.com/appx/manifest/foundation/windows10" '
+        'xmlns:uap="http://schemas.microsoft.com/appx/manifest/uap/windows10">'
+        f'<Identity Name="{name}" Publisher="{publisher}" Version="1.0.0.0"/>'
+        f'<Properties><DisplayName>{name}</DisplayName>'
+        f'<Framework>{"true" if framework else "false"}</Framework></Properties>'
+        f'<Applications>{applications}</Applications></Package>'
+    )
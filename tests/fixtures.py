@@ -0,0 +1,121 @@
+"""
+Datos sintéticos en disco y en memoria para las pruebas y los benchmarks:
+perfiles, árboles de carpetas de instalación y un equipo simulado para el escáner.
+"""
+import os
+import time
+
+from src.folder_walker import _folder_program
+from src.program_scanner import REGISTRY_PATHS
+from src.start_menu import PACKAGES_KEY
+from tests.fakes import FakeRegistry, build_appx_manifest, build_lnk
+
+
+def sample_profiles(count):
+    """Perfiles sintéticos de 5 programas"""
+    return {
+        f"Perfil {i}": {
+            'programs': [
+                {
+                    'name': f"Programa {j}",
+                    'path': rf"C:\Program Files\App{j}\app{j}.exe",
+                    'window_config': {'monitor': j % 2, 'maximized': False,
+                                      'x': 100, 'y': 100, 'width': 800, 'height': 600},
+                    'start_minimized': False,
+                    'avoid_duplicates': True
+                }
+                for j in range(5)
+            ],
+            'created_at': '',
+            'modified_at': str(int(time.time())),
+            'close_others': False,
+            'hotkey': f"ctrl+alt+{i}"
+        }
+        for i in range(count)
+    }
+
+
+def write_file(path, size=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'\0' * size)
+
+
+def listdir_walk(folder_path, is_system, max_depth=2, current_depth=0):
+    """Recorrido anterior de carpetas (os.listdir + isfile/isdir, recursivo), como referencia"""
+    programs = []
+    if current_depth >= max_depth:
+        return programs
+    try:
+        for item in os.listdir(folder_path):
+            item_path = os.path.join(folder_path, item)
+            if os.path.isfile(item_path) and item.lower().endswith('.exe'):
+                if not is_system(item.lower()):
+                    programs.append(_folder_program(item, item_path))
+            elif os.path.isdir(item_path):
+                programs.extend(listdir_walk(item_path, is_system, max_depth, current_depth + 1))
+    except (PermissionError, OSError):
+        pass
+    return programs
+
+
+def build_install_tree(root, files=100000, programs=500):
+    """
+    Árbol tipo Program Files: programas con 4 subcarpetas cada uno y archivos repartidos,
+    un .exe principal por programa, un desinstalador y algo de node_modules.
+    """
+    per_program = files // programs
+    created = 0
+    for i in range(programs):
+        program = os.path.join(root, f"Vendor {i}")
+        subdirs = [os.path.join(program, name) for name in ("bin", "lib", "resources", "locales")]
+        if i % 10 == 0:
+            subdirs.append(os.path.join(program, "node_modules"))
+        for folder in subdirs:
+            os.makedirs(folder)
+        for name in (f"app{i}.exe", "uninstall.exe"):
+            open(os.path.join(program, name), 'wb').close()
+            created += 1
+        for j in range(per_program - 2):
+            folder = subdirs[j % len(subdirs)] if j % 3 else program
+            open(os.path.join(folder, f"file{j}.dll" if j % 7 else f"tool{j}.exe"), 'wb').close()
+            created += 1
+    return created
+
+
+def build_scan_fixture(root, count=400, packages=50):
+    """
+    Equipo simulado: count programas instalados en root/Program Files, cada uno con su
+    clave de desinstalación y su acceso directo en el menú Inicio, más unas cuantas apps
+    empaquetadas. Devuelve (registro, carpetas de programas, carpetas del menú Inicio).
+    """
+    program_files = os.path.join(root, "Program Files")
+    start_menu = os.path.join(root, "Start Menu", "Programs")
+    registry = FakeRegistry()
+    for i in range(count):
+        folder = os.path.join(program_files, f"Vendor {i}", f"App {i}")
+        os.makedirs(folder)
+        exe = os.path.join(folder, f"app{i}.exe")
+        with open(exe, 'wb'):
+            pass
+        hive, path = REGISTRY_PATHS[i % len(REGISTRY_PATHS)]
+        registry.set(hive, path, f"App{i}", 1000 + i, {
+            'DisplayName': f"App {i}",
+            'InstallLocation': folder,
+            'UninstallString': f'"{os.path.join(folder, "uninstall.exe")}"'
+        })
+        links = os.path.join(start_menu, f"Vendor {i}")
+        os.makedirs(links)
+        with open(os.path.join(links, f"App {i}.lnk"), 'wb') as f:
+            f.write(build_lnk(target=exe))
+        with open(os.path.join(links, f"Uninstall App {i}.lnk"), 'wb') as f:
+            f.write(build_lnk(target=os.path.join(folder, "uninstall.exe")))
+    hive, path = PACKAGES_KEY
+    for i in range(packages):
+        package = os.path.join(root, "WindowsApps", f"Vendor.App{i}")
+        os.makedirs(package)
+        with open(os.path.join(package, "AppxManifest.xml"), 'w', encoding='utf-8') as f:
+            f.write(build_appx_manifest(f"Vendor.App{i}", "CN=Vendor", [("App", f"Store App {i}")]))
+        registry.set(hive, path, f"Vendor.App{i}_1.0.0.0_x64__abc", 2000 + i,
+                     {'PackageRootFolder': package})
+    return registry, [program_files], [start_menu]
@@ -0,0 +1,18 @@
+from src.cli import build_parser, measure_cold_start
+
+
+def test_core_does_not_import_the_gui():
+    _, loaded = measure_cold_start(rounds=1)
+    assert loaded == []
+
+
+def test_parser_requires_a_command():
+    args = build_parser().parse_args(['run', 'Trabajo', '--no-wait'])
+    assert (args.profile, args.no_wait) == ('Trabajo', True)
+
+
+def test_run_is_a_full_run_and_switch_is_separate():
+    args = build_parser().parse_args(['run', 'Trabajo'])
+    assert args.func.__name__ == 'cmd_run'
+    args = build_parser().parse_args(['switch', 'Trabajo', '--close-others'])
+    assert (args.func.__name__, args.close_others) == ('cmd_switch', True)
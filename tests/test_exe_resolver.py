@@ -0,0 +1,75 @@
+import os
+import time
+
+import pytest
+
+from src.exe_resolver import ExecutableResolver
+from src.program_scanner import ProgramScanner
+from src.scan_cache import ScanCache
+from tests.fixtures import write_file
+
+
+@pytest.fixture
+def is_system():
+    return ProgramScanner(cache=ScanCache(None))._is_system_executable
+
+
+def tree(root, name, files):
+    folder = os.path.join(root, name)
+    for relative, size in files.items():
+        write_file(os.path.join(folder, relative), size)
+    return folder
+
+
+@pytest.mark.parametrize('files, name, icon, expected', [
+    # El primer .exe por orden alfabético es un auxiliar; el principal se llama como el programa
+    ({'crashpad_handler.exe': 900, 'elevate.exe': 50, 'Editor.exe': 500, 'updater.exe': 2000},
+     "Editor Pro 2.1 (x64)", None, 'Editor.exe'),
+    # Sin DisplayIcon gana el de la carpeta principal; con él, el que indica
+    ({'launcher.exe': 100, os.path.join('bin', 'core64.exe'): 50}, "Office Suite", None, 'launcher.exe'),
+    ({'launcher.exe': 100, os.path.join('bin', 'core64.exe'): 50}, "Office Suite",
+     '"{root}\\bin\\core64.exe",0', os.path.join('bin', 'core64.exe')),
+    # Instalación por versiones (app-1.2.3): búsqueda en subcarpetas
+    ({'Update.exe': 1000, os.path.join('app-1.2.3', 'chat.exe'): 800,
+      os.path.join('app-1.2.3', 'squirrel.exe'): 10}, "Chat", None, os.path.join('app-1.2.3', 'chat.exe')),
+    # Sin nombre parecido: gana el más grande
+    ({'a.exe': 10, 'zz_main.exe': 5000}, "Mi Juego", None, 'zz_main.exe'),
+    # Solo desinstaladores: ninguno
+    ({'uninstall.exe': 100, 'setup.exe': 100}, "Tool", None, None),
+])
+def test_resolve(tmp_path, is_system, files, name, icon, expected):
+    folder = tree(str(tmp_path), 'App', files)
+    if icon:
+        icon = icon.replace('{root}', folder).replace('\\', os.sep)
+    result = ExecutableResolver(is_system=is_system).resolve(folder, name, icon)
+    assert result == (os.path.join(folder, expected) if expected else None)
+
+
+def test_folder_listing_is_cached_until_mtime_changes(tmp_path, is_system):
+    folder = tree(str(tmp_path), 'Editor', {'Editor.exe': 500, 'updater.exe': 2000})
+    calls = {'read': 0, 'reused': 0}
+
+    def count(reused):
+        calls['reused' if reused else 'read'] += 1
+
+    resolver = ExecutableResolver(cache=ScanCache(None), is_system=is_system, count=count)
+    for _ in range(3):
+        resolver.resolve(folder, "Editor Pro")
+    assert calls == {'read': 1, 'reused': 2}
+    time.sleep(0.01)
+    write_file(os.path.join(folder, 'Editor Pro.exe'), 5000)
+    assert resolver.resolve(folder, "Editor Pro").endswith('Editor Pro.exe')
+    assert calls['read'] == 2
+
+
+def test_changes_inside_a_subfolder_invalidate_the_listing(tmp_path, is_system):
+    folder = tree(str(tmp_path), 'Chat', {'Update.exe': 1000, os.path.join('app-1.2.3', 'squirrel.exe'): 10})
+    resolver = ExecutableResolver(cache=ScanCache(None), is_system=is_system)
+    subfolder = os.path.join(folder, 'app-1.2.3')
+    assert resolver.resolve(folder, "Chat") == os.path.join(subfolder, 'squirrel.exe')
+    root_mtime = os.stat(folder).st_mtime_ns
+    time.sleep(0.01)
+    write_file(os.path.join(subfolder, 'chat.exe'), 5000)
+    # La carpeta principal no cambia: solo la subcarpeta
+    os.utime(folder, ns=(root_mtime, root_mtime))
+    assert resolver.resolve(folder, "Chat") == os.path.join(subfolder, 'chat.exe')
@@ -0,0 +1,124 @@
+from src.execution_plan import PlanCache, compile_profile, is_app_id, validate_profile
+from src.monitor_topology import MonitorRect, MonitorTopology, resolve_monitor
+from src.process_table import ProcessInfo, ProcessTable, set_shared_process_table
+from src.start_menu import parse_appx_manifest
+from src.window_manager import find_existing_pid
+from tests.fakes import StaticProcessSource, build_appx_manifest
+
+MONITORS = [MonitorRect(0, 0, 1920, 1080, True), MonitorRect(1920, 0, 2560, 1440, False)]
+
+
+def topology(monitors=MONITORS):
+    return MonitorTopology(lambda: list(monitors))
+
+
+def test_compile_resolves_geometry_on_the_monitor():
+    profile = {'priority': 3, 'programs': [
+        {'name': 'Editor', 'path': 'C:/Apps/editor.exe',
+         'window_config': {'monitor': 'secondary', 'x': 10, 'y': 20, 'width': 800, 'height': 600}},
+        {'name': 'Correo', 'path': 'C:/Apps/mail.exe', 'window_config': {'monitor': 0, 'maximized': True}},
+    ]}
+    plan = compile_profile('Trabajo', profile, topology())
+    editor, mail = plan.programs
+    assert plan.priority == 3
+    assert (editor.monitor_index, editor.x, editor.y, editor.width, editor.height) == (1, 1930, 20, 800, 600)
+    assert (mail.width, mail.height, mail.maximize) == (1920, 1080, True)
+    assert editor.process_name == 'editor.exe'
+    assert editor.compiled_keyword.tokens == ('editor',)
+
+
+def test_plan_cache_reuses_plan_until_profile_or_monitors_change():
+    monitors = list(MONITORS)
+    topo = topology(monitors)
+    topo.ttl = 0
+    cache = PlanCache(topo)
+    profile = {'programs': [{'name': 'Editor', 'path': 'C:/Apps/editor.exe'}]}
+    plan = cache.get('Trabajo', profile)
+    assert cache.get('Trabajo', profile) is plan
+    assert cache.get('Trabajo', dict(profile)) is not plan
+    plan = cache.get('Trabajo', profile)
+    monitors.pop()
+    assert cache.get('Trabajo', profile) is not plan
+
+
+def test_validate_reports_problems():
+    profile = {'programs': [
+        {'name': 'Falta', 'path': ''},
+        {'name': 'Lejos', 'path': __file__, 'window_config': {'monitor': 5}},
+        {'name': 'Raro', 'path': __file__, 'window_config': {'monitor': 'izquierda'}},
+    ]}
+    problems = validate_profile('Trabajo', profile, topology())
+    assert len(problems) == 3
+    assert validate_profile('Vacío', {'programs': []}, topology()) == ["no tiene programas"]
+
+
+def test_resolve_monitor_mapping():
+    primary_right = [MonitorRect(-1920, 0, 1920, 1080, False), MonitorRect(0, 0, 1920, 1080, True)]
+    assert resolve_monitor('primary', primary_right) == (1, None)
+    assert resolve_monitor('secondary', primary_right) == (0, None)
+    assert resolve_monitor(1, primary_right) == (1, None)
+    assert resolve_monitor(2, primary_right)[0] == 0
+    assert resolve_monitor('secondary', primary_right[:1])[1]
+    assert resolve_monitor(None, primary_right)[1]
+
+
+def test_display_signature_change_reloads_within_ttl():
+    monitors = list(MONITORS)
+    signature = [2]
+    topo = MonitorTopology(lambda: list(monitors), ttl=3600, signature=lambda: tuple(signature))
+    topo.monitors()
+    generation = topo.generation
+    monitors.pop()
+    assert len(topo.monitors()) == 2
+    signature[0] = 1
+    assert len(topo.monitors()) == 1
+    assert topo.generation == generation + 1
+
+
+def test_window_class_reaches_the_compiled_keyword():
+    program = {'name': 'Editor', 'path': 'C:/Apps/editor.exe', 'window_class': 'EditorWnd'}
+    plan = compile_profile('Trabajo', {'programs': [program]}, topology())
+    assert plan.programs[0].compiled_keyword.class_names == {'editorwnd'}
+
+
+def test_priority_is_coerced_to_int():
+    def priority(value):
+        return compile_profile('Trabajo', {'programs': [], 'priority': value}, topology()).priority
+    assert priority("2") == 2
+    assert priority(1.0) == 1
+    assert priority("alta") == 0
+    assert priority(None) == 0
+    assert priority([1]) == 0
+
+
+def test_packaged_apps_are_launchable_without_a_file():
+    profile = {'programs': [
+        {'name': 'Calculadora', 'path': 'Microsoft.WindowsCalculator_8wekyb3d8bbwe!App', 'source': 'modern'},
+        {'name': 'Terminal', 'path': 'Microsoft.WindowsTerminal_8wekyb3d8bbwe!App'},
+        {'name': 'Chat', 'path': 'Vendor.Chat', 'source': 'modern'},
+    ]}
+    calculator, terminal, chat = compile_profile('Apps', profile, topology()).programs
+    assert calculator.exe_exists and calculator.packaged
+    assert calculator.compiled_keyword.tokens == ('calculadora',)
+    assert terminal.packaged and chat.packaged
+    assert validate_profile('Apps', profile, topology()) == []
+    assert not is_app_id('C:/Apps/raro!.exe')
+
+
+def test_packaged_apps_find_their_process_by_the_manifest_executable():
+    manifest = build_appx_manifest('Vendor.Notes', 'CN=Vendor', [('App', 'Notas', 'VFS\\Notes.exe')])
+    notes, = parse_appx_manifest(manifest)
+    assert notes['process_name'] == 'Notes.exe'
+    profile = {'programs': [notes, {'name': 'Chat', 'path': 'Vendor.Chat_1234!App', 'source': 'modern'}]}
+    notes_plan, chat_plan = compile_profile('Apps', profile, topology()).programs
+    assert notes_plan.process_name == 'Notes.exe'
+    # Sin ejecutable conocido solo se busca por título, nunca por el AppUserModelID
+    assert chat_plan.process_name is None
+
+    set_shared_process_table(ProcessTable(StaticProcessSource([
+        ProcessInfo(42, 'Notes.exe', 'C:/Program Files/WindowsApps/Vendor.Notes/VFS/Notes.exe')])))
+    try:
+        assert find_existing_pid(notes_plan.process_name) == 42
+        assert find_existing_pid(chat_plan.process_name) is None
+    finally:
+        set_shared_process_table(None)
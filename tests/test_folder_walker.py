@@ -0,0 +1,21 @@
+from src.folder_walker import FolderWalker
+from src.program_scanner import ProgramScanner
+from src.scan_cache import ScanCache
+from tests.fixtures import build_install_tree, listdir_walk
+
+
+def test_walk_matches_listdir_walk(tmp_path):
+    is_system = ProgramScanner(cache=ScanCache(None))._is_system_executable
+    build_install_tree(str(tmp_path), files=2000, programs=20)
+    for depth in (2, 3):
+        old = listdir_walk(str(tmp_path), is_system, max_depth=depth)
+        walker = FolderWalker(max_depth=depth, exclude=(), entry_budget=None, is_system=is_system)
+        new = list(walker.walk(str(tmp_path)))
+        assert sorted(p['path'] for p in new) == sorted(p['path'] for p in old)
+
+
+def test_entry_budget_truncates(tmp_path):
+    build_install_tree(str(tmp_path), files=2000, programs=20)
+    walker = FolderWalker(max_depth=3, exclude=(), entry_budget=100)
+    list(walker.walk(str(tmp_path)))
+    assert str(tmp_path) in walker.truncated
@@ -0,0 +1,78 @@
+import sys
+
+import pytest
+
+from src import ipc
+from src.ipc import IpcServer, InstanceLock, load_authkey, send_command
+
+
+class FakeManager:
+    def __init__(self):
+        self.cancelled = []
+        self.executor = self
+
+    def active_runs(self):
+        return []
+
+    def cancel_profile(self, profile_name):
+        self.cancelled.append(profile_name)
+        return True
+
+    def execute_profile(self, profile_name):
+        return None
+
+
+def test_dispatch_rejects_unknown_commands_and_missing_profiles():
+    server = IpcServer(FakeManager())
+    assert not server.dispatch({'command': 'rm'})['ok']
+    assert not server.dispatch({'command': 'run'})['ok']
+    assert not server.dispatch({'command': 'run', 'profile': 'Nada'})['ok']
+    assert server.dispatch({'command': 'status'})['runs'] == []
+
+
+def test_switch_waits_longer_than_other_commands(tmp_path, monkeypatch):
+    polled = []
+
+    class FakeConnection:
+        def send(self, message):
+            pass
+
+        def poll(self, timeout):
+            polled.append(timeout)
+            return False
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(ipc, 'load_authkey', lambda data_dir=None: b'key')
+    monkeypatch.setattr(ipc, 'Client', lambda address, authkey: FakeConnection())
+    monkeypatch.setattr(ipc.os.path, 'exists', lambda path: True)
+    send_command('ping', data_dir=str(tmp_path))
+    send_command('switch', data_dir=str(tmp_path), profile='Trabajo')
+    assert polled == [ipc.DEFAULT_TIMEOUT, ipc.COMMAND_TIMEOUTS['switch']]
+
+
+def test_instance_lock_is_exclusive(tmp_path):
+    first, second = InstanceLock(str(tmp_path)), InstanceLock(str(tmp_path))
+    assert first.acquire()
+    try:
+        assert not second.acquire()
+    finally:
+        first.release()
+    assert second.acquire()
+    second.release()
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="la tubería con nombre es global al usuario")
+def test_round_trip_through_the_socket(tmp_path):
+    data_dir = str(tmp_path)
+    assert send_command('ping', data_dir=data_dir) is None
+    manager = FakeManager()
+    server = IpcServer(manager, data_dir=data_dir).start()
+    try:
+        assert load_authkey(data_dir) is not None
+        assert send_command('ping', data_dir=data_dir)['ok']
+        assert send_command('cancel', data_dir=data_dir, profile='Trabajo')['cancelled']
+        assert manager.cancelled == ['Trabajo']
+    finally:
+        server.stop()
@@ -0,0 +1,97 @@
+import threading
+
+from src.launch_executor import (LaunchExecutor, CANCELLED, DONE, FAILED, PHASE_HWND_FOUND,
+                                 RUN_FINISHED, ProfileRun, describe_run)
+from tests.fakes import FakeLauncher
+
+
+def programs(*names):
+    return [{'name': name} for name in names]
+
+
+def test_runs_every_program_with_bounded_concurrency():
+    launcher = FakeLauncher(default_delay=0.02)
+    executor = LaunchExecutor(launcher, max_workers=2)
+    run = executor.submit('Trabajo', programs(*'abcde'))
+    assert run.wait(5)
+    assert [task.status for task in run.tasks] == [DONE] * 5
+    assert launcher.max_concurrency <= 2
+    assert all(PHASE_HWND_FOUND in task.timestamps for task in run.tasks)
+    executor.shutdown()
+
+
+def test_higher_priority_profile_goes_first():
+    gate = threading.Event()
+
+    def launcher(program, cancel_event, on_phase):
+        gate.wait(5)
+        return program['name']
+
+    executor = LaunchExecutor(launcher, max_workers=1)
+    first = executor.submit('Bloqueo', programs('x'))
+    low = executor.submit('Bajo', programs('low'), priority=0)
+    high = executor.submit('Alto', programs('high'), priority=5)
+    gate.set()
+    for run in (first, low, high):
+        assert run.wait(5)
+    assert high.tasks[0].timestamps['started'] < low.tasks[0].timestamps['started']
+    executor.shutdown()
+
+
+def test_cancel_stops_pending_tasks():
+    launcher = FakeLauncher(default_delay=1)
+    executor = LaunchExecutor(launcher, max_workers=1)
+    run = executor.submit('Lento', programs('a', 'b', 'c'))
+    assert executor.cancel('Lento') == 1
+    assert run.wait(5)
+    assert all(task.status == CANCELLED for task in run.tasks)
+    assert 'cancelado' in describe_run(run)
+    executor.shutdown()
+
+
+def test_failed_programs_are_reported():
+    executor = LaunchExecutor(FakeLauncher(failing={'b'}), max_workers=2)
+    run = executor.submit('Trabajo', programs('a', 'b'))
+    assert run.wait(5)
+    assert [task.status for task in run.tasks] == [DONE, FAILED]
+    assert 'fallidos: b' in describe_run(run)
+    executor.shutdown()
+
+
+def test_listener_receives_run_finished():
+    executor = LaunchExecutor(FakeLauncher(), max_workers=2)
+    events = []
+    run = executor.submit('Trabajo', programs('a'))
+    run.add_listener(lambda run, task, phase: events.append(phase))
+    assert run.wait(5)
+    run.add_listener(lambda run, task, phase: events.append(('late', phase)))
+    assert events[-1] == ('late', RUN_FINISHED)
+    executor.shutdown()
+
+
+class _ReleaseHookLock:
+    """Lock que ejecuta hook justo después de soltarse, la primera vez que se cumple when()"""
+
+    def __init__(self, when, hook):
+        self._lock = threading.Lock()
+        self.when = when
+        self.hook = hook
+
+    def __enter__(self):
+        self._lock.acquire()
+
+    def __exit__(self, *exc):
+        self._lock.release()
+        if self.hook is not None and self.when():
+            hook, self.hook = self.hook, None
+            hook()
+
+
+def test_run_finished_is_delivered_once_to_a_listener_added_while_finishing():
+    run = ProfileRun("Perfil", [{'name': 'A'}])
+    events = []
+    # El oyente se añade entre que la ejecución se marca terminada y se avisa a los oyentes
+    run._lock = _ReleaseHookLock(run.done, lambda: run.add_listener(
+        lambda run, task, phase: events.append(phase)))
+    run._task_finished(run.tasks[0])
+    assert events == [RUN_FINISHED]
@@ -0,0 +1,43 @@
+from src.layout_capture import capture_current_layout, capture_layout
+from src.monitor_topology import MonitorRect, MonitorTopology
+from src.process_table import ProcessInfo, ProcessTable
+from src.window_snapshot import STATE_MAXIMIZED, STATE_MINIMIZED, WindowInfo, WindowSnapshot
+from tests.fakes import StaticProcessSource, StaticWindowSource
+
+MONITORS = [MonitorRect(0, 0, 1920, 1080, True), MonitorRect(1920, 0, 1920, 1080, False)]
+
+
+def test_capture_layout_relative_to_monitor():
+    processes = ProcessTable(StaticProcessSource([
+        ProcessInfo(10, 'editor.exe', r'C:\Apps\editor.exe'),
+        ProcessInfo(11, 'mail.exe', r'C:\Apps\mail.exe'),
+        ProcessInfo(12, 'chat.exe', r'C:\Apps\chat.exe'),
+    ]))
+    processes.refresh()
+    windows = [
+        WindowInfo(1, 10, 'Editor', 'Ed', (2020, 50, 800, 600)),
+        WindowInfo(2, 10, 'Editor 2', 'Ed', (0, 0, 800, 600)),
+        WindowInfo(3, 11, 'Correo', 'Mail', (0, 0, 1920, 1080), STATE_MAXIMIZED),
+        WindowInfo(4, 12, 'Chat', 'Chat', None, STATE_MINIMIZED),
+        WindowInfo(5, 99, 'Sin proceso', 'X', (0, 0, 10, 10)),
+    ]
+    programs = capture_layout(windows, processes, MONITORS)
+    assert [p['name'] for p in programs] == ['editor', 'mail', 'chat']
+    editor, mail, chat = programs
+    assert editor['window_config'] == {'monitor': 1, 'maximized': False,
+                                       'x': 100, 'y': 50, 'width': 800, 'height': 600}
+    assert mail['window_config']['maximized']
+    assert chat['start_minimized']
+    assert editor['window_class'] == 'Ed'
+
+
+def test_capture_current_layout_uses_the_given_sources():
+    processes = [ProcessInfo(1000 + i, f'app{i}.exe', f'C:\\Apps\\app{i}.exe') for i in range(5)]
+    # Procesos sin ventana: la captura no debe leerlos
+    processes += [ProcessInfo(2000 + i, 'svc.exe', 'C:\\Windows\\svc.exe') for i in range(50)]
+    windows = [WindowInfo(i, 1000 + i, f'Ventana {i}', 'App', (100, 50, 800, 600)) for i in range(5)]
+    source = StaticProcessSource(processes)
+    programs = capture_current_layout(WindowSnapshot(StaticWindowSource(windows)),
+                                      ProcessTable(source), MonitorTopology(lambda: MONITORS))
+    assert len(programs) == 5
+    assert source.info_count == 5
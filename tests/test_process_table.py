@@ -0,0 +1,92 @@
+from src.process_table import ProcessInfo, ProcessTable
+from tests.fakes import StaticProcessSource
+
+
+def make_table(processes):
+    source = StaticProcessSource(processes)
+    return ProcessTable(source, tick=0), source
+
+
+def test_refresh_only_queries_new_pids():
+    table, source = make_table([ProcessInfo(1, 'explorer.exe', r'C:\Windows\explorer.exe'),
+                                ProcessInfo(2, 'app.exe', r'C:\Apps\app.exe', 1)])
+    table.refresh()
+    assert source.info_count == 2
+    source.add(ProcessInfo(3, 'child.exe', r'C:\Apps\child.exe', 2))
+    table.refresh()
+    assert source.info_count == 3
+
+
+def test_lookups_by_name_exe_and_tree():
+    table, source = make_table([ProcessInfo(1, 'launcher.exe', r'C:\Apps\launcher.exe'),
+                                ProcessInfo(2, 'App.exe', r'C:\Apps\App.exe', 1),
+                                ProcessInfo(3, 'helper.exe', r'C:\Apps\helper.exe', 2)])
+    table.refresh()
+    assert table.pids_by_name('app.exe') == {2}
+    assert table.pids_by_exe(r'C:\Apps\App.exe') == {2}
+    assert table.pids_by_substring('help') == {3}
+    assert table.descendants(1) == {1, 2, 3}
+    assert table.find_pid(r'C:\Apps\App.exe') == 2
+
+
+def test_exited_processes_are_unindexed():
+    table, source = make_table([ProcessInfo(1, 'app.exe', r'C:\Apps\app.exe')])
+    table.refresh()
+    source.remove(1)
+    table.refresh()
+    assert table.find_pid('app.exe') is None
+    assert table.get(1) is None
+
+
+def test_reused_pid_is_read_again():
+    table, source = make_table([ProcessInfo(5, 'old.exe', r'C:\Apps\old.exe', None, 100.0)])
+    table.refresh()
+    source.add(ProcessInfo(5, 'new.exe', r'C:\Apps\new.exe', None, 200.0))
+    assert table.pids_by_name('old.exe') == set()
+    assert table.get(5).name == 'new.exe'
+    assert table.find_pid('new.exe') == 5
+
+
+def test_stale_table_is_revalidated_on_refresh():
+    table, source = make_table([ProcessInfo(5, 'old.exe', r'C:\Apps\old.exe', None, 100.0)])
+    table.revalidate_after = 0
+    table.refresh()
+    source.add(ProcessInfo(5, 'new.exe', r'C:\Apps\new.exe', None, 200.0))
+    table.refresh()
+    assert table.pids_by_name('new.exe') == {5}
+
+
+def test_descendants_skip_children_older_than_the_parent():
+    table, source = make_table([ProcessInfo(1, 'launcher.exe', r'C:\Apps\launcher.exe', None, 50.0),
+                                ProcessInfo(2, 'app.exe', r'C:\Apps\app.exe', 1, 60.0),
+                                ProcessInfo(3, 'stale.exe', r'C:\Apps\stale.exe', 1, 10.0)])
+    table.refresh()
+    assert table.descendants(1) == {1, 2}
+    # El lanzador puede terminar antes que sus hijos
+    source.remove(1)
+    source.remove(3)
+    table.refresh()
+    assert table.descendants(1) == {1, 2}
+
+
+def test_ancestors_follow_parents_until_a_reused_pid():
+    table, _ = make_table([ProcessInfo(1, 'explorer.exe', r'C:\Windows\explorer.exe', None, 10.0),
+                           ProcessInfo(2, 'cmd.exe', r'C:\Windows\cmd.exe', 1, 20.0),
+                           ProcessInfo(3, 'app.exe', r'C:\Apps\app.exe', 2, 30.0),
+                           ProcessInfo(4, 'late.exe', r'C:\Apps\late.exe', None, 40.0),
+                           ProcessInfo(5, 'orphan.exe', r'C:\Apps\orphan.exe', 4, 35.0)])
+    table.refresh()
+    assert table.ancestors(3) == {1, 2}
+    # El PID 4 se ha reutilizado: es más nuevo que su supuesto hijo
+    assert table.ancestors(5) == set()
+
+
+def test_refresh_pids_reads_only_unknown_pids():
+    table, source = make_table([ProcessInfo(1, 'app.exe', r'C:\Apps\app.exe')])
+    table.tick = 60
+    table.refresh()
+    source.add(ProcessInfo(2, 'child.exe', r'C:\Apps\child.exe', 1))
+    assert not table.refresh()
+    table.refresh_pids([1, 2, None])
+    assert source.info_count == 2
+    assert table.descendants(1) == {1, 2}
@@ -0,0 +1,55 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src import monitor_topology
+from src.execution_plan import compile_program
+from src.monitor_topology import MonitorRect, MonitorTopology
+from src.profile_manager import ProfileManager
+from src.window_placement import Placement
+
+MONITORS = [MonitorRect(0, 0, 1920, 1080, True), MonitorRect(1920, 0, 1920, 1080, False)]
+
+
+@pytest.fixture
+def monitors(monkeypatch):
+    current = list(MONITORS)
+    topology = MonitorTopology(lambda: list(current), ttl=0)
+    monkeypatch.setattr(monitor_topology, '_shared_topology', topology)
+    return current
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch, monitors):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('USERPROFILE', str(tmp_path))
+    monkeypatch.delenv('PROFILE_STORAGE', raising=False)
+    manager = ProfileManager()
+    yield manager
+    manager.executor.shutdown()
+    manager.flush()
+
+
+def test_placement_is_replanned_when_monitors_change(manager, monitors):
+    config = {'name': 'Editor', 'path': 'C:/Apps/editor.exe',
+              'window_config': {'monitor': 1, 'x': 10, 'y': 20, 'width': 800, 'height': 600}}
+    program = compile_program(config, manager.plans.topology)
+    placement = Placement(7, program.x, program.y, program.width, program.height, False, False)
+    task = SimpleNamespace(program=program, result=placement)
+    topology = manager.plans.topology
+    assert manager._current_placement(task, topology) is placement
+
+    monitors[1] = MonitorRect(-2560, 0, 2560, 1440, False)
+    topology.monitors()
+    assert manager._current_placement(task, topology) == Placement(7, -2550, 20, 800, 600, False, False)
+
+
+def test_save_and_delete_are_written_at_once(manager):
+    assert manager.save_profile("Trabajo", {'programs': []})
+    with open(manager.profiles_file, encoding='utf-8') as f:
+        assert "Trabajo" in json.load(f)
+    assert manager.delete_profile("Trabajo")
+    assert not manager.delete_profile("Trabajo")
+    with open(manager.profiles_file, encoding='utf-8') as f:
+        assert json.load(f) == {}
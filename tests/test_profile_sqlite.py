@@ -0,0 +1,59 @@
+import json
+
+from src.profile_sqlite import SqliteProfileStore
+from tests.fixtures import sample_profiles
+
+
+def test_migrates_json_once_and_round_trips(tmp_path):
+    json_path = tmp_path / "profiles.json"
+    profiles = sample_profiles(3)
+    json_path.write_text(json.dumps(profiles), encoding='utf-8')
+    store = SqliteProfileStore(str(tmp_path / "profiles.db"), json_path=str(json_path))
+    try:
+        assert store.load() == profiles
+        assert store.find_by_hotkey('ctrl+alt+2') == "Perfil 2"
+        assert not store.migrate_from_json(str(json_path))
+    finally:
+        store.close()
+
+
+def test_put_delete_visible_to_other_connections(tmp_path):
+    path = str(tmp_path / "profiles.db")
+    writer = SqliteProfileStore(path)
+    reader = SqliteProfileStore(path)
+    try:
+        assert reader.names() == []
+        writer.put("Trabajo", {'programs': [{'name': 'Editor', 'path': 'C:/Apps/editor.exe'}],
+                               'hotkey': 'ctrl+alt+1', 'extra_key': 1})
+        assert reader.get("Trabajo")['extra_key'] == 1
+        assert writer.delete("Trabajo")
+        assert "Trabajo" not in reader
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_failed_write_is_rolled_back(tmp_path):
+    store = SqliteProfileStore(str(tmp_path / "profiles.db"))
+    try:
+        store.put("Trabajo", {'programs': [{'name': 'Editor'}]})
+        assert not store.put("Trabajo", {'programs': [{'name': 'Editor', 'tags': {1, 2}}]})
+        assert not store._conn.in_transaction
+        assert store.get("Trabajo")['programs'] == [{'name': 'Editor'}]
+        assert store.put("Casa", {'programs': []})
+    finally:
+        store.close()
+
+
+def test_failed_migration_can_be_retried(tmp_path):
+    json_path = tmp_path / "profiles.json"
+    json_path.write_text(json.dumps({"Roto": "no es un perfil"}), encoding='utf-8')
+    store = SqliteProfileStore(str(tmp_path / "profiles.db"), json_path=str(json_path))
+    try:
+        assert store.names() == []
+        assert not store._conn.in_transaction
+        json_path.write_text(json.dumps(sample_profiles(1)), encoding='utf-8')
+        assert store.migrate_from_json(str(json_path))
+        assert store.names() == ["Perfil 0"]
+    finally:
+        store.close()
@@ -0,0 +1,107 @@
+import json
+import threading
+
+from src import profile_store
+from src.profile_store import ProfileStore
+from tests.fixtures import sample_profiles
+
+
+def test_writes_are_visible_at_once_and_flushed_together(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    store = ProfileStore(path, flush_delay=60)
+    store.put("Trabajo", {'programs': [], 'hotkey': 'ctrl+alt+1'})
+    store.put("Casa", {'programs': []})
+    assert sorted(store.names()) == ["Casa", "Trabajo"]
+    assert store.find_by_hotkey('ctrl+alt+1') == "Trabajo"
+    assert not (tmp_path / "profiles.json").exists()
+    assert store.flush()
+    with open(path, encoding='utf-8') as f:
+        assert sorted(json.load(f)) == ["Casa", "Trabajo"]
+
+
+def test_external_changes_are_reloaded(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps(sample_profiles(2)), encoding='utf-8')
+    store = ProfileStore(str(path), stat_interval=0)
+    assert len(store.snapshot()) == 2
+    path.write_text(json.dumps(sample_profiles(3)) + "\n", encoding='utf-8')
+    assert len(store.snapshot()) == 3
+
+
+def test_delete_and_load_returns_a_copy(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.json"), flush_delay=60)
+    store.replace_all(sample_profiles(2))
+    profiles = store.load()
+    profiles["Perfil 0"]['programs'].clear()
+    assert len(store.get("Perfil 0")['programs']) == 5
+    assert store.delete("Perfil 1")
+    assert not store.delete("Perfil 1")
+    assert store.names() == ["Perfil 0"]
+
+
+def test_failed_flush_keeps_the_error_and_retries(tmp_path):
+    path = tmp_path / "missing" / "profiles.json"
+    store = ProfileStore(str(path), flush_delay=60)
+    store.put("Trabajo", {'programs': []})
+    assert not store.flush()
+    assert store.last_error
+    path.parent.mkdir()
+    assert store.flush()
+    assert store.last_error is None
+
+
+def test_snapshot_checks_the_file_at_most_once_per_interval(tmp_path, monkeypatch):
+    store = ProfileStore(str(tmp_path / "profiles.json"), stat_interval=60)
+    store.snapshot()
+    calls = []
+    monkeypatch.setattr(profile_store.os, 'stat', lambda path: calls.append(path))
+    for _ in range(100):
+        store.snapshot()
+    assert calls == []
+
+
+def test_atexit_is_registered_once(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(profile_store, '_atexit_registered', False)
+    monkeypatch.setattr(profile_store.atexit, 'register', registered.append)
+    stores = [ProfileStore(str(tmp_path / f"{i}.json")) for i in range(5)]
+    assert registered == [profile_store._flush_open_stores]
+    stores[0].put("Trabajo", {'programs': []})
+    profile_store._flush_open_stores()
+    assert (tmp_path / "0.json").exists()
+
+
+def test_concurrent_reader_during_the_first_load(tmp_path):
+    path = tmp_path / 'profiles.json'
+    path.write_text(json.dumps(sample_profiles(3)), encoding='utf-8')
+    loaded = threading.Event()
+    release = threading.Event()
+
+    class SlowStore(ProfileStore):
+        def _reload(self, stat):
+            super()._reload(stat)
+            if not loaded.is_set():
+                loaded.set()
+                release.wait(5)
+
+    store = SlowStore(str(path))
+    errors = []
+    results = []
+
+    def read():
+        try:
+            results.append(len(store.snapshot()))
+        except Exception as e:
+            errors.append(e)
+
+    first = threading.Thread(target=read)
+    first.start()
+    assert loaded.wait(5)
+    second = threading.Thread(target=read)
+    second.start()
+    second.join(0.2)
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert errors == []
+    assert results == [3, 3]
@@ -0,0 +1,97 @@
+import os
+
+from src.execution_plan import compile_profile
+from src.monitor_topology import MonitorRect, MonitorTopology
+from src.process_table import ProcessInfo, ProcessTable
+from src.profile_switch import ProfileSwitcher
+from src.window_snapshot import WindowInfo, WindowSnapshot
+from tests.fakes import (RecordingPlacementBackend, RecordingWindowCloser, StaticProcessSource,
+                         StaticWindowSource)
+
+TOPOLOGY = MonitorTopology(lambda: [MonitorRect(0, 0, 1920, 1080, True),
+                                    MonitorRect(1920, 0, 1920, 1080, False)])
+
+
+def make_plan(close_others=False):
+    programs = [{'name': f'App {i}', 'path': f'C:/Apps/app{i}.exe',
+                 'window_config': {'monitor': i % 2, 'x': 10, 'y': 0, 'width': 800, 'height': 600}}
+                for i in range(3)]
+    return compile_profile('Trabajo', {'programs': programs, 'close_others': close_others}, TOPOLOGY)
+
+
+def make_switcher(windows, processes):
+    backend = RecordingPlacementBackend()
+    closer = RecordingWindowCloser()
+    switcher = ProfileSwitcher(WindowSnapshot(StaticWindowSource(windows)),
+                               ProcessTable(StaticProcessSource(processes)),
+                               placement_backend=backend, closer=closer)
+    return switcher, backend, closer
+
+
+def test_switch_keeps_moves_and_launches():
+    plan = make_plan()
+    app0, app1, _ = plan.programs
+    processes = [ProcessInfo(100, 'app0.exe', 'C:/Apps/app0.exe'),
+                 ProcessInfo(101, 'app1.exe', 'C:/Apps/app1.exe')]
+    windows = [WindowInfo(1, 100, 'App 0', 'App', (app0.x, app0.y, app0.width, app0.height)),
+               WindowInfo(2, 101, 'App 1', 'App', (0, 0, 640, 480))]
+    switcher, backend, closer = make_switcher(windows, processes)
+    launched = []
+    result = switcher.switch(plan, launch=lambda missing: launched.extend(missing))
+    assert [hwnd for _, hwnd in result.diff.keep] == [1]
+    assert [placement.hwnd for _, placement in result.diff.move] == [2]
+    assert [program.name for program in launched] == ['App 2']
+    assert ('defer', 2, app1.x, app1.y, app1.width, app1.height) in backend.calls
+    assert closer.closed == []
+
+
+def test_close_others_only_proposes_unowned_app_windows():
+    plan = make_plan(close_others=True)
+    own = os.getpid()
+    processes = [ProcessInfo(9000, 'cmd.exe', 'C:/Windows/cmd.exe', None, 1.0),
+                 ProcessInfo(own, 'python.exe', 'C:/Python/python.exe', 9000, 2.0),
+                 ProcessInfo(200, 'other.exe', 'C:/Other/other.exe')]
+    windows = [WindowInfo(10, 200, 'Other', 'Other'),
+               WindowInfo(11, 200, 'Diálogo', 'Dialog', owner=10),
+               WindowInfo(12, 200, 'Paleta', 'Tool', tool_window=True),
+               WindowInfo(13, 200, 'Oculta', 'Other', cloaked=True),
+               WindowInfo(14, 200, '', 'Other'),
+               WindowInfo(15, 0, 'Barra', 'Shell_TrayWnd'),
+               WindowInfo(16, 9000, 'Consola', 'ConsoleWindowClass')]
+    switcher, _, closer = make_switcher(windows, processes)
+    result = switcher.switch(plan)
+    assert [window.hwnd for window in result.diff.close] == [10]
+    # Sin confirmación no se cierra nada
+    assert result.closed == [] and closer.closed == []
+    assert switcher.close_windows(result.diff.close) == [10]
+    assert closer.closed == [10]
+
+
+def test_switch_closes_only_when_asked():
+    plan = make_plan(close_others=True)
+    windows = [WindowInfo(10, 200, 'Other', 'Other')]
+    switcher, _, closer = make_switcher(windows, [ProcessInfo(200, 'other.exe', 'C:/Other/other.exe')])
+    result = switcher.switch(plan, close_others=True)
+    assert result.closed == [10]
+    assert closer.closed == [10]
+
+
+def test_packaged_programs_are_matched_by_title_and_never_closed():
+    profile = {'close_others': True, 'programs': [
+        {'name': 'Calculadora', 'path': 'Microsoft.WindowsCalculator_8wekyb3d8bbwe!App', 'source': 'modern',
+         'process_name': 'CalculatorApp.exe',
+         'window_config': {'monitor': 0, 'x': 10, 'y': 0, 'width': 400, 'height': 600}}]}
+    plan = compile_profile('Apps', profile, TOPOLOGY)
+    # La ventana es de ApplicationFrameHost; el proceso de la app no tiene ventana propia
+    processes = [ProcessInfo(300, 'ApplicationFrameHost.exe', 'C:/Windows/System32/ApplicationFrameHost.exe'),
+                 ProcessInfo(301, 'CalculatorApp.exe', 'C:/Program Files/WindowsApps/Calc/CalculatorApp.exe'),
+                 ProcessInfo(200, 'other.exe', 'C:/Other/other.exe')]
+    windows = [WindowInfo(30, 300, 'Calculadora', 'ApplicationFrameWindow', (0, 0, 320, 500)),
+               WindowInfo(10, 200, 'Other', 'Other')]
+    switcher, backend, closer = make_switcher(windows, processes)
+    launched = []
+    result = switcher.switch(plan, launch=lambda missing: launched.extend(missing), close_others=True)
+    assert launched == []
+    assert [placement.hwnd for _, placement in result.diff.move] == [30]
+    assert [window.hwnd for window in result.diff.close] == [10]
+    assert closer.closed == [10]
@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from PyQt5.QtCore import QCoreApplication
+
+from src.program_models import ProgramListModel, ProgramSearchProxy
+from src.program_search import ProgramSearchIndex
+
+PROGRAMS = [
+    {'name': 'Visual Studio Code', 'path': 'C:/Apps/Code.exe'},
+    {'name': 'Mozilla Firefox', 'path': 'C:/Apps/firefox.exe'},
+]
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def test_shared_index_is_reused_when_the_model_is_populated_first():
+    shared_index = ProgramSearchIndex(PROGRAMS)
+    model = ProgramListModel()
+    model.set_programs(PROGRAMS)
+    proxy = ProgramSearchProxy()
+    proxy.set_index(shared_index)
+    proxy.setSourceModel(model)
+    assert proxy.search_index is shared_index
+    assert proxy.rowCount() == 2
+
+
+def test_shared_index_set_before_the_model_is_populated_is_reused():
+    shared_index = ProgramSearchIndex(PROGRAMS)
+    model = ProgramListModel()
+    proxy = ProgramSearchProxy()
+    proxy.set_index(shared_index)
+    proxy.setSourceModel(model)
+    model.set_programs(PROGRAMS)
+    assert proxy.search_index is shared_index
+    proxy.set_query('firefox')
+    proxy.apply_query()
+    assert proxy.rowCount() == 1
+
+
+def test_other_programs_get_their_own_index():
+    shared_index = ProgramSearchIndex(PROGRAMS)
+    model = ProgramListModel()
+    model.set_programs(PROGRAMS[:1])
+    proxy = ProgramSearchProxy()
+    proxy.set_index(shared_index)
+    proxy.setSourceModel(model)
+    assert proxy.search_index is not shared_index
+    assert proxy.rowCount() == 1
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.program_scanner import ProgramScanner, REGISTRY_PATHS
+from src.scan_cache import ScanCache, SCAN_CACHE_FILENAME
+from tests.fixtures import build_scan_fixture
+
+
+def no_powershell():
+    raise AssertionError("No debe hacer falta PowerShell")
+
+
+@pytest.fixture
+def machine(tmp_path):
+    registry, folders, start_menu = build_scan_fixture(str(tmp_path), count=20, packages=5)
+    cache_path = str(tmp_path / SCAN_CACHE_FILENAME)
+
+    def scanner():
+        return ProgramScanner(cache=ScanCache(cache_path), registry=registry, folders=folders,
+                              start_menu=start_menu, start_apps=no_powershell)
+    return registry, folders, scanner
+
+
+def test_scan_finds_every_source_without_duplicates(machine):
+    registry, folders, scanner = machine
+    programs = scanner().scan_installed_programs()
+    sources = {}
+    for program in programs:
+        sources[program['source']] = sources.get(program['source'], 0) + 1
+    assert sources == {'registry': 20, 'modern': 5}
+    assert not any('uninstall' in p['path'].lower() for p in programs)
+
+
+def test_second_scan_reuses_the_cache(machine):
+    registry, folders, scanner = machine
+    first = scanner().scan_installed_programs()
+    registry.values_reads = 0
+    s = scanner()
+    second = s.scan_installed_programs()
+    assert second == first
+    assert registry.values_reads == 0
+    assert s.last_scan_stats['registry'] == {'reused': 20, 'read': 0}
+
+
+def test_only_changed_entries_are_read_again(machine):
+    registry, folders, scanner = machine
+    scanner().scan_installed_programs()
+    hive, path = REGISTRY_PATHS[0]
+    last_write, values = registry.keys[(hive, path)]['App0']
+    registry.set(hive, path, 'App0', last_write + 1, values)
+    new_folder = os.path.join(folders[0], "New App")
+    os.makedirs(new_folder)
+    with open(os.path.join(new_folder, "newapp.exe"), 'wb'):
+        pass
+    registry.values_reads = 0
+    s = scanner()
+    programs = s.scan_installed_programs()
+    assert registry.values_reads == 1
+    assert any(p['path'] == os.path.join(new_folder, "newapp.exe") for p in programs)
+
+
+def test_batches_are_streamed_once(machine):
+    registry, folders, scanner = machine
+    streamed = []
+    programs = scanner().scan_installed_programs(on_batch=lambda name, batch: streamed.extend(batch))
+    keys = [(p['name'].lower(), p['path'].lower()) for p in streamed]
+    assert len(keys) == len(set(keys))
+    assert len(streamed) >= len(programs)
+
+
+def test_sources_stop_between_items_when_cancelled(machine):
+    registry, folders, scanner = machine
+    s = scanner()
+    cancel = threading.Event()
+    registry.values_reads = 0
+    programs = s._scan_registry(cancel=cancel)
+    next(programs)
+    cancel.set()
+    assert list(programs) == []
+    assert registry.values_reads == 1
+    assert list(s._scan_modern_apps(cancel=cancel)) == []
+    assert list(s._scan_shortcuts(cancel=cancel)) == []
+
+
+def test_late_results_of_a_timed_out_source_are_dropped(machine, tmp_path):
+    registry, folders, scanner = machine
+    gate = threading.Event()
+    entered = threading.Event()
+    values = registry.values
+
+    def slow_values(hive, path, *args, **kwargs):
+        if (hive, path) in REGISTRY_PATHS:
+            entered.set()
+            gate.wait(5)
+        return values(hive, path, *args, **kwargs)
+
+    registry.values = slow_values
+    cache = ScanCache(str(tmp_path / 'late.json'))
+    s = ProgramScanner(cache=cache, registry=registry, folders=folders, start_apps=no_powershell,
+                       start_menu=[], timeouts={'registry': 0.2})
+    batches, progress = [], []
+    s.scan_installed_programs(on_batch=lambda name, batch: batches.append(name),
+                              on_progress=lambda name, done, total: progress.append(name))
+    assert entered.is_set()
+    assert s.last_scan_timings['registry']['error'] == 'timeout'
+    finished = (list(batches), list(progress))
+    gate.set()
+    time.sleep(0.3)
+    assert (batches, progress) == finished
+    assert cache.keys('registry') == []
+    assert s.last_scan_timings['registry']['error'] == 'timeout'
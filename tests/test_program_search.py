@@ -0,0 +1,30 @@
+from src.program_search import ProgramSearchIndex, normalize
+
+PROGRAMS = [
+    {'name': 'Visual Studio Code', 'path': 'C:/Apps/Code.exe', 'publisher': 'Microsoft'},
+    {'name': 'Cámara', 'path': '', 'publisher': 'Microsoft'},
+    {'name': 'Mozilla Firefox', 'path': 'C:/Apps/firefox.exe', 'publisher': 'Mozilla'},
+]
+
+
+def test_normalize_removes_accents_and_separators():
+    assert normalize('Cámara_Web-2') == 'camara web 2'
+
+
+def test_word_prefixes_and_accents():
+    index = ProgramSearchIndex(PROGRAMS)
+    assert index.search('vis cod') == [0]
+    assert index.search('camara') == [1]
+    assert index.search('') == [0, 1, 2]
+
+
+def test_typos_fall_back_to_trigrams():
+    assert ProgramSearchIndex(PROGRAMS).search('firefx')[:1] == [2]
+
+
+def test_short_queries_fall_back_to_substrings_of_the_name():
+    index = ProgramSearchIndex(PROGRAMS)
+    assert index.search('ud') == [0]
+    assert index.search('a') == [1, 2, 0]
+    assert index.search('u') == [0]
+    assert index.search('zq') == []
@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from src.shell_links import ShellLinkError, parse_lnk
+from tests.fakes import build_lnk
+
+
+@pytest.mark.parametrize('kwargs, target, app_id', [
+    ({'target': r'C:\Program Files\Editor\editor.exe', 'arguments': '--new-window',
+      'working_dir': r'C:\Program Files\Editor', 'description': 'Editor'},
+     r'C:\Program Files\Editor\editor.exe', None),
+    ({'app_id': 'Microsoft.WindowsCalculator_8wekyb3d8bbwe!App'},
+     None, 'Microsoft.WindowsCalculator_8wekyb3d8bbwe!App'),
+    ({'target': r'C:\Juegos\Ñandú\juego.exe', 'app_id': 'Ejemplo.Juego'},
+     r'C:\Juegos\Ñandú\juego.exe', 'Ejemplo.Juego'),
+])
+def test_parse_lnk(kwargs, target, app_id):
+    link = parse_lnk(build_lnk(**kwargs))
+    assert link.target == target
+    assert link.app_id == app_id
+    assert link.arguments == kwargs.get('arguments', '')
+
+
+def test_environment_target_is_expanded(monkeypatch):
+    monkeypatch.setenv('ProgramFiles', r'C:\Program Files')
+    link = parse_lnk(build_lnk(env_target=r'%ProgramFiles%\Tool\tool.exe',
+                               target=r'C:\Program Files\Tool\tool.exe'))
+    assert link.target == os.environ['ProgramFiles'] + r'\Tool\tool.exe'
+
+
+def test_rejects_other_files():
+    with pytest.raises(ShellLinkError):
+        parse_lnk(b'no es un acceso directo')
@@ -0,0 +1,64 @@
+from src.launch_executor import PHASE_HWND_FOUND, PHASE_STARTED, LaunchExecutor
+from src.telemetry import TelemetryWriter, aggregate, format_report, load_records, records_from_run
+
+
+def record(program, window, outcome='placed'):
+    return {'profile': 'Trabajo', 'program': program, 'outcome': outcome,
+            'durations': {'window': window, 'total': window}}
+
+
+def test_writer_rotates_and_reader_keeps_order(tmp_path):
+    path = str(tmp_path / "launches.jsonl")
+    writer = TelemetryWriter(path, max_bytes=200, backups=3, flush_interval=0)
+    for i in range(12):
+        writer.record(record(f"App {i}", i))
+        writer.close()
+    records = load_records(path)
+    assert [r['program'] for r in records] == [f"App {i}" for i in range(12 - len(records), 12)]
+    assert (tmp_path / "launches.jsonl.3").exists()
+
+
+def test_aggregate_percentiles_and_failures():
+    records = [record('Editor', v) for v in (1, 2, 3, 4)] + [record('Editor', None, 'timeout')]
+    stats = aggregate(records)['Trabajo / Editor']
+    assert (stats['runs'], stats['failures'], stats['p50'], stats['p95'], stats['max']) == (5, 1, 2, 4, 4)
+
+
+def test_rotations_are_read_in_numeric_order(tmp_path):
+    path = str(tmp_path / "launches.jsonl")
+    writer = TelemetryWriter(path, max_bytes=1, backups=12, flush_interval=0)
+    for i in range(12):
+        writer.record(record(f"App {i}", i))
+        writer.close()
+    assert (tmp_path / "launches.jsonl.11").exists()
+    assert [r['program'] for r in load_records(path)] == [f"App {i}" for i in range(12)]
+
+
+def test_outcomes_use_the_failure_reported_by_the_launcher():
+    def launcher(program, cancel_event, on_phase):
+        if program['name'] == 'Falta':
+            on_phase(PHASE_STARTED, failure='missing_exe')
+            return None
+        on_phase(PHASE_HWND_FOUND)
+        if program['name'] == 'Sin monitor':
+            on_phase(PHASE_HWND_FOUND, failure='no_monitor')
+            return None
+        return program['name']
+
+    executor = LaunchExecutor(launcher, max_workers=1)
+    try:
+        run = executor.submit("Trabajo", [{'name': 'Falta'}, {'name': 'Sin monitor'}, {'name': 'Bien'}])
+        assert run.wait(5)
+    finally:
+        executor.shutdown()
+    outcomes = {r['program']: r['outcome'] for r in records_from_run(run)}
+    assert outcomes == {'Falta': 'missing_exe', 'Sin monitor': 'no_monitor', 'Bien': 'not_placed'}
+
+
+def test_profile_aggregate_counts_each_run_once_by_its_wall_time():
+    records = [dict(record('A', 1), ts=1.0, run_wall_time=2.5), dict(record('B', 2), ts=1.0, run_wall_time=2.5),
+               dict(record('A', 1), ts=9.0, run_wall_time=4.0),
+               dict(record('B', None, 'timeout'), ts=9.0, run_wall_time=4.0)]
+    stats = aggregate(records, key='profile')['Trabajo']
+    assert (stats['runs'], stats['failures'], stats['p50'], stats['max']) == (2, 1, 2.5, 4.0)
+    assert 'duración de la ejecución' in format_report(records)
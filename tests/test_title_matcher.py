@@ -0,0 +1,41 @@
+from src.title_matcher import COMPILED_CACHE_SIZE, TitleIndex, _compile, compile_keyword
+from src.window_snapshot import WindowInfo
+
+
+def make_index():
+    index = TitleIndex()
+    index.update([
+        WindowInfo(1, 10, 'Bandeja de entrada - Correo', 'Mail'),
+        WindowInfo(2, 20, 'notas.txt - Bloc de notas', 'Notepad'),
+        WindowInfo(3, 30, 'Correos enviados', 'Other'),
+    ])
+    return index
+
+
+def test_exact_token_beats_prefix():
+    assert make_index().search('correo') == [1, 3]
+
+
+def test_substring_only_without_token_matches():
+    assert make_index().search('ntrada') == [1]
+
+
+def test_class_and_process_boost():
+    index = make_index()
+    assert index.search(compile_keyword('correo', ('Other',)))[0] == 3
+    assert index.search('correo', boost_pids={30})[0] == 3
+
+
+def test_update_reindexes_changed_titles():
+    index = make_index()
+    index.update([WindowInfo(1, 10, 'Calendario', 'Mail')])
+    assert len(index) == 1
+    assert index.search('correo') == []
+    assert index.search('calendario') == [1]
+
+
+def test_compiled_keywords_are_cached_and_bounded():
+    assert compile_keyword('Correo', ('Mail', None)) is compile_keyword('Correo', ('Mail',))
+    for i in range(COMPILED_CACHE_SIZE + 10):
+        compile_keyword(f'ventana {i}')
+    assert _compile.cache_info().currsize == COMPILED_CACHE_SIZE
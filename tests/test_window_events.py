@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+from src.window_events import PollingEventSource, Win32WinEventSource, WindowEventHub
+from tests.fakes import ScriptedEventSource
+
+
+def test_wait_wakes_up_on_event():
+    source = ScriptedEventSource([(0.02, 100, None)])
+    hub = WindowEventHub(source, max_wait=5)
+    with hub.subscribe():
+        generation = hub.wait(hub.generation, timeout=2)
+    assert generation == 1
+    assert len(source.emitted) == 1
+
+
+def test_wait_is_capped_by_max_wait():
+    hub = WindowEventHub(ScriptedEventSource(), max_wait=0.01)
+    with hub.subscribe():
+        assert hub.wait(hub.generation, timeout=10) == 0
+
+
+def test_failing_source_falls_back_to_polling():
+    class BrokenSource:
+        def start(self, notify):
+            raise OSError("sin hooks")
+
+        def stop(self):
+            pass
+
+    hub = WindowEventHub(BrokenSource(), max_wait=1)
+    woke = threading.Event()
+    with hub.subscribe():
+        assert isinstance(hub.source, PollingEventSource)
+        if hub.wait(hub.generation, timeout=1) > 0:
+            woke.set()
+    assert woke.is_set()
+
+
+def test_win32_source_gives_up_when_hooks_do_not_start(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def stuck(notify, ready, abandoned):
+        started.set()
+        release.wait(2)
+
+    source = Win32WinEventSource(start_timeout=0.05)
+    monkeypatch.setattr(source, '_run', stuck)
+    with pytest.raises(OSError):
+        source.start(lambda hwnd, event: None)
+    assert started.is_set()
+    release.set()
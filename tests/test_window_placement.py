@@ -0,0 +1,32 @@
+from src.window_placement import Placement, PlacementBatch
+from tests.fakes import RecordingPlacementBackend
+
+
+def test_batch_moves_all_windows_in_one_transaction():
+    backend = RecordingPlacementBackend(restored_hwnds={2})
+    batch = PlacementBatch(backend)
+    batch.add(Placement(1, 0, 0, 800, 600, False, False))
+    batch.add(Placement(2, 1920, 0, 800, 600, True, False))
+    results = batch.apply()
+    assert [r.ok for r in results] == [True, True]
+    assert ('restore', 2) in backend.calls
+    assert [c[0] for c in backend.calls].count('begin') == 1
+    assert backend.calls[-1] == ('maximize', 2)
+
+
+def test_failed_transaction_falls_back_to_set_window_pos():
+    backend = RecordingPlacementBackend(failing_hwnds={2})
+    batch = PlacementBatch(backend)
+    batch.add(Placement(1, 0, 0, 800, 600, False, False))
+    batch.add(Placement(2, 0, 0, 800, 600, False, False))
+    results = batch.apply()
+    assert [r.ok for r in results] == [True, False]
+    assert ('set_window_pos', 1, 0, 0, 800, 600) in backend.calls
+
+
+def test_missing_windows_are_reported():
+    backend = RecordingPlacementBackend(missing_hwnds={1})
+    batch = PlacementBatch(backend)
+    batch.add(Placement(1, 0, 0, 800, 600, False, False))
+    result = batch.apply()[0]
+    assert not result.ok
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from src.window_snapshot import WindowInfo, WindowSnapshot
+from tests.fakes import StaticWindowSource
+
+
+def test_refresh_is_throttled_to_one_enumeration_per_tick():
+    source = StaticWindowSource([WindowInfo(1, 10, 'Editor')])
+    snapshot = WindowSnapshot(source, tick=60)
+    assert snapshot.refresh()
+    assert not snapshot.refresh()
+    assert source.enum_count == 1
+    assert snapshot.refresh(force=True)
+    assert source.enum_count == 2
+
+
+def test_find_by_pid_and_title():
+    source = StaticWindowSource([WindowInfo(1, 10, 'Documento - Editor', 'EditorWnd'),
+                                 WindowInfo(2, 20, 'Navegador'),
+                                 WindowInfo(3, 10, 'Buscar')])
+    snapshot = WindowSnapshot(source)
+    snapshot.refresh()
+    assert snapshot.find_by_pid(10) == [1, 3]
+    assert snapshot.find_by_pids([20, 10]) == [2, 1, 3]
+    assert snapshot.find_by_title('editor')[0] == 1
+
+
+def test_newer_event_inside_the_tick_waits_for_the_tick():
+    source = StaticWindowSource([WindowInfo(1, 10, 'Editor')])
+    snapshot = WindowSnapshot(source, tick=0.2)
+    assert snapshot.refresh(generation=1)
+    start = time.monotonic()
+    assert snapshot.refresh(generation=2)
+    assert time.monotonic() - start >= 0.15
+    assert source.enum_count == 2
+    assert not snapshot.refresh(generation=2)
+
+
+def test_event_burst_costs_one_enumeration_per_tick():
+    source = StaticWindowSource([WindowInfo(1, 10, 'Editor')])
+    snapshot = WindowSnapshot(source, tick=0.2)
+    snapshot.refresh(generation=1)
+    threads = [threading.Thread(target=snapshot.refresh, kwargs={'generation': 2 + i % 2})
+               for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert source.enum_count <= 3
+    assert not snapshot.refresh(generation=3)